@@ -75,8 +75,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # Commit each revision on its own, so a failed upgrade keeps the revisions
+        # before it and a retry resumes at the one that failed
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
@@ -29,6 +29,11 @@ def upgrade() -> None:
     """Load seed data for initial deployment."""
     conn = op.get_bind()
 
+    # Alembic runs the upgrade in a single transaction, so the seed inserts
+    # already commit together; SET LOCAL also skips waiting on the WAL flush at
+    # that commit (a crash mid-load just re-runs this idempotent migration)
+    conn.execute(text("SET LOCAL synchronous_commit = off"))
+
     # Check if price_history table is empty
     result = conn.execute(text("SELECT COUNT(*) FROM price_history")).fetchone()
     price_history_count = result[0] if result else 0
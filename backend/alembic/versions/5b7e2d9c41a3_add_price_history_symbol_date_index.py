@@ -0,0 +1,36 @@
+"""add_price_history_symbol_date_index
+
+Revision ID: 5b7e2d9c41a3
+Revises: 27c553c12df9
+Create Date: 2026-10-17 09:00:00.000000
+
+Composite (symbol, date) index so the latest close for a symbol is a single
+backward index probe instead of a full price_history scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d9c41a3'
+down_revision: Union[str, None] = '27c553c12df9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; don't block price ingest while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_price_history_symbol_date', 'price_history', ['symbol', 'date'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_price_history_symbol_date', table_name='price_history',
+            postgresql_concurrently=True
+        )
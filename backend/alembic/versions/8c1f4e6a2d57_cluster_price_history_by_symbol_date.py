@@ -0,0 +1,31 @@
+"""cluster_price_history_by_symbol_date
+
+Revision ID: 8c1f4e6a2d57
+Revises: 5b7e2d9c41a3
+Create Date: 2026-10-17 09:30:00.000000
+
+One-off physical reorder of price_history by (symbol, date) so each symbol's
+rows sit on adjacent pages. The (symbol, date) lookups in trade execution then
+touch far fewer heap pages. CLUSTER is not maintained for new rows; re-run
+`CLUSTER price_history` during maintenance if locality degrades.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e6a2d57'
+down_revision: Union[str, None] = '5b7e2d9c41a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CLUSTER price_history USING ix_price_history_symbol_date")
+    op.execute("ANALYZE price_history")
+
+
+def downgrade() -> None:
+    # Forget the clustering index; the physical row order is left as is
+    op.execute("ALTER TABLE price_history SET WITHOUT CLUSTER")
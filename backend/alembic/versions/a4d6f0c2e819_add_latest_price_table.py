@@ -0,0 +1,90 @@
+"""add_latest_price_table
+
+Revision ID: a4d6f0c2e819
+Revises: e3a9c7b15d42
+Create Date: 2026-10-17 10:30:00.000000
+
+One row per symbol holding its most recent price_history row, so "latest
+price" reads are primary-key lookups on a table the size of the asset list.
+An AFTER trigger on price_history keeps it current: inserts upsert the row
+when they are at least as new, and updates/deletes rebuild the affected
+symbol from history (they may have touched the latest row).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d6f0c2e819'
+down_revision: Union[str, None] = 'e3a9c7b15d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_COLUMNS = "symbol, date, open_price, high_price, low_price, close_price, volume"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'latest_price',
+        sa.Column('symbol', sa.String(length=10), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('open_price', sa.Float(), nullable=False),
+        sa.Column('high_price', sa.Float(), nullable=False),
+        sa.Column('low_price', sa.Float(), nullable=False),
+        sa.Column('close_price', sa.Float(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('symbol')
+    )
+
+    op.execute(f"""
+        CREATE FUNCTION refresh_latest_price() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                -- The old row may have been the latest one: rebuild its symbol from history
+                DELETE FROM latest_price WHERE symbol = OLD.symbol;
+                INSERT INTO latest_price ({PRICE_COLUMNS})
+                SELECT {PRICE_COLUMNS} FROM price_history
+                WHERE symbol = OLD.symbol
+                ORDER BY date DESC
+                LIMIT 1;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO latest_price ({PRICE_COLUMNS})
+                VALUES (NEW.symbol, NEW.date, NEW.open_price, NEW.high_price,
+                        NEW.low_price, NEW.close_price, NEW.volume)
+                ON CONFLICT (symbol) DO UPDATE SET
+                    date = EXCLUDED.date,
+                    open_price = EXCLUDED.open_price,
+                    high_price = EXCLUDED.high_price,
+                    low_price = EXCLUDED.low_price,
+                    close_price = EXCLUDED.close_price,
+                    volume = EXCLUDED.volume
+                WHERE latest_price.date <= EXCLUDED.date;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER price_history_refresh_latest_price
+        AFTER INSERT OR UPDATE OR DELETE ON price_history
+        FOR EACH ROW EXECUTE FUNCTION refresh_latest_price()
+    """)
+
+    # Backfill from existing history (one backward index probe per symbol)
+    op.execute(f"""
+        INSERT INTO latest_price ({PRICE_COLUMNS})
+        SELECT DISTINCT ON (symbol) {PRICE_COLUMNS}
+        FROM price_history
+        ORDER BY symbol, date DESC
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS price_history_refresh_latest_price ON price_history")
+    op.execute("DROP FUNCTION IF EXISTS refresh_latest_price()")
+    op.drop_table('latest_price')
@@ -0,0 +1,116 @@
+"""partition_time_series_tables_by_date
+
+Revision ID: a9d3e5b7c284
+Revises: e8b4f2a7c316
+Create Date: 2026-10-17 13:30:00.000000
+
+Rebuild price_history and performance_metrics as PARTITION BY RANGE (date)
+tables with one partition per year, so recent-data queries only scan the
+current year's partition (and its smaller indexes) and old years can be
+retired with DROP TABLE instead of a bulk DELETE.
+
+Each table is renamed aside, recreated with the same columns and defaults,
+refilled in index order and dropped; the id sequence moves to the new table
+and the original indexes are rebuilt on the parent, which cascades them to
+every partition. A partitioned table's unique keys must include the
+partition column, so the primary key becomes (id, date); performance_metrics'
+redundant UNIQUE (date) constraint is not carried over; the unique
+ix_performance_metrics_date index still enforces it. Partitions run from
+the oldest data through next year, plus a DEFAULT partition so inserts never
+fail; add each new year's partition before it starts, e.g.
+
+    CREATE TABLE price_history_y2028 PARTITION OF price_history
+        FOR VALUES FROM ('2028-01-01') TO ('2029-01-01');
+
+price_history is no longer CLUSTERed (not supported on partitioned tables);
+the refill inserts each year's rows in (symbol, date) order instead.
+"""
+from datetime import date
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e5b7c284'
+down_revision: Union[str, None] = 'e8b4f2a7c316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitioned table -> refill order
+PARTITIONED_TABLES = {
+    'price_history': 'symbol, date',
+    'performance_metrics': 'date',
+}
+
+LATEST_PRICE_TRIGGER = """
+    CREATE TRIGGER price_history_refresh_latest_price
+    AFTER INSERT OR UPDATE OR DELETE ON price_history
+    FOR EACH ROW EXECUTE FUNCTION refresh_latest_price()
+"""
+
+
+def _index_definitions(table: str) -> List[str]:
+    """CREATE INDEX statements for a table's indexes that don't back a constraint"""
+    definitions = op.get_bind().execute(sa.text("""
+        SELECT indexdef FROM pg_indexes i
+        WHERE schemaname = current_schema() AND tablename = :table
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)
+    """), {'table': table}).scalars().all()
+    # A partitioned parent's indexes read "ON ONLY"; replay them to cascade to partitions
+    return [definition.replace(' ON ONLY ', ' ON ') for definition in definitions]
+
+
+def _yearly_partitions(table: str, source: str) -> List[str]:
+    """CREATE TABLE ... PARTITION OF statements from the oldest row's year through next year"""
+    next_year = date.today().year + 1
+    oldest = op.get_bind().execute(sa.text(f"SELECT min(date) FROM {source}")).scalar()
+    first_year = min(oldest.year, next_year) if oldest else date.today().year
+
+    statements = [
+        f"CREATE TABLE {table}_y{year} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        for year in range(first_year, next_year + 1)
+    ]
+    statements.append(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    return statements
+
+
+def _rebuild(table: str, order_by: str, partitioned: bool) -> None:
+    """Recreate a table with the same columns, data and indexes, partitioned by date or not"""
+    indexes = _index_definitions(table)
+    old = f"{table}_old"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    if partitioned:
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (date)")
+        for statement in _yearly_partitions(table, old):
+            op.execute(statement)
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old} ORDER BY {order_by}")
+    # The serial sequence is owned by the old table and would be dropped with it
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {old}")
+
+    primary_key = 'id, date' if partitioned else 'id'
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})")
+    for definition in indexes:
+        op.execute(definition)
+    op.execute(f"ANALYZE {table}")
+
+
+def upgrade() -> None:
+    for table, order_by in PARTITIONED_TABLES.items():
+        _rebuild(table, order_by, partitioned=True)
+    # Dropping the old price_history dropped its latest_price trigger
+    op.execute(LATEST_PRICE_TRIGGER)
+
+
+def downgrade() -> None:
+    for table, order_by in PARTITIONED_TABLES.items():
+        _rebuild(table, order_by, partitioned=False)
+    op.execute(LATEST_PRICE_TRIGGER)
+    op.execute("ALTER TABLE price_history CLUSTER ON ix_price_history_symbol_date")
@@ -0,0 +1,44 @@
+"""add_price_history_covering_index
+
+Revision ID: b2e6f8c1d437
+Revises: a9d3e5b7c284
+Create Date: 2026-10-17 14:00:00.000000
+
+Replace the (symbol, date) index with a covering one that INCLUDEs close_price
+and volume, so per-symbol close/volume lookups and lookback ranges are
+index-only scans with no heap fetches. symbol leads the new index, so the
+standalone symbol index is dropped; the date index stays for cross-symbol date
+ranges. price_history is partitioned, and CREATE INDEX CONCURRENTLY is not
+supported on partitioned tables, so the index is built normally (the table is
+a few thousand rows per year). VACUUM afterwards sets the visibility map that
+index-only scans rely on.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6f8c1d437'
+down_revision: Union[str, None] = 'a9d3e5b7c284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_price_history_symbol_date_covering', 'price_history', ['symbol', 'date'],
+        unique=False, postgresql_include=['close_price', 'volume']
+    )
+    op.drop_index('ix_price_history_symbol_date', table_name='price_history')
+    op.drop_index('ix_price_history_symbol', table_name='price_history')
+
+    # VACUUM can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute("VACUUM (ANALYZE) price_history")
+
+
+def downgrade() -> None:
+    op.create_index('ix_price_history_symbol', 'price_history', ['symbol'], unique=False)
+    op.create_index('ix_price_history_symbol_date', 'price_history', ['symbol', 'date'], unique=False)
+    op.drop_index('ix_price_history_symbol_date_covering', table_name='price_history')
@@ -0,0 +1,40 @@
+"""convert_json_columns_to_jsonb
+
+Revision ID: b7e1d3f9a265
+Revises: a4d6f0c2e819
+Create Date: 2026-10-17 11:00:00.000000
+
+Store signal allocations/features and config assets as jsonb: binary storage
+that is not re-parsed on every read, and can be GIN-indexed if a query ever
+filters on it. The ALTER rewrites each table, which is cheap at these sizes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1d3f9a265'
+down_revision: Union[str, None] = 'a4d6f0c2e819'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('daily_signals', 'allocations'),
+    ('daily_signals', 'features_used'),
+    ('trading_config', 'assets'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(),
+                        postgresql_using=f'{column}::jsonb')
+
+
+def downgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=sa.JSON(),
+                        postgresql_using=f'{column}::json')
@@ -0,0 +1,42 @@
+"""add_jsonb_path_ops_gin_indexes
+
+Revision ID: c3f8a1e6d094
+Revises: b7e1d3f9a265
+Create Date: 2026-10-17 11:30:00.000000
+
+GIN indexes over daily_signals.allocations and trading_config.assets so
+containment queries (allocations @> '{"SPY": ...}') are index scans rather
+than sequential scans. jsonb_path_ops only supports @>, and in exchange is a
+fraction of the size of the default jsonb_ops index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1e6d094'
+down_revision: Union[str, None] = 'b7e1d3f9a265'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GIN_INDEXES = [
+    ('ix_daily_signals_allocations_gin', 'daily_signals', 'allocations'),
+    ('ix_trading_config_assets_gin', 'trading_config', 'assets'),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; don't block signal/config writes while building
+    with op.get_context().autocommit_block():
+        for name, table, column in GIN_INDEXES:
+            op.create_index(
+                name, table, [column], unique=False, postgresql_concurrently=True,
+                postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'}
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in GIN_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
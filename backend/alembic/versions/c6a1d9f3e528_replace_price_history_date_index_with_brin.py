@@ -0,0 +1,38 @@
+"""replace_price_history_date_index_with_brin
+
+Revision ID: c6a1d9f3e528
+Revises: b2e6f8c1d437
+Create Date: 2026-10-17 14:30:00.000000
+
+Swap the B-tree on price_history.date for a BRIN index. price_history is
+appended in date order, so per-32-page min/max summaries narrow a date range
+to a handful of blocks at a tiny fraction of the B-tree's size and write cost.
+Per-symbol lookups use the (symbol, date) covering index, not this one.
+
+Partitioning was already done by a9d3e5b7c284 (yearly ranges; monthly
+partitions would hold ~60 rows each at this table's volume). Built
+non-concurrently, as the table is partitioned.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a1d9f3e528'
+down_revision: Union[str, None] = 'b2e6f8c1d437'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_price_history_date_brin', 'price_history', ['date'], unique=False,
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+    )
+    op.drop_index('ix_price_history_date', table_name='price_history')
+
+
+def downgrade() -> None:
+    op.create_index('ix_price_history_date', 'price_history', ['date'], unique=False)
+    op.drop_index('ix_price_history_date_brin', table_name='price_history')
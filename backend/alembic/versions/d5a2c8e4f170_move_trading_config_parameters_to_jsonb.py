@@ -0,0 +1,129 @@
+"""move_trading_config_parameters_to_jsonb
+
+Revision ID: d5a2c8e4f170
+Revises: c3f8a1e6d094
+Create Date: 2026-10-17 12:00:00.000000
+
+Collapse trading_config's per-parameter columns into one params JSONB column
+keyed by parameter name. Every new tunable used to need an ALTER TABLE (and a
+matching test-table change); now it only needs a TradingConfig dataclass field.
+Versioning columns (dates, assets, metadata) stay as real columns.
+
+NULL parameters are left out of params so they keep falling back to the
+dataclass defaults. Downgrade restores the columns as nullable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a2c8e4f170'
+down_revision: Union[str, None] = 'c3f8a1e6d094'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns that stay on trading_config
+KEPT_COLUMNS = ('id', 'start_date', 'end_date', 'assets', 'created_at', 'created_by', 'notes')
+
+# Parameter columns as of this revision, for downgrade
+INTEGER_PARAMS = ('lookback_days', 'rsi_period', 'bollinger_period')
+FLOAT_PARAMS = (
+    'daily_capital', 'regime_bullish_threshold', 'regime_bearish_threshold',
+    'risk_high_threshold', 'risk_medium_threshold', 'allocation_low_risk',
+    'allocation_medium_risk', 'allocation_high_risk', 'allocation_neutral',
+    'sell_percentage', 'momentum_weight', 'price_momentum_weight',
+    'max_drawdown_tolerance', 'min_sharpe_target', 'rsi_oversold_threshold',
+    'rsi_overbought_threshold', 'bollinger_std_multiplier', 'mean_reversion_allocation',
+    'volatility_adjustment_factor', 'base_volatility', 'min_confidence_threshold',
+    'confidence_scaling_factor', 'intramonth_drawdown_limit', 'circuit_breaker_reduction',
+    'regime_transition_threshold', 'momentum_loss_threshold', 'momentum_gain_threshold',
+    'strong_trend_threshold', 'regime_confidence_divisor', 'risk_penalty_min',
+    'risk_penalty_max', 'trend_consistency_threshold', 'mean_reversion_base_confidence',
+    'consistency_bonus', 'risk_penalty_multiplier', 'confidence_bucket_high_threshold',
+    'confidence_bucket_medium_threshold', 'bb_oversold_threshold',
+    'bb_overbought_threshold', 'oversold_strong_bonus', 'oversold_mild_bonus',
+    'rsi_mild_oversold', 'bb_mild_oversold', 'overbought_penalty',
+    'price_vs_sma_threshold', 'high_volatility_threshold', 'negative_return_threshold',
+    'severe_pressure_threshold', 'moderate_pressure_threshold', 'severe_pressure_risk',
+    'moderate_pressure_risk', 'defensive_cash_threshold', 'sell_defensive_multiplier',
+    'sell_aggressive_multiplier', 'sell_moderate_pressure_multiplier',
+    'sell_bullish_risk_multiplier', 'mean_reversion_max_risk', 'neutral_deleverage_risk',
+    'neutral_hold_risk', 'bullish_excessive_risk', 'extreme_risk_threshold',
+    'diversify_top_asset_max', 'diversify_top_asset_min', 'diversify_second_asset_max',
+    'diversify_second_asset_min', 'diversify_third_asset_max',
+    'diversify_third_asset_min', 'two_asset_top', 'two_asset_second',
+    'volatility_normalization_factor', 'stability_threshold', 'stability_discount_factor',
+    'correlation_risk_base', 'correlation_risk_multiplier', 'risk_volatility_weight',
+    'risk_correlation_weight', 'trend_aligned_multiplier', 'trend_mixed_multiplier',
+    'market_condition_r_squared_threshold', 'market_condition_slope_threshold',
+    'market_condition_choppy_r_squared', 'market_condition_choppy_volatility',
+    'score_profitable_bonus', 'score_sharpe_bonus', 'score_low_dd_bonus',
+    'score_all_horizons_bonus', 'score_two_horizons_bonus', 'score_unprofitable_penalty',
+    'score_high_dd_penalty', 'score_sharpe_penalty', 'score_momentum_bonus',
+    'score_choppy_penalty', 'score_confidence_bonus', 'score_mean_reversion_bonus',
+    'tune_aggressive_win_rate', 'tune_aggressive_participation', 'tune_aggressive_score',
+    'tune_conservative_win_rate', 'tune_conservative_dd', 'tune_conservative_score',
+    'tune_allocation_step', 'tune_neutral_step', 'tune_risk_threshold_step',
+    'tune_sharpe_aggressive_threshold', 'tune_sell_effective_threshold',
+    'tune_sell_underperform_threshold', 'tune_bearish_sell_participation',
+    'tune_high_dd_no_sell_threshold', 'tune_sell_major_adjustment',
+    'tune_sell_minor_adjustment', 'tune_low_conf_poor_threshold',
+    'tune_high_conf_strong_threshold', 'tune_confidence_threshold_step',
+    'tune_confidence_scaling_step', 'tune_mr_good_threshold', 'tune_mr_poor_threshold',
+    'tune_rsi_threshold_step', 'validation_sharpe_tolerance', 'validation_dd_tolerance',
+    'validation_passing_score', 'validation_sharpe_weight', 'validation_drawdown_weight',
+    'score_dd_low_threshold', 'score_dd_high_threshold', 'tune_allocation_low_risk_max',
+    'tune_allocation_low_risk_min', 'tune_allocation_medium_risk_max',
+    'tune_allocation_medium_risk_min', 'tune_allocation_high_risk_min',
+    'tune_allocation_high_risk_max', 'tune_allocation_neutral_min',
+    'tune_allocation_neutral_max', 'tune_risk_medium_threshold_min',
+    'tune_risk_medium_threshold_max', 'tune_risk_high_threshold_min',
+    'tune_risk_high_threshold_max', 'tune_regime_bullish_threshold_max',
+    'tune_regime_bullish_threshold_min', 'tune_sell_percentage_min',
+    'tune_sell_percentage_max', 'tune_min_confidence_threshold_max',
+    'tune_confidence_scaling_factor_max', 'tune_mean_reversion_allocation_max',
+    'tune_rsi_oversold_threshold_min', 'tune_rsi_oversold_threshold_max',
+    'regime_momentum_weight', 'regime_sma20_weight', 'regime_sma50_weight',
+    'adaptive_threshold_clamp_min', 'adaptive_threshold_clamp_max',
+    'risk_label_high_threshold', 'risk_label_medium_threshold',
+)
+
+
+def upgrade() -> None:
+    op.add_column('trading_config', sa.Column(
+        'params', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")
+    ))
+
+    inspector = sa.inspect(op.get_bind())
+    param_columns = [
+        column['name'] for column in inspector.get_columns('trading_config')
+        if column['name'] not in KEPT_COLUMNS + ('params',)
+    ]
+
+    # to_jsonb(row) minus the kept columns: jsonb_build_object would exceed the
+    # 100-argument function limit with this many parameters
+    dropped = ', '.join(f"'{name}'" for name in KEPT_COLUMNS + ('params',))
+    op.execute(f"""
+        UPDATE trading_config AS c
+        SET params = jsonb_strip_nulls(to_jsonb(c) - ARRAY[{dropped}]::text[])
+    """)
+
+    op.execute("ALTER TABLE trading_config " + ", ".join(
+        f"DROP COLUMN {name}" for name in param_columns
+    ))
+
+
+def downgrade() -> None:
+    columns = [(name, 'INTEGER') for name in INTEGER_PARAMS]
+    columns += [(name, 'DOUBLE PRECISION') for name in FLOAT_PARAMS]
+
+    op.execute("ALTER TABLE trading_config " + ", ".join(
+        f"ADD COLUMN {name} {sql_type}" for name, sql_type in columns
+    ))
+    op.execute("UPDATE trading_config SET " + ", ".join(
+        f"{name} = (params ->> '{name}')::{sql_type}" for name, sql_type in columns
+    ))
+    op.drop_column('trading_config', 'params')
@@ -0,0 +1,34 @@
+"""store_trade_action_as_char_code
+
+Revision ID: d8f2b4a6c039
+Revises: c6a1d9f3e528
+Create Date: 2026-10-17 15:00:00.000000
+
+Store trades.action as a one-letter CHAR(1) code ('B', 'S', 'H') instead of
+the native actiontype enum. Rows are narrower, bulk inserts skip the enum
+label lookup, and a new action no longer needs ALTER TYPE. The ORM maps
+codes to ActionType through models.ActionChar.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f2b4a6c039'
+down_revision: Union[str, None] = 'c6a1d9f3e528'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE trades ALTER COLUMN action TYPE char(1) USING substr(action::text, 1, 1)")
+    op.execute("DROP TYPE actiontype")
+
+
+def downgrade() -> None:
+    op.execute("CREATE TYPE actiontype AS ENUM ('BUY', 'SELL', 'HOLD')")
+    op.execute("""
+        ALTER TABLE trades ALTER COLUMN action TYPE actiontype
+        USING (CASE action WHEN 'B' THEN 'BUY' WHEN 'S' THEN 'SELL' ELSE 'HOLD' END)::actiontype
+    """)
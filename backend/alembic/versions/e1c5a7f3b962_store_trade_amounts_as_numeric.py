@@ -0,0 +1,36 @@
+"""store_trade_amounts_as_numeric
+
+Revision ID: e1c5a7f3b962
+Revises: d8f2b4a6c039
+Create Date: 2026-10-17 15:30:00.000000
+
+Store trades.quantity, price and amount as numeric(18,4) instead of double
+precision, so summing a backtest's trade amounts is exact rather than
+accumulating binary rounding error. Existing values are rounded to 4
+decimal places. One ALTER, so the table is rewritten once.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c5a7f3b962'
+down_revision: Union[str, None] = 'd8f2b4a6c039'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRADE_AMOUNT_COLUMNS = ('quantity', 'price', 'amount')
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE trades " + ", ".join(
+        f"ALTER COLUMN {name} TYPE NUMERIC(18, 4) USING round({name}::numeric, 4)"
+        for name in TRADE_AMOUNT_COLUMNS
+    ))
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE trades " + ", ".join(
+        f"ALTER COLUMN {name} TYPE DOUBLE PRECISION" for name in TRADE_AMOUNT_COLUMNS
+    ))
@@ -0,0 +1,43 @@
+"""add_daily_signals_buy_trade_date_index
+
+Revision ID: e3a9c7b15d42
+Revises: 8c1f4e6a2d57
+Create Date: 2026-10-17 10:00:00.000000
+
+Partial trade_date index over BUY signals only. The half Kelly aggregate reads
+just the BUY signals in a 60-day window, so it probes this small index instead
+of walking every signal in the range. The predicate is spelled exactly as
+SQLAlchemy renders the query filter so the planner can match it.
+
+features_used is not INCLUDEd: JSON payloads can exceed the B-tree tuple size
+limit, which would make signal inserts fail.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c7b15d42'
+down_revision: Union[str, None] = '8c1f4e6a2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; don't block signal writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_daily_signals_buy_trade_date', 'daily_signals', ['trade_date'],
+            unique=False, postgresql_concurrently=True,
+            postgresql_where=sa.text("CAST((features_used ->> 'action') AS VARCHAR) = 'BUY'")
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_daily_signals_buy_trade_date', table_name='daily_signals',
+            postgresql_concurrently=True
+        )
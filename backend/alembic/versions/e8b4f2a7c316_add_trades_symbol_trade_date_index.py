@@ -0,0 +1,38 @@
+"""add_trades_symbol_trade_date_index
+
+Revision ID: e8b4f2a7c316
+Revises: d5a2c8e4f170
+Create Date: 2026-10-17 12:30:00.000000
+
+Composite (symbol, trade_date) index on trades so "trades for SPY over a date
+range" is an index range scan instead of a sequential scan. symbol leads, so
+the same index serves symbol-only lookups and no separate symbol index is
+needed. portfolio.symbol is already covered by its unique constraint.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4f2a7c316'
+down_revision: Union[str, None] = 'd5a2c8e4f170'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; don't block trade writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_trades_symbol_trade_date', 'trades', ['symbol', 'trade_date'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_trades_symbol_trade_date', table_name='trades',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,38 @@
+"""use_c_collation_for_symbol_columns
+
+Revision ID: f4b8d2e6a715
+Revises: e1c5a7f3b962
+Create Date: 2026-10-17 16:00:00.000000
+
+Give every symbol column the "C" collation. Tickers are plain ASCII, so
+byte order equals their natural order, and B-tree lookups and joins on
+symbol become memcmp comparisons instead of locale-aware strcoll calls.
+All four tables change together because Postgres refuses to compare
+columns with different implicit collations (e.g. portfolio JOIN
+latest_price). Indexes on symbol are rebuilt by the ALTERs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2e6a715'
+down_revision: Union[str, None] = 'e1c5a7f3b962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYMBOL_TABLES = ('price_history', 'latest_price', 'trades', 'portfolio')
+
+
+def _set_collation(collation: str) -> None:
+    for table in SYMBOL_TABLES:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN symbol TYPE VARCHAR(10) COLLATE "{collation}"')
+
+
+def upgrade() -> None:
+    _set_collation('C')
+
+
+def downgrade() -> None:
+    _set_collation('default')
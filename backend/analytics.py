@@ -194,7 +194,7 @@ class Analytics:
             SELECT COALESCE(SUM(amount), 0) as total_spent
             FROM trades
             WHERE trade_date >= %s AND trade_date <= %s
-            AND action = 'BUY'
+            AND action = 'B'
         """, (self.start_date, self.end_date))
         result = self.cursor.fetchone()
         total_spent = Decimal(str(result['total_spent']))
@@ -204,7 +204,7 @@ class Analytics:
             SELECT COALESCE(SUM(amount), 0) as total_proceeds
             FROM trades
             WHERE trade_date >= %s AND trade_date <= %s
-            AND action = 'SELL'
+            AND action = 'S'
         """, (self.start_date, self.end_date))
         result = self.cursor.fetchone()
         cash_from_sells = Decimal(str(result['total_proceeds']))
@@ -231,7 +231,7 @@ class Analytics:
             self.cursor.execute("""
                 SELECT COALESCE(SUM(amount), 0) as invested_today
                 FROM trades
-                WHERE trade_date = %s AND action = 'BUY'
+                WHERE trade_date = %s AND action = 'B'
             """, (trade_date,))
             invested_today = Decimal(str(self.cursor.fetchone()['invested_today']))
             
@@ -239,7 +239,7 @@ class Analytics:
             self.cursor.execute("""
                 SELECT COALESCE(SUM(amount), 0) as sold_today
                 FROM trades
-                WHERE trade_date = %s AND action = 'SELL'
+                WHERE trade_date = %s AND action = 'S'
             """, (trade_date,))
             sold_today = Decimal(str(self.cursor.fetchone()['sold_today']))
             
@@ -266,7 +266,7 @@ class Analytics:
             self.cursor.execute("""
                 SELECT COALESCE(SUM(amount), 0) as spent
                 FROM trades
-                WHERE trade_date <= %s AND action = 'BUY'
+                WHERE trade_date <= %s AND action = 'B'
                 AND trade_date >= %s
             """, (perf['date'], self.start_date))
             spent = Decimal(str(self.cursor.fetchone()['spent']))
@@ -275,7 +275,7 @@ class Analytics:
             self.cursor.execute("""
                 SELECT COALESCE(SUM(amount), 0) as proceeds
                 FROM trades
-                WHERE trade_date <= %s AND action = 'SELL'
+                WHERE trade_date <= %s AND action = 'S'
                 AND trade_date >= %s
             """, (perf['date'], self.start_date))
             proceeds = Decimal(str(self.cursor.fetchone()['proceeds']))
@@ -19,6 +19,26 @@ from config import get_settings, get_trading_config
 settings = get_settings()
 DATABASE_URL = settings.database_url
 
+# Per-day progress line: the displayed signal features and the total BUY spend,
+# pulled out of the JSONB columns so the full feature dump never leaves the server
+SIGNAL_SUMMARY_QUERY = """
+    SELECT
+        COALESCE(features_used->>'action', 'UNKNOWN') AS action,
+        COALESCE(features_used->>'signal_type', '') AS signal_type,
+        COALESCE((features_used->>'allocation_pct')::float8, 0) AS allocation_pct,
+        COALESCE((features_used->>'final_allocation_pct')::float8,
+                 (features_used->>'allocation_pct')::float8, 0) AS final_allocation_pct,
+        COALESCE((features_used->>'capital_scale_factor')::float8, 1.0) AS capital_scale_factor,
+        COALESCE((features_used->>'half_kelly_pct')::float8, 0.0) AS half_kelly_pct,
+        COALESCE((features_used->>'regime')::float8, 0) AS regime,
+        COALESCE((features_used->>'risk')::float8, 0) AS risk,
+        (SELECT COALESCE(sum(amount::numeric), 0)
+         FROM jsonb_each_text(allocations) AS a(symbol, amount)
+         WHERE amount::numeric > 0) AS buy_amount
+    FROM daily_signals
+    WHERE trade_date = %s
+"""
+
 
 class Backtest:
     def __init__(self, start_date: date, end_date: date):
@@ -346,9 +366,23 @@ class Backtest:
                     'return_pct': benchmark_return_pct
                 }
         
-        # Best and worst days
-        best_day = max(metrics, key=lambda x: x['daily_return'] if x['daily_return'] else Decimal('-inf'))
-        worst_day = min(metrics, key=lambda x: x['daily_return'] if x['daily_return'] else Decimal('inf'))
+        # Best and worst days (NULL returns sort last in both directions)
+        self.cursor.execute("""
+            (SELECT 'best' AS kind, date, daily_return
+             FROM performance_metrics
+             WHERE date >= %s AND date <= %s
+             ORDER BY daily_return DESC NULLS LAST
+             LIMIT 1)
+            UNION ALL
+            (SELECT 'worst' AS kind, date, daily_return
+             FROM performance_metrics
+             WHERE date >= %s AND date <= %s
+             ORDER BY daily_return ASC NULLS LAST
+             LIMIT 1)
+        """, (self.start_date, self.end_date, self.start_date, self.end_date))
+        extremes = {row['kind']: row for row in self.cursor.fetchall()}
+        best_day = extremes['best']
+        worst_day = extremes['worst']
         
         # Win rate
         winning_days = sum(1 for m in metrics if m['daily_return'] and m['daily_return'] > 0)
@@ -468,23 +502,19 @@ class Backtest:
                 failed_days.append((trade_date, "signal_generation", error))
                 continue
 
-            # Get the signal to show what action was decided
-            self.cursor.execute("""
-                SELECT features_used, allocations FROM daily_signals
-                WHERE trade_date = %s
-            """, (trade_date,))
+            # Get the signal to show what action was decided (only the keys displayed,
+            # extracted from the JSONB columns server-side)
+            self.cursor.execute(SIGNAL_SUMMARY_QUERY, (trade_date,))
             signal_row = self.cursor.fetchone()
             if signal_row:
-                features = signal_row['features_used']
-                allocations = signal_row['allocations']
-                action = features.get('action', 'UNKNOWN')
-                allocation_pct = features.get('allocation_pct', 0)
-                signal_type = features.get('signal_type', '')
+                action = signal_row['action']
+                allocation_pct = signal_row['allocation_pct']
+                signal_type = signal_row['signal_type']
 
                 # Make output clearer based on action type
                 if action == 'BUY':
                     # FIXED: Show actual amount being deployed from allocations, not just daily_budget * pct
-                    actual_buy_amount = sum(Decimal(str(v)) for v in allocations.values() if v > 0)
+                    actual_buy_amount = signal_row['buy_amount']
 
                     # Get current cash balance to show context
                     self.cursor.execute("SELECT quantity FROM portfolio WHERE symbol = 'CASH'")
@@ -493,9 +523,9 @@ class Backtest:
                     available_cash = cash_before_daily + self.daily_budget
 
                     # Get capital scaling details if available
-                    final_allocation_pct = features.get('final_allocation_pct', allocation_pct)
-                    capital_scale_factor = features.get('capital_scale_factor', 1.0)
-                    half_kelly_pct = features.get('half_kelly_pct', 0.0)
+                    final_allocation_pct = signal_row['final_allocation_pct']
+                    capital_scale_factor = signal_row['capital_scale_factor']
+                    half_kelly_pct = signal_row['half_kelly_pct']
 
                     # Build display string
                     display_parts = [f"BUY ${actual_buy_amount:,.0f}"]
@@ -517,8 +547,8 @@ class Backtest:
                     print(f"✓ (SELL {allocation_pct*100:.1f}% of each position | {signal_type})")
                 elif action == 'HOLD':
                     # Enhanced HOLD display to help diagnose stalling
-                    regime = features.get('regime', 0)
-                    risk = features.get('risk', 0)
+                    regime = signal_row['regime']
+                    risk = signal_row['risk']
                     print(f"✓ (HOLD | {signal_type} | regime:{regime:.2f} risk:{risk:.0f})")
                 else:
                     print(f"✓ ({action})")
@@ -536,9 +566,9 @@ class Backtest:
 
             # Show trade summary
             self.cursor.execute("""
-                SELECT symbol, action, quantity, amount
+                SELECT symbol, CASE action WHEN 'B' THEN 'BUY' ELSE 'SELL' END AS action, quantity, amount
                 FROM trades
-                WHERE trade_date = %s AND action != 'HOLD'
+                WHERE trade_date = %s AND action != 'H'
                 ORDER BY symbol
             """, (trade_date,))
             trades_today = self.cursor.fetchall()
@@ -6,6 +6,7 @@ from datetime import date
 from typing import Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from dotenv import load_dotenv
 
 
 class Settings(BaseSettings):
@@ -31,6 +32,21 @@ class Settings(BaseSettings):
     market_close_time: str = "16:30"  # 4:30 PM ET
     signal_generation_time: str = "06:00"  # 6:00 AM ET
 
+    # Debug mode (enables SQL statement logging)
+    debug: bool = False
+
+    # SQLAlchemy connection pool sizing (per process)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_recycle_seconds: int = 1800
+    # SELECT 1 liveness check on every checkout costs a round trip per request;
+    # pool_recycle already retires connections before server idle timeouts
+    db_pool_pre_ping: bool = False
+
+    # Worker processes for per-asset feature calculation (1 = in-process).
+    # Process startup outweighs the work for a handful of symbols; raise only for large universes.
+    feature_workers: int = 1
+
     class Config:
         # Load from .env (local) or .env.production
         env_file = ".env"
@@ -39,6 +55,12 @@ class Settings(BaseSettings):
         extra = 'ignore'  # Ignore extra fields in .env files
 
 
+@lru_cache()
+def load_environment() -> None:
+    """Load .env into os.environ once per process (for code that reads os.getenv)"""
+    load_dotenv()
+
+
 @lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance (sensitive credentials only)"""
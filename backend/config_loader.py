@@ -2,23 +2,39 @@
 Configuration Loader
 Loads trading configuration from database with version tracking support
 """
+import asyncio
+import json
 import os
-from datetime import date
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, asdict
-from functools import lru_cache
-
-import psycopg2
-from psycopg2.extras import RealDictCursor, Json
-from dotenv import load_dotenv
-
-# Load environment variables (only DATABASE_URL and API keys)
-load_dotenv()
-
-
-@dataclass
+import threading
+from datetime import date, timedelta
+from typing import Optional, Dict, Any, Callable, Mapping, Sequence, get_type_hints
+from dataclasses import dataclass
+from operator import attrgetter
+
+import asyncpg
+from cachetools import LRUCache, TTLCache
+from psycopg2.extras import Json
+
+from config import load_environment
+from connection_pool import pooled_connection, prepare_once
+
+# Short-lived cache of active configs keyed by as-of date (config changes at most daily)
+CONFIG_CACHE_MAX_DATES = 32
+CONFIG_CACHE_TTL_SECONDS = 60
+_config_cache = TTLCache(maxsize=CONFIG_CACHE_MAX_DATES, ttl=CONFIG_CACHE_TTL_SECONDS)
+_config_cache_lock = threading.Lock()
+
+# Parsed configs keyed by version token (id, end_date). The loaders look up the
+# active version with a two-column query and only fetch and parse the full row for
+# a version they haven't seen; end_date is in the key because closing a config
+# is the one change made to an existing row.
+CONFIG_VERSION_CACHE_SIZE = 4
+_config_versions = LRUCache(maxsize=CONFIG_VERSION_CACHE_SIZE)
+
+
+@dataclass(slots=True, frozen=True)
 class TradingConfig:
-    """Trading configuration parameters"""
+    """Trading configuration parameters (immutable; use dataclasses.replace to derive a new one)"""
     # Basic Trading Parameters
     daily_capital: float
     assets: list[str]
@@ -262,35 +278,136 @@ class TradingConfig:
     notes: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
+        """
+        Convert to dictionary
+
+        Values are not deep-copied (the assets list is shared with the config),
+        so treat the result's containers as read-only.
+        """
+        return dict(zip(_CONFIG_FIELDS, _get_config_values(self)))
 
     @classmethod
-    def from_db_row(cls, row: Dict) -> 'TradingConfig':
+    def from_db_row(cls, row: Mapping[str, Any]) -> 'TradingConfig':
         """Create from database row with automatic field mapping and defaults"""
-        import inspect
-
-        # Get all fields from the dataclass with their defaults
-        fields = {f.name: f for f in cls.__dataclass_fields__.values()}
-
-        # Build kwargs from database row
-        kwargs = {}
-        for field_name, field_info in fields.items():
-            if field_name in row and row[field_name] is not None:
-                value = row[field_name]
-                # Convert to appropriate type
-                if field_info.type == int or field_info.type == 'int':
-                    kwargs[field_name] = int(value)
-                elif field_info.type == float or field_info.type == 'float':
-                    kwargs[field_name] = float(value)
-                elif field_info.type == 'list[str]' or str(field_info.type).startswith('list'):
-                    kwargs[field_name] = value  # Already a list from JSON
-                else:
-                    kwargs[field_name] = value
-            # If field not in row, use default from dataclass (if it exists)
-            # Dataclass defaults are automatically applied during instantiation
+        # Fields missing from the row (or NULL) fall back to dataclass defaults
+        return cls(**cls._ROW_TO_KWARGS(flatten_config_row(row)))
+
+    @classmethod
+    def from_db_tuple(cls, columns: Sequence[str], row: Sequence) -> 'TradingConfig':
+        """Create from a positional (tuple cursor) row and its column names"""
+        return cls.from_db_row(dict(zip(columns, row)))
+
+
+def flatten_config_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a trading_config row's params JSONB into its column values
 
-        return cls(**kwargs)
+    Args:
+        row: Mapping row (dict, RealDictRow or asyncpg Record); rows without a
+            params column are returned as a plain dict
+
+    Returns:
+        Field name -> value for the row's columns and parameters
+    """
+    fields = dict(row)
+    params = fields.pop('params', None)
+    if params:
+        fields.update(params)
+    return fields
+
+
+def _passthrough(value: Any) -> Any:
+    """Return database values that need no conversion (lists from JSON, dates, text)"""
+    return value
+
+
+# Converters for database values by declared field type
+_TYPE_CONVERTERS: Dict[Any, Callable[[Any], Any]] = {int: int, float: float}
+
+
+def build_field_converters(cls) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Map each dataclass field to the converter for its database value
+
+    Resolved once per class so from_db_row doesn't re-inspect field types per row.
+    """
+    hints = get_type_hints(cls)
+    return {
+        name: _TYPE_CONVERTERS.get(hints[name], _passthrough)
+        for name in cls.__dataclass_fields__
+    }
+
+
+def build_row_to_kwargs(converters: Dict[str, Callable[[Any], Any]]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Compile a straight-line row -> constructor kwargs function for a fixed set of fields
+
+    The generated code unrolls one get/convert step per field, so from_db_row
+    doesn't loop over the converter table on every row. NULL or missing
+    values are left out so the dataclass defaults apply.
+
+    Args:
+        converters: Field name -> converter, as returned by build_field_converters
+
+    Returns:
+        Function taking a mapping row (dict, RealDictRow or asyncpg Record)
+    """
+    namespace: Dict[str, Any] = {}
+    lines = ["def row_to_kwargs(row):", "    kwargs = {}", "    get = row.get"]
+    for index, (name, convert) in enumerate(converters.items()):
+        lines.append(f"    value = get({name!r})")
+        if convert is _passthrough:
+            lines.append(f"    if value is not None: kwargs[{name!r}] = value")
+        else:
+            namespace[f"_convert_{index}"] = convert
+            lines.append(f"    if value is not None: kwargs[{name!r}] = _convert_{index}(value)")
+    lines.append("    return kwargs")
+
+    exec("\n".join(lines), namespace)
+    return namespace["row_to_kwargs"]
+
+
+TradingConfig._CONVERTERS = build_field_converters(TradingConfig)
+TradingConfig._ROW_TO_KWARGS = staticmethod(build_row_to_kwargs(TradingConfig._CONVERTERS))
+
+# Field names in declaration order and a C-level getter for to_dict
+_CONFIG_FIELDS = tuple(TradingConfig.__dataclass_fields__)
+_get_config_values = attrgetter(*_CONFIG_FIELDS)
+
+# Fields stored in their own trading_config columns. Every other field is a
+# tunable parameter, stored in the params JSONB column under its field name
+_COLUMN_FIELDS = ('id', 'start_date', 'end_date', 'assets', 'created_by', 'notes')
+_PARAM_FIELDS = tuple(name for name in _CONFIG_FIELDS if name not in _COLUMN_FIELDS)
+_get_param_values = attrgetter(*_PARAM_FIELDS)
+
+# Server-side prepared statements for the hot config reads. Only the columns the
+# dataclass reads are selected (not created_at)
+_SELECT_COLUMNS = ', '.join(_COLUMN_FIELDS + ('params',))
+ACTIVE_CONFIG_STATEMENT = "cfg_active"
+ACTIVE_CONFIG_QUERY = """
+    SELECT id, end_date FROM trading_config
+    WHERE start_date <= $1
+      AND (end_date IS NULL OR end_date >= $1)
+    ORDER BY start_date DESC
+    LIMIT 1
+"""
+CONFIG_BY_ID_STATEMENT = "cfg_by_id"
+CONFIG_BY_ID_QUERY = f"SELECT {_SELECT_COLUMNS} FROM trading_config WHERE id = $1"
+
+# create_new_version SQL; assets and params are JSONB, written through Json()
+_INSERT_COLUMNS = ('start_date', 'end_date', 'assets', 'params', 'created_by', 'notes')
+_INSERT_SQL = f"""
+    INSERT INTO trading_config ({', '.join(_INSERT_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(_INSERT_COLUMNS))})
+    RETURNING id
+"""
+# Writable CTE prepended to _INSERT_SQL to close the previous active config
+_CLOSE_PREVIOUS_SQL = """
+    WITH closed AS (
+        UPDATE trading_config
+        SET end_date = %s
+        WHERE end_date IS NULL
+    )"""
 
 
 class ConfigLoader:
@@ -303,6 +420,8 @@ class ConfigLoader:
         Args:
             database_url: Database connection URL. If not provided, reads from DATABASE_URL env var
         """
+        if database_url is None:
+            load_environment()
         self.database_url = database_url or os.getenv("DATABASE_URL")
         if not self.database_url:
             raise ValueError("DATABASE_URL not found in environment variables")
@@ -323,29 +442,32 @@ class ConfigLoader:
         if as_of_date is None:
             as_of_date = date.today()
 
-        conn = psycopg2.connect(self.database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        with pooled_connection(self.database_url) as conn:
+            # Plain tuple cursor: one wide row, mapped by column position
+            cursor = conn.cursor()
 
-        try:
-            # Query for active config (where start_date <= as_of_date and (end_date is NULL or end_date >= as_of_date))
-            cursor.execute("""
-                SELECT * FROM trading_config
-                WHERE start_date <= %s
-                  AND (end_date IS NULL OR end_date >= %s)
-                ORDER BY start_date DESC
-                LIMIT 1
-            """, (as_of_date, as_of_date))
+            try:
+                # Version token of the active config (where start_date <= as_of_date and (end_date is NULL or end_date >= as_of_date))
+                prepare_once(conn, ACTIVE_CONFIG_STATEMENT, "date", ACTIVE_CONFIG_QUERY)
+                cursor.execute(f"EXECUTE {ACTIVE_CONFIG_STATEMENT}(%s)", (as_of_date,))
 
-            row = cursor.fetchone()
+                version = cursor.fetchone()
 
-            if not row:
-                raise ValueError(f"No active trading configuration found for date {as_of_date}")
+                if not version:
+                    raise ValueError(f"No active trading configuration found for date {as_of_date}")
 
-            return TradingConfig.from_db_row(row)
+                version = tuple(version[:2])
+                config = _get_config_version(version)
+                if config is None:
+                    prepare_once(conn, CONFIG_BY_ID_STATEMENT, "integer", CONFIG_BY_ID_QUERY)
+                    cursor.execute(f"EXECUTE {CONFIG_BY_ID_STATEMENT}(%s)", (version[0],))
+                    columns = [column[0] for column in cursor.description]
+                    config = TradingConfig.from_db_tuple(columns, cursor.fetchone())
+                    _set_config_version(version, config)
+                return config
 
-        finally:
-            cursor.close()
-            conn.close()
+            finally:
+                cursor.close()
 
     def get_config_by_id(self, config_id: int) -> TradingConfig:
         """
@@ -357,21 +479,22 @@ class ConfigLoader:
         Returns:
             TradingConfig instance
         """
-        conn = psycopg2.connect(self.database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        with pooled_connection(self.database_url) as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("SELECT * FROM trading_config WHERE id = %s", (config_id,))
-            row = cursor.fetchone()
+            try:
+                prepare_once(conn, CONFIG_BY_ID_STATEMENT, "integer", CONFIG_BY_ID_QUERY)
+                cursor.execute(f"EXECUTE {CONFIG_BY_ID_STATEMENT}(%s)", (config_id,))
+                row = cursor.fetchone()
 
-            if not row:
-                raise ValueError(f"Configuration with ID {config_id} not found")
+                if not row:
+                    raise ValueError(f"Configuration with ID {config_id} not found")
 
-            return TradingConfig.from_db_row(row)
+                columns = [column[0] for column in cursor.description]
+                return TradingConfig.from_db_tuple(columns, row)
 
-        finally:
-            cursor.close()
-            conn.close()
+            finally:
+                cursor.close()
 
     def create_new_version(
         self,
@@ -394,79 +517,223 @@ class ConfigLoader:
         Returns:
             ID of newly created configuration
         """
-        conn = psycopg2.connect(self.database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        try:
-            # If close_previous, update the previous active config
-            if close_previous:
-                from datetime import timedelta
-                previous_end_date = start_date - timedelta(days=1)
-
-                cursor.execute("""
-                    UPDATE trading_config
-                    SET end_date = %s
-                    WHERE end_date IS NULL
-                """, (previous_end_date,))
-
-            # Build INSERT statement dynamically from dataclass fields
-            # Exclude metadata fields (id, start_date, end_date, created_by, notes)
-            excluded_fields = {'id', 'start_date', 'end_date', 'created_by', 'notes'}
-            fields = {f.name: f for f in TradingConfig.__dataclass_fields__.values()
-                     if f.name not in excluded_fields}
-
-            # Build column names and placeholders
-            columns = ['start_date', 'end_date'] + list(fields.keys()) + ['created_by', 'notes']
-            placeholders = ['%s'] * len(columns)
-
-            # Build values list
-            values = [start_date, None]  # start_date and end_date (NULL)
-            for field_name in fields.keys():
-                value = getattr(config, field_name)
-                # Wrap list/dict in Json() for PostgreSQL JSONB
-                if isinstance(value, (list, dict)):
-                    values.append(Json(value))
+        with pooled_connection(self.database_url) as conn:
+            # Plain tuple cursor: the only fetch is the RETURNING id
+            cursor = conn.cursor()
+
+            try:
+                # If close_previous, close the previous active config in the same
+                # statement (writable CTE) so the UPDATE and INSERT are one round-trip.
+                # The CTE works on the pre-INSERT snapshot, so the new row stays open.
+                if close_previous:
+                    previous_end_date = start_date - timedelta(days=1)
+                    sql = _CLOSE_PREVIOUS_SQL + _INSERT_SQL
+                    params = [previous_end_date]
                 else:
-                    values.append(value)
-            values.extend([created_by, notes])
+                    sql = _INSERT_SQL
+                    params = []
+
+                # start_date, end_date (NULL), assets, params, created_by, notes
+                params.extend((
+                    start_date, None,
+                    Json(config.assets),
+                    Json(dict(zip(_PARAM_FIELDS, _get_param_values(config)))),
+                    created_by, notes
+                ))
+
+                cursor.execute(sql, tuple(params))
 
-            # Execute dynamic INSERT
-            sql = f"""
-                INSERT INTO trading_config ({', '.join(columns)})
-                VALUES ({', '.join(placeholders)})
-                RETURNING id
-            """
-            cursor.execute(sql, tuple(values))
+                new_id = cursor.fetchone()[0]
+                conn.commit()
+                invalidate_config_cache()
 
-            new_id = cursor.fetchone()['id']
-            conn.commit()
+                return new_id
 
-            return new_id
+            except Exception as e:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
 
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            cursor.close()
-            conn.close()
+
+# asyncpg pool sizing (per event loop)
+ASYNC_POOL_MIN_SIZE = 2
+ASYNC_POOL_MAX_SIZE = 10
+ASYNC_STATEMENT_CACHE_SIZE = 100
+
+
+async def _init_async_connection(conn: asyncpg.Connection) -> None:
+    """Decode JSON columns to Python objects, matching psycopg2's behaviour"""
+    for json_type in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            json_type, encoder=json.dumps, decoder=json.loads, schema='pg_catalog'
+        )
+
+
+class AsyncConfigLoader:
+    """Loads trading configuration with asyncpg, for use from async request handlers"""
+
+    def __init__(self, database_url: Optional[str] = None):
+        """
+        Initialize async config loader (the pool is created on first query)
+
+        Args:
+            database_url: Database connection URL. If not provided, reads from DATABASE_URL env var
+        """
+        if database_url is None:
+            load_environment()
+        self.database_url = database_url or os.getenv("DATABASE_URL")
+        if not self.database_url:
+            raise ValueError("DATABASE_URL not found in environment variables")
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Create the asyncpg pool on first use"""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    # asyncpg prepares each query server-side and caches the plan per connection
+                    self._pool = await asyncpg.create_pool(
+                        self.database_url,
+                        min_size=ASYNC_POOL_MIN_SIZE,
+                        max_size=ASYNC_POOL_MAX_SIZE,
+                        statement_cache_size=ASYNC_STATEMENT_CACHE_SIZE,
+                        init=_init_async_connection
+                    )
+        return self._pool
+
+    async def get_active_config(self, as_of_date: Optional[date] = None) -> TradingConfig:
+        """
+        Get the active trading configuration for a specific date
+
+        Args:
+            as_of_date: Date to get config for. Defaults to today.
+
+        Returns:
+            TradingConfig instance
+
+        Raises:
+            ValueError: If no active configuration found
+        """
+        if as_of_date is None:
+            as_of_date = date.today()
+
+        pool = await self._get_pool()
+        version = await pool.fetchrow(ACTIVE_CONFIG_QUERY, as_of_date)
+
+        if not version:
+            raise ValueError(f"No active trading configuration found for date {as_of_date}")
+
+        version = (version['id'], version['end_date'])
+        config = _get_config_version(version)
+        if config is None:
+            config = TradingConfig.from_db_row(await pool.fetchrow(CONFIG_BY_ID_QUERY, version[0]))
+            _set_config_version(version, config)
+        return config
+
+    async def close(self) -> None:
+        """Close the asyncpg pool"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+# Process-wide singleton, created on first use
+_config_loader: Optional[ConfigLoader] = None
+_config_loader_lock = threading.Lock()
 
 
-# Cached instance for performance
-@lru_cache()
 def get_config_loader() -> ConfigLoader:
-    """Get cached config loader instance"""
-    return ConfigLoader()
+    """Get the shared config loader instance"""
+    global _config_loader
+    if _config_loader is None:
+        with _config_loader_lock:
+            if _config_loader is None:
+                _config_loader = ConfigLoader()
+    return _config_loader
+
+
+def _get_config_version(version: tuple) -> Optional[TradingConfig]:
+    with _config_cache_lock:
+        return _config_versions.get(version)
+
+
+def _set_config_version(version: tuple, config: TradingConfig) -> None:
+    with _config_cache_lock:
+        _config_versions[version] = config
+
+
+def _get_cached_config(as_of_date: date) -> Optional[TradingConfig]:
+    with _config_cache_lock:
+        return _config_cache.get(as_of_date)
+
+
+def _set_cached_config(as_of_date: date, config: TradingConfig) -> None:
+    with _config_cache_lock:
+        _config_cache[as_of_date] = config
 
 
 def get_active_trading_config(as_of_date: Optional[date] = None) -> TradingConfig:
     """
     Convenience function to get active trading config
 
+    Results are cached per date for CONFIG_CACHE_TTL_SECONDS. A date the cache
+    hasn't seen costs one narrow version lookup; the loader reuses the parsed
+    config when the version is already known, so a backtest stepping through
+    days only parses a row when the active version changes. Treat the
+    returned config as read-only.
+
     Args:
         as_of_date: Date to get config for. Defaults to today.
 
     Returns:
         TradingConfig instance
     """
-    loader = get_config_loader()
-    return loader.get_active_config(as_of_date)
+    key = as_of_date or date.today()
+    config = _get_cached_config(key)
+    if config is not None:
+        return config
+
+    config = get_config_loader().get_active_config(as_of_date)
+    _set_cached_config(key, config)
+    return config
+
+
+# Async loader singleton (the asyncpg pool belongs to the app's event loop)
+_async_config_loader: Optional[AsyncConfigLoader] = None
+
+
+def get_async_config_loader() -> AsyncConfigLoader:
+    """Get the shared async config loader instance"""
+    global _async_config_loader
+    if _async_config_loader is None:
+        _async_config_loader = AsyncConfigLoader()
+    return _async_config_loader
+
+
+async def get_active_trading_config_async(as_of_date: Optional[date] = None) -> TradingConfig:
+    """
+    Async counterpart of get_active_trading_config (shares its cache)
+
+    Args:
+        as_of_date: Date to get config for. Defaults to today.
+
+    Returns:
+        TradingConfig instance
+    """
+    key = as_of_date or date.today()
+    config = _get_cached_config(key)
+    if config is not None:
+        return config
+
+    config = await get_async_config_loader().get_active_config(as_of_date)
+    _set_cached_config(key, config)
+    return config
+
+
+def invalidate_config_cache() -> None:
+    """Drop cached active configs (called after a new version is written)"""
+    with _config_cache_lock:
+        _config_cache.clear()
+        _config_versions.clear()
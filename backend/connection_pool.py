@@ -0,0 +1,100 @@
+"""
+Connection Pool
+Shared psycopg2 connection pools for the raw-SQL loaders
+"""
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set
+
+from psycopg2.extensions import connection as PgConnection
+from psycopg2.pool import ThreadedConnectionPool
+
+# Pool sizing
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 10
+
+# One pool per database URL, created lazily on first use
+_pools: Dict[str, ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+# Names of the statements already PREPAREd on each live connection
+_prepared: "weakref.WeakKeyDictionary[PgConnection, Set[str]]" = weakref.WeakKeyDictionary()
+
+
+def get_pool(database_url: str) -> ThreadedConnectionPool:
+    """
+    Get the shared connection pool for a database URL, creating it on first use
+
+    Args:
+        database_url: Database connection URL
+
+    Returns:
+        ThreadedConnectionPool instance
+    """
+    pool = _pools.get(database_url)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(database_url)
+            if pool is None:
+                pool = ThreadedConnectionPool(
+                    POOL_MIN_CONNECTIONS,
+                    POOL_MAX_CONNECTIONS,
+                    dsn=database_url
+                )
+                _pools[database_url] = pool
+    return pool
+
+
+@contextmanager
+def pooled_connection(database_url: str) -> Iterator[PgConnection]:
+    """
+    Borrow a connection from the shared pool and return it when done
+
+    Args:
+        database_url: Database connection URL
+
+    Yields:
+        psycopg2 connection (any open transaction is rolled back on return)
+    """
+    pool = get_pool(database_url)
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+def prepare_once(conn: PgConnection, name: str, param_types: str, query: str) -> None:
+    """
+    PREPARE a server-side statement the first time a connection needs it
+
+    Prepared statements live as long as the database session, so a pooled
+    connection only pays the parse/plan cost once. Reconnects get a new
+    connection object and are re-prepared automatically.
+
+    Args:
+        conn: psycopg2 connection
+        name: Statement name used with EXECUTE
+        param_types: Comma-separated parameter types (e.g. "date"; "" for none)
+        query: Statement body using $1, $2, ... placeholders
+    """
+    names = _prepared.setdefault(conn, set())
+    if name in names:
+        return
+
+    cursor = conn.cursor()
+    try:
+        signature = f"({param_types})" if param_types else ""
+        cursor.execute(f"PREPARE {name}{signature} AS {query}")
+    finally:
+        cursor.close()
+    names.add(name)
+
+
+def close_all_pools() -> None:
+    """Close every pooled connection and forget the pools"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
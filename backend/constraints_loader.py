@@ -3,22 +3,27 @@ Strategy Constraints Loader
 Loads non-tunable system constraints from database
 """
 import os
+import threading
 from datetime import date
-from typing import Optional, Dict
+from typing import Optional, Dict, Sequence
 from dataclasses import dataclass
-from functools import lru_cache
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from dotenv import load_dotenv
+from cachetools import TTLCache
 
-# Load environment variables
-load_dotenv()
+from config_loader import build_field_converters, build_row_to_kwargs
+from config import load_environment
+from connection_pool import pooled_connection, prepare_once
 
+# Short-lived cache of active constraints keyed by as-of date
+CONSTRAINTS_CACHE_MAX_DATES = 32
+CONSTRAINTS_CACHE_TTL_SECONDS = 60
+_constraints_cache = TTLCache(maxsize=CONSTRAINTS_CACHE_MAX_DATES, ttl=CONSTRAINTS_CACHE_TTL_SECONDS)
+_constraints_cache_lock = threading.Lock()
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class StrategyConstraints:
-    """Non-tunable system constraints"""
+    """Non-tunable system constraints (immutable)"""
 
     # Position Management
     min_holding_threshold: float = 10.0
@@ -57,23 +62,32 @@ class StrategyConstraints:
     @classmethod
     def from_db_row(cls, row: Dict) -> 'StrategyConstraints':
         """Create from database row with automatic field mapping"""
-        # Get all fields from the dataclass
-        fields = {f.name: f for f in cls.__dataclass_fields__.values()}
-
-        # Build kwargs from database row
-        kwargs = {}
-        for field_name, field_info in fields.items():
-            if field_name in row and row[field_name] is not None:
-                value = row[field_name]
-                # Convert to appropriate type
-                if field_info.type == int or field_info.type == 'int':
-                    kwargs[field_name] = int(value)
-                elif field_info.type == float or field_info.type == 'float':
-                    kwargs[field_name] = float(value)
-                else:
-                    kwargs[field_name] = value
+        # Fields missing from the row (or NULL) fall back to dataclass defaults
+        return cls(**cls._ROW_TO_KWARGS(row))
 
-        return cls(**kwargs)
+    @classmethod
+    def from_db_tuple(cls, columns: Sequence[str], row: Sequence) -> 'StrategyConstraints':
+        """Create from a positional (tuple cursor) row and its column names"""
+        converters = cls._CONVERTERS
+        return cls(**{
+            name: converters[name](value)
+            for name, value in zip(columns, row)
+            if value is not None and name in converters
+        })
+
+
+StrategyConstraints._CONVERTERS = build_field_converters(StrategyConstraints)
+StrategyConstraints._ROW_TO_KWARGS = staticmethod(build_row_to_kwargs(StrategyConstraints._CONVERTERS))
+
+# Server-side prepared statement for the active constraints read (dataclass columns only)
+ACTIVE_CONSTRAINTS_STATEMENT = "constraints_active"
+ACTIVE_CONSTRAINTS_QUERY = f"""
+    SELECT {', '.join(StrategyConstraints.__dataclass_fields__)} FROM strategy_constraints
+    WHERE start_date <= $1
+      AND (end_date IS NULL OR end_date >= $1)
+    ORDER BY start_date DESC
+    LIMIT 1
+"""
 
 
 class ConstraintsLoader:
@@ -86,6 +100,8 @@ class ConstraintsLoader:
         Args:
             database_url: Database connection URL. If not provided, reads from DATABASE_URL env var
         """
+        if database_url is None:
+            load_environment()
         self.database_url = database_url or os.getenv("DATABASE_URL")
         if not self.database_url:
             raise ValueError("DATABASE_URL not found in environment variables")
@@ -106,47 +122,81 @@ class ConstraintsLoader:
         if as_of_date is None:
             as_of_date = date.today()
 
-        conn = psycopg2.connect(self.database_url)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        with pooled_connection(self.database_url) as conn:
+            # Plain tuple cursor: one row, mapped by column position
+            cursor = conn.cursor()
+
+            try:
+                # Query for active constraints
+                prepare_once(conn, ACTIVE_CONSTRAINTS_STATEMENT, "date", ACTIVE_CONSTRAINTS_QUERY)
+                cursor.execute(f"EXECUTE {ACTIVE_CONSTRAINTS_STATEMENT}(%s)", (as_of_date,))
 
-        try:
-            # Query for active constraints
-            cursor.execute("""
-                SELECT * FROM strategy_constraints
-                WHERE start_date <= %s
-                  AND (end_date IS NULL OR end_date >= %s)
-                ORDER BY start_date DESC
-                LIMIT 1
-            """, (as_of_date, as_of_date))
+                row = cursor.fetchone()
 
-            row = cursor.fetchone()
+                if not row:
+                    raise ValueError(f"No active strategy constraints found for date {as_of_date}")
 
-            if not row:
-                raise ValueError(f"No active strategy constraints found for date {as_of_date}")
+                columns = [column[0] for column in cursor.description]
+                return StrategyConstraints.from_db_tuple(columns, row)
 
-            return StrategyConstraints.from_db_row(row)
+            finally:
+                cursor.close()
 
-        finally:
-            cursor.close()
-            conn.close()
+
+# Process-wide singleton, created on first use
+_constraints_loader: Optional[ConstraintsLoader] = None
+_constraints_loader_lock = threading.Lock()
 
 
-# Cached instance for performance
-@lru_cache()
 def get_constraints_loader() -> ConstraintsLoader:
-    """Get cached constraints loader instance"""
-    return ConstraintsLoader()
+    """Get the shared constraints loader instance"""
+    global _constraints_loader
+    if _constraints_loader is None:
+        with _constraints_loader_lock:
+            if _constraints_loader is None:
+                _constraints_loader = ConstraintsLoader()
+    return _constraints_loader
+
+
+def _get_cached_constraints(as_of_date: date) -> Optional[StrategyConstraints]:
+    with _constraints_cache_lock:
+        return _constraints_cache.get(as_of_date)
+
+
+def _set_cached_constraints(as_of_date: date, constraints: StrategyConstraints) -> None:
+    with _constraints_cache_lock:
+        _constraints_cache[as_of_date] = constraints
 
 
 def get_active_strategy_constraints(as_of_date: Optional[date] = None) -> StrategyConstraints:
     """
     Convenience function to get active strategy constraints
 
+    Results are cached per date for CONSTRAINTS_CACHE_TTL_SECONDS; treat the
+    returned constraints as read-only.
+
     Args:
         as_of_date: Date to get constraints for. Defaults to today.
 
     Returns:
         StrategyConstraints instance
     """
-    loader = get_constraints_loader()
-    return loader.get_active_constraints(as_of_date)
+    key = as_of_date or date.today()
+    constraints = _get_cached_constraints(key)
+    if constraints is not None:
+        return constraints
+
+    constraints = get_constraints_loader().get_active_constraints(as_of_date)
+    _set_cached_constraints(key, constraints)
+    return constraints
+
+
+def invalidate_constraints_cache() -> None:
+    """
+    Drop cached active constraints
+
+    Nothing in the app writes strategy_constraints (rows come from migrations),
+    so entries only go stale by TTL; tests call this to start from an empty cache.
+    """
+    with _constraints_cache_lock:
+        _constraints_cache.clear()
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import get_settings
@@ -10,22 +12,53 @@ def get_database_url() -> str:
     """Get database URL from settings"""
     return settings.database_url
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    echo=True  # Set to False in production
+
+def get_async_database_url() -> URL:
+    """
+    Get the database URL for the asyncpg driver
+
+    asyncpg takes ssl= where libpq takes sslmode=, so that option is renamed.
+    """
+    url = make_url(settings.database_url).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(query=query)
+
+
+# Pool settings shared by the sync and async engines
+POOL_OPTIONS = dict(
+    pool_pre_ping=settings.db_pool_pre_ping,
+    echo=settings.debug,  # Log every SQL statement only when debugging
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_use_lifo=True  # Reuse the most recently returned connection, letting idle ones expire
 )
 
+# Sync engine for scripts and init_db
+engine = create_engine(settings.database_url, **POOL_OPTIONS)
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the API: requests await queries instead of holding a worker thread
+async_engine = create_async_engine(get_async_database_url(), **POOL_OPTIONS)
+
+# Objects stay readable after commit, since routes serialize them afterwards
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
 
 def get_db():
-    """Dependency for FastAPI routes to get database session"""
+    """
+    Dependency for FastAPI routes to get database session
+
+    FastAPI resolves a dependency once per request, so routes should depend on
+    this (via main.DbSession) rather than calling SessionLocal() directly.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -33,6 +66,16 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency for async FastAPI routes to get an AsyncSession
+
+    Resolved once per request like get_db (routes use main.DbSession).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -13,26 +13,157 @@ import os
 import sys
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import FLOAT, new_type, register_type
+from psycopg2.extras import RealDictCursor, execute_values
 
 # Import configuration
 from config import get_settings, get_trading_config
+from connection_pool import get_pool, prepare_once
 
 settings = get_settings()
 DATABASE_URL = settings.database_url
 
+# Server-side prepared statements for the lookups a run repeats ($n placeholders, see prepare_once)
+OPENING_PRICES_STATEMENT = "trade_opening_prices"
+OPENING_PRICES_QUERY = "SELECT symbol, open_price FROM price_history WHERE symbol = ANY($1) AND date = $2"
+CASH_BALANCE_STATEMENT = "trade_cash_balance"
+CASH_BALANCE_QUERY = "SELECT quantity FROM portfolio WHERE symbol = 'CASH'"
+ADJUST_CASH_STATEMENT = "trade_adjust_cash"
+ADJUST_CASH_QUERY = """
+    UPDATE portfolio
+    SET quantity = quantity + $1, last_updated = $2
+    WHERE symbol = 'CASH'
+"""
+
+# Open positions valued at their latest close, with portfolio totals, in one round-trip.
+# The latest close is one (symbol, date) index probe per position, no full-table DISTINCT ON
+PORTFOLIO_SNAPSHOT_SQL = """
+    SELECT
+        p.symbol,
+        p.quantity,
+        p.avg_cost,
+        p.quantity * p.avg_cost AS cost,
+        p.quantity * COALESCE(latest.close_price, 0) AS value,
+        SUM(p.quantity * p.avg_cost) OVER () AS total_cost,
+        SUM(p.quantity * COALESCE(latest.close_price, 0)) OVER () AS total_value
+    FROM portfolio p
+    LEFT JOIN LATERAL (
+        SELECT close_price
+        FROM price_history
+        WHERE price_history.symbol = p.symbol
+        ORDER BY date DESC
+        LIMIT 1
+    ) AS latest ON TRUE
+    WHERE p.symbol != 'CASH' AND p.quantity > 0.0001
+"""
+
+# One multi-row INSERT per action instead of a round-trip per symbol
+TRADES_INSERT_SQL = """
+    INSERT INTO trades (signal_id, trade_date, executed_at, symbol, action, quantity, price, amount)
+    VALUES %s
+"""
+TRADES_INSERT_PAGE_SIZE = 100
+
+# Set-based portfolio updates for update_portfolio
+PORTFOLIO_BUY_UPSERT_SQL = """
+    INSERT INTO portfolio (symbol, quantity, avg_cost, last_updated)
+    VALUES %s
+    ON CONFLICT (symbol) DO UPDATE SET
+        avg_cost = (portfolio.quantity * portfolio.avg_cost + EXCLUDED.quantity * EXCLUDED.avg_cost)
+                   / (portfolio.quantity + EXCLUDED.quantity),
+        quantity = portfolio.quantity + EXCLUDED.quantity,
+        last_updated = EXCLUDED.last_updated
+"""
+PORTFOLIO_SELL_UPDATE_SQL = """
+    UPDATE portfolio
+    SET quantity = portfolio.quantity - sold.quantity, last_updated = sold.last_updated
+    FROM (VALUES %s) AS sold (symbol, quantity, last_updated)
+    WHERE portfolio.symbol = sold.symbol
+"""
+PORTFOLIO_CLOSE_POSITIONS_SQL = """
+    DELETE FROM portfolio
+    WHERE symbol = ANY(%s) AND quantity <= 0.0001
+"""
+
+# The money columns are FLOAT8. Parse them straight from the wire text into
+# Decimal (580.1 -> Decimal('580.1')) instead of float -> str -> Decimal per row
+FLOAT_AS_DECIMAL = new_type(
+    FLOAT.values, 'FLOAT_AS_DECIMAL',
+    lambda value, cursor: Decimal(value) if value is not None else None
+)
+
+# In-memory money math runs on integer millionths; Decimal is built only for DB writes and output
+MICROS = 1_000_000
+# Share quantities are kept to 4 decimal places
+QUANTITY_SCALE = 10_000
+
+
+def to_micros(value) -> int:
+    """Convert a dollar (or share) amount to integer millionths"""
+    return int(round(float(value) * MICROS))
+
+
+def from_micros(micros: int) -> Decimal:
+    """Convert integer millionths back to a Decimal amount"""
+    return Decimal(micros).scaleb(-6)
+
+
+def _div_round(numerator: int, denominator: int) -> int:
+    """Integer division rounded half up (denominator must be positive)"""
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + (2 * remainder >= denominator)
+
+
+def format_trades(trades: List[Dict]) -> str:
+    """Render executed trades as one block so the report is written in a single call"""
+    return "\n".join(
+        f"   ✅ {t['side']} {t['quantity']:.4f} {t['symbol']} @ ${t['price']:.2f} = ${t['total']:,.2f}"
+        for t in trades
+    )
+
+
+def format_positions(positions: Dict[str, Dict]) -> str:
+    """Render portfolio positions (from get_portfolio_snapshot) as one block"""
+    return "\n".join(
+        f"      {symbol}: {pos['quantity']:.4f} shares @ ${pos['avg_cost']:.2f} avg | "
+        f"Current: ${pos['value']:,.2f} | P&L: ${pos['value'] - pos['cost']:,.2f}"
+        for symbol, pos in positions.items()
+    )
+
+
+class DecimalDictCursor(RealDictCursor):
+    """RealDictCursor that returns float columns as Decimal"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        register_type(FLOAT_AS_DECIMAL, self)
+
 
 class TradeExecutor:
     def __init__(self):
-        self.conn = psycopg2.connect(DATABASE_URL)
-        self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+        # Borrow a connection from the shared pool instead of reconnecting per run
+        self.pool = get_pool(DATABASE_URL)
+        self.conn = self.pool.getconn()
+        self.cursor = self.conn.cursor(cursor_factory=DecimalDictCursor)
+        # Wall-clock timestamp shared by every row written during one run()
+        self._now: Optional[datetime] = None
+        # Set once the CASH row is known to exist in the current transaction
+        self._cash_initialized = False
 
     def close(self):
+        """Close the cursor and return the connection to the pool (uncommitted work is rolled back)"""
         self.cursor.close()
-        self.conn.close()
+        self.pool.putconn(self.conn)
+
+    def _execute_prepared(self, name: str, param_types: str, query: str, params: tuple = ()):
+        """Run a statement through its server-side prepared plan, preparing it on first use"""
+        prepare_once(self.conn, name, param_types, query)
+        if params:
+            self.cursor.execute(f"EXECUTE {name}({', '.join(['%s'] * len(params))})", params)
+        else:
+            self.cursor.execute(f"EXECUTE {name}")
 
     def get_latest_signal(self) -> Dict:
         """Fetch the most recent trading signal"""
@@ -61,66 +192,87 @@ class TradeExecutor:
 
         return dict(signal)
 
-    def get_opening_price(self, symbol: str, date: str) -> Decimal:
-        """Get opening price for a symbol on a given date"""
-        self.cursor.execute("""
-            SELECT open_price FROM price_history 
-            WHERE symbol = %s AND date = %s
-        """, (symbol, date))
-        
-        result = self.cursor.fetchone()
-        if not result:
-            raise Exception(f"No opening price found for {symbol} on {date}")
-        
-        return Decimal(str(result['open_price']))
+    def get_opening_prices(self, symbols: List[str], date: str) -> Dict[str, Decimal]:
+        """Get opening prices for several symbols on a given date in one query"""
+        symbols = list(symbols)
+        if not symbols:
+            return {}
 
-    def ensure_cash_exists(self):
-        """Ensure CASH entry exists in portfolio table"""
-        self.cursor.execute("""
-            SELECT quantity FROM portfolio WHERE symbol = 'CASH'
-        """)
-        result = self.cursor.fetchone()
+        self._execute_prepared(OPENING_PRICES_STATEMENT, "text[], date", OPENING_PRICES_QUERY, (symbols, date))
 
-        if not result:
-            # Initialize CASH with 0
-            self.cursor.execute("""
-                INSERT INTO portfolio (symbol, quantity, avg_cost, last_updated)
-                VALUES ('CASH', 0, 1.0, %s)
-            """, (datetime.now(timezone.utc),))
-            self.conn.commit()
+        prices = {row['symbol']: row['open_price'] for row in self.cursor.fetchall()}
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if missing:
+            raise Exception(f"No opening price found for {', '.join(missing)} on {date}")
+
+        return prices
+
+    def _timestamp(self, now: datetime = None) -> datetime:
+        """Resolve the timestamp to write: explicit value, then the run's cached value, then the clock"""
+        return now or self._now or datetime.now(timezone.utc)
+
+    def ensure_cash_exists(self, now: datetime = None):
+        """Ensure CASH entry exists in portfolio table (one idempotent INSERT per transaction)"""
+        if self._cash_initialized:
+            return
+
+        # Initialize CASH with 0 unless it is already there
+        self.cursor.execute("""
+            INSERT INTO portfolio (symbol, quantity, avg_cost, last_updated)
+            VALUES ('CASH', 0, 1.0, %s)
+            ON CONFLICT (symbol) DO NOTHING
+        """, (self._timestamp(now),))
+        self._cash_initialized = True
 
     def get_cash_balance(self) -> Decimal:
         """Get current CASH balance from portfolio"""
         self.ensure_cash_exists()
-        self.cursor.execute("""
-            SELECT quantity FROM portfolio WHERE symbol = 'CASH'
-        """)
+        self._execute_prepared(CASH_BALANCE_STATEMENT, "", CASH_BALANCE_QUERY)
         result = self.cursor.fetchone()
-        return Decimal(str(result['quantity'])) if result else Decimal(0)
+        return result['quantity'] if result else Decimal(0)
 
-    def add_cash(self, amount: Decimal, description: str = ""):
-        """Add cash to portfolio (from daily capital or sells)"""
-        self.ensure_cash_exists()
-        self.cursor.execute("""
-            UPDATE portfolio
-            SET quantity = quantity + %s, last_updated = %s
-            WHERE symbol = 'CASH'
-        """, (amount, datetime.now(timezone.utc)))
-        self.conn.commit()
-
-    def deduct_cash(self, amount: Decimal, description: str = ""):
-        """Deduct cash from portfolio (for buys)"""
-        self.ensure_cash_exists()
+    def _adjust_cash(self, delta: Decimal, now: datetime = None):
+        """Apply a net cash movement in one UPDATE (caller commits)"""
+        self._execute_prepared(
+            ADJUST_CASH_STATEMENT, "double precision, timestamptz", ADJUST_CASH_QUERY,
+            (delta, self._timestamp(now))
+        )
+
+    def _check_cash(self, amount: Decimal):
+        """Raise if the CASH balance can't cover amount"""
         cash_balance = self.get_cash_balance()
         if cash_balance < amount:
             raise ValueError(f"Insufficient cash: have ${cash_balance:.2f}, need ${amount:.2f}")
 
-        self.cursor.execute("""
-            UPDATE portfolio
-            SET quantity = quantity - %s, last_updated = %s
-            WHERE symbol = 'CASH'
-        """, (amount, datetime.now(timezone.utc)))
-        self.conn.commit()
+    def _insert_trades(self, signal_id: int, execution_date: str, trades: List[Dict], now: datetime = None):
+        """Record executed trades with a single multi-row INSERT (caller commits)"""
+        executed_at = self._timestamp(now)
+        rows = [
+            (
+                signal_id,
+                execution_date,
+                executed_at,
+                trade['symbol'],
+                # trades.action holds the action's one-letter code
+                trade['side'][0],
+                # Negative quantity for sells
+                -trade['quantity'] if trade['side'] == 'SELL' else trade['quantity'],
+                trade['price'],
+                trade['total']
+            )
+            for trade in trades
+        ]
+        execute_values(self.cursor, TRADES_INSERT_SQL, rows, page_size=TRADES_INSERT_PAGE_SIZE)
+
+    def add_cash(self, amount: Decimal, description: str = "", now: datetime = None):
+        """Add cash to portfolio (from daily capital or sells; caller commits)"""
+        self.ensure_cash_exists(now)
+        self._adjust_cash(amount, now)
+
+    def deduct_cash(self, amount: Decimal, description: str = "", now: datetime = None):
+        """Deduct cash from portfolio (for buys; caller commits)"""
+        self._check_cash(amount)
+        self._adjust_cash(-amount, now)
 
     def get_current_positions(self) -> Dict[str, Dict]:
         """
@@ -136,141 +288,118 @@ class TradeExecutor:
         positions = {}
         for row in self.cursor.fetchall():
             positions[row['symbol']] = {
-                'quantity': Decimal(str(row['quantity'])),
-                'avg_cost': Decimal(str(row['avg_cost']))
+                'quantity': row['quantity'],
+                'avg_cost': row['avg_cost']
             }
 
         return positions
 
-    def calculate_portfolio_pnl(self, positions: Dict, current_prices: Dict[str, Decimal]) -> Dict:
-        """Calculate P&L for current positions"""
-        total_cost = Decimal(0)
-        total_value = Decimal(0)
+    def get_portfolio_snapshot(self) -> Tuple[Dict[str, Dict], Dict]:
+        """
+        Value open positions at their latest close, with P&L totals computed in the database
 
-        for symbol, pos in positions.items():
-            cost = pos['quantity'] * pos['avg_cost']
-            value = pos['quantity'] * current_prices.get(symbol, Decimal(0))
-            total_cost += cost
-            total_value += value
+        Returns:
+            Tuple of ({symbol: {'quantity', 'avg_cost', 'cost', 'value'}},
+            {'total_cost', 'total_value', 'pnl', 'pnl_pct'})
+        """
+        self.cursor.execute(PORTFOLIO_SNAPSHOT_SQL)
+        rows = self.cursor.fetchall()
+
+        positions = {
+            row['symbol']: {
+                'quantity': row['quantity'],
+                'avg_cost': row['avg_cost'],
+                'cost': row['cost'],
+                'value': row['value']
+            }
+            for row in rows
+        }
 
+        total_cost = rows[0]['total_cost'] if rows else Decimal(0)
+        total_value = rows[0]['total_value'] if rows else Decimal(0)
         pnl = total_value - total_cost
-        pnl_pct = (pnl / total_cost * 100) if total_cost > 0 else Decimal(0)
-
-        return {
+        pnl_data = {
             'total_cost': total_cost,
             'total_value': total_value,
             'pnl': pnl,
-            'pnl_pct': pnl_pct
+            'pnl_pct': (pnl / total_cost * 100) if total_cost > 0 else Decimal(0)
         }
 
-    def execute_buy_trades(self, signal: Dict, signal_id: int, execution_date: str) -> List[Dict]:
+        return positions, pnl_data
+
+    def execute_buy_trades(self, signal: Dict, signal_id: int, execution_date: str,
+                           now: datetime = None) -> List[Dict]:
         """
         Execute buy trades based on signal allocations
         Uses opening price of execution_date
-        Deducts cash from portfolio for each purchase
+        Deducts the basket's total cost from portfolio cash in one update
         """
         trades = []
         target_allocations = signal['allocations']  # Dollar amounts
 
+        # Get opening prices for execution (one query for the whole basket)
+        opening_prices = self.get_opening_prices(
+            [symbol for symbol, dollar_amount in target_allocations.items() if dollar_amount > 0],
+            execution_date
+        )
+
+        total_cost_m = 0
         for symbol, dollar_amount in target_allocations.items():
             if dollar_amount <= 0:
                 continue
 
-            # Get opening price for execution
-            opening_price = self.get_opening_price(symbol, execution_date)
-
-            # Calculate shares to buy
-            quantity = (Decimal(str(dollar_amount)) / opening_price).quantize(Decimal('0.0001'))
-
-            if quantity > 0:
-                total_cost = quantity * opening_price
-
-                # Deduct cash from portfolio BEFORE buying
-                self.deduct_cash(total_cost, f"BUY {quantity:.4f} {symbol} @ ${opening_price:.2f}")
-
-                # Record trade
-                self.cursor.execute("""
-                    INSERT INTO trades (signal_id, trade_date, executed_at, symbol, action, quantity, price, amount)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    signal_id,
-                    execution_date,
-                    datetime.now(timezone.utc),
-                    symbol,
-                    'BUY',
-                    quantity,
-                    opening_price,
-                    total_cost
-                ))
+            opening_price = opening_prices[symbol]
+            price_m = to_micros(opening_price)
 
+            # Calculate shares to buy (in 1/QUANTITY_SCALE share units)
+            quantity_units = _div_round(to_micros(dollar_amount) * QUANTITY_SCALE, price_m)
+
+            if quantity_units > 0:
+                trade_total_m = _div_round(quantity_units * price_m, QUANTITY_SCALE)
+                total_cost_m += trade_total_m
                 trades.append({
                     'symbol': symbol,
-                    'quantity': quantity,
+                    'quantity': Decimal(quantity_units).scaleb(-4),
                     'price': opening_price,
                     'side': 'BUY',
-                    'total': total_cost
+                    'total': from_micros(trade_total_m)
                 })
 
-        self.conn.commit()
+        if not trades:
+            return trades
+
+        # Check cash for the whole basket BEFORE buying, then deduct and record (caller commits)
+        total_cost = from_micros(total_cost_m)
+        self._check_cash(total_cost)
+        self._adjust_cash(-total_cost, now)
+        self._insert_trades(signal_id, execution_date, trades, now)
+
         return trades
 
-    def update_portfolio(self, trades: List[Dict]) -> None:
+    def update_portfolio(self, trades: List[Dict], now: datetime = None) -> None:
         """
         Update portfolio table with new positions
         Calculates weighted average cost for buys
+
+        Buys are one multi-row UPSERT and sells one multi-row UPDATE, so the
+        number of statements doesn't grow with the number of symbols.
+        Each batch must hold at most one trade per symbol (true for one action).
         """
-        for trade in trades:
-            symbol = trade['symbol']
-            quantity = trade['quantity']
-            price = trade['price']
-            side = trade['side']
-            
-            # Get current position
-            self.cursor.execute("""
-                SELECT quantity, avg_cost FROM portfolio WHERE symbol = %s
-            """, (symbol,))
-            
-            result = self.cursor.fetchone()
-            
-            if side == 'BUY':
-                if result:
-                    # Update existing position with weighted average cost
-                    old_qty = Decimal(str(result['quantity']))
-                    old_avg = Decimal(str(result['avg_cost']))
-                    new_qty = old_qty + quantity
-                    new_avg = ((old_qty * old_avg) + (quantity * price)) / new_qty
-                    
-                    self.cursor.execute("""
-                        UPDATE portfolio 
-                        SET quantity = %s, avg_cost = %s, last_updated = %s
-                        WHERE symbol = %s
-                    """, (new_qty, new_avg, datetime.now(timezone.utc), symbol))
-                else:
-                    # Insert new position
-                    self.cursor.execute("""
-                        INSERT INTO portfolio (symbol, quantity, avg_cost, last_updated)
-                        VALUES (%s, %s, %s, %s)
-                    """, (symbol, quantity, price, datetime.now(timezone.utc)))
-            
-            elif side == 'SELL':
-                if result:
-                    old_qty = Decimal(str(result['quantity']))
-                    new_qty = old_qty - quantity
-                    
-                    if new_qty <= Decimal('0.0001'):
-                        # Remove position if fully closed
-                        self.cursor.execute("DELETE FROM portfolio WHERE symbol = %s", (symbol,))
-                    else:
-                        # Update quantity, keep avg_cost same
-                        self.cursor.execute("""
-                            UPDATE portfolio 
-                            SET quantity = %s, last_updated = %s
-                            WHERE symbol = %s
-                        """, (new_qty, datetime.now(timezone.utc), symbol))
-        
-        self.conn.commit()
+        now = self._timestamp(now)
+        buys = [(t['symbol'], t['quantity'], t['price'], now) for t in trades if t['side'] == 'BUY']
+        sells = [(t['symbol'], t['quantity'], now) for t in trades if t['side'] == 'SELL']
+
+        if buys:
+            # Insert new positions; blend existing ones into a weighted average cost
+            execute_values(self.cursor, PORTFOLIO_BUY_UPSERT_SQL, buys)
 
-    def execute_sell_trades(self, signal: Dict, signal_id: int, execution_date: str) -> List[Dict]:
+        if sells:
+            # Reduce quantities (avg_cost stays the same), then drop fully closed positions
+            execute_values(self.cursor, PORTFOLIO_SELL_UPDATE_SQL, sells)
+            self.cursor.execute(PORTFOLIO_CLOSE_POSITIONS_SQL, ([symbol for symbol, _, _ in sells],))
+
+    def execute_sell_trades(self, signal: Dict, signal_id: int, execution_date: str,
+                            now: datetime = None) -> List[Dict]:
         """
         Execute sell trades based on signal
         Sells specified percentage of holdings at opening price
@@ -304,70 +433,80 @@ class TradeExecutor:
         # Sort by score ascending (worst first)
         holdings_with_scores.sort(key=lambda x: x[2])
 
+        # Get opening prices for every holding in one query
+        opening_prices = self.get_opening_prices(positions.keys(), execution_date)
+
         # Sell the specified percentage of each holding (or all if weakest)
+        allocation_pct_m = to_micros(allocation_pct)
+        proceeds_m = 0
         for symbol, pos, score in holdings_with_scores:
-            # Get opening price
-            opening_price = self.get_opening_price(symbol, execution_date)
-
-            # Sell based on allocation_pct from signal
-            sell_quantity = (pos['quantity'] * Decimal(str(allocation_pct))).quantize(Decimal('0.0001'))
-
-            if sell_quantity > 0:
-                total_proceeds = sell_quantity * opening_price
-
-                # Add cash to portfolio from sale proceeds
-                self.add_cash(total_proceeds, f"SELL {sell_quantity:.4f} {symbol} @ ${opening_price:.2f}")
-
-                # Record trade (negative quantity for sell)
-                self.cursor.execute("""
-                    INSERT INTO trades (signal_id, trade_date, executed_at, symbol, action, quantity, price, amount)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    signal_id,
-                    execution_date,
-                    datetime.now(timezone.utc),
-                    symbol,
-                    'SELL',
-                    -sell_quantity,
-                    opening_price,
-                    total_proceeds
-                ))
+            opening_price = opening_prices[symbol]
 
+            # Sell based on allocation_pct from signal (in 1/QUANTITY_SCALE share units)
+            sell_units = _div_round(to_micros(pos['quantity']) * allocation_pct_m, MICROS * MICROS // QUANTITY_SCALE)
+
+            if sell_units > 0:
+                trade_total_m = _div_round(sell_units * to_micros(opening_price), QUANTITY_SCALE)
+                proceeds_m += trade_total_m
                 trades.append({
                     'symbol': symbol,
-                    'quantity': sell_quantity,
+                    'quantity': Decimal(sell_units).scaleb(-4),
                     'price': opening_price,
                     'side': 'SELL',
-                    'total': total_proceeds
+                    'total': from_micros(trade_total_m)
                 })
 
-        self.conn.commit()
+        if not trades:
+            return trades
+
+        # Add sale proceeds to cash and record the trades (caller commits)
+        self.ensure_cash_exists(now)
+        self._adjust_cash(from_micros(proceeds_m), now)
+        self._insert_trades(signal_id, execution_date, trades, now)
+
         return trades
 
     def run(self, execution_date: str = None) -> None:
         """
         Main execution flow
 
+        The whole run is one transaction: the cash injection, trades and
+        portfolio changes commit together or are rolled back together.
+
         Args:
             execution_date: Date to execute trades (YYYY-MM-DD). Uses today if not provided.
         """
+        try:
+            self._run(execution_date)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            # A rolled-back INSERT may have been the one that created CASH
+            self._cash_initialized = False
+            raise
+
+    def _run(self, execution_date: str = None) -> None:
+        """Body of run(); leaves the transaction open for run() to commit"""
+        # Read the clock once so every row written by this run shares one timestamp
+        now = datetime.now(timezone.utc)
+        self._now = now
+
         if not execution_date:
-            execution_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            execution_date = now.strftime('%Y-%m-%d')
 
         # Get trading configuration from database
-        from datetime import datetime as dt
-        exec_date_obj = dt.strptime(execution_date, '%Y-%m-%d').date()
+        exec_date_obj = datetime.strptime(execution_date, '%Y-%m-%d').date()
         trading_config = get_trading_config(exec_date_obj)
         DAILY_BUDGET = Decimal(str(trading_config.daily_capital))
 
         print(f"\n{'='*60}")
-        print(f"Trade Execution - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        print(f"Trade Execution - {now.strftime('%Y-%m-%d %H:%M:%S UTC')}")
         print(f"Execution Date: {execution_date}")
         print(f"Daily Budget: ${DAILY_BUDGET:,.2f} (from config ID: {trading_config.id})")
         print(f"{'='*60}\n")
 
         # Inject daily capital as CASH into portfolio
-        self.add_cash(DAILY_BUDGET, f"Daily capital injection for {execution_date}")
+        self.add_cash(DAILY_BUDGET, f"Daily capital injection for {execution_date}", now)
 
         # 1. Get signal for execution date
         signal = self.get_signal_for_date(execution_date)
@@ -380,31 +519,16 @@ class TradeExecutor:
         print(f"   Budget Allocation: ${DAILY_BUDGET * Decimal(str(allocation_pct)):,.2f} ({allocation_pct * 100}%)")
         print(f"   Target Allocations: {signal['allocations']}\n")
         
-        # 2. Show current portfolio state
-        positions = self.get_current_positions()
-        
-        # Get latest prices for P&L calculation
-        self.cursor.execute("""
-            SELECT DISTINCT ON (symbol) symbol, close_price 
-            FROM price_history 
-            ORDER BY symbol, date DESC
-        """)
-        current_prices = {row['symbol']: Decimal(str(row['close_price'])) for row in self.cursor.fetchall()}
-        
+        # 2. Show current portfolio state (positions, latest prices and P&L in one query)
+        positions, pnl_data = self.get_portfolio_snapshot()
+
         if positions:
-            pnl_data = self.calculate_portfolio_pnl(positions, current_prices)
-            
             print(f"💼 Current Portfolio:")
             print(f"   Total Cost: ${pnl_data['total_cost']:,.2f}")
             print(f"   Total Value: ${pnl_data['total_value']:,.2f}")
             print(f"   P&L: ${pnl_data['pnl']:,.2f} ({pnl_data['pnl_pct']:.2f}%)")
             print(f"   Positions:")
-            for symbol, pos in positions.items():
-                current_value = pos['quantity'] * current_prices.get(symbol, Decimal(0))
-                cost = pos['quantity'] * pos['avg_cost']
-                position_pnl = current_value - cost
-                print(f"      {symbol}: {pos['quantity']:.4f} shares @ ${pos['avg_cost']:.2f} avg | "
-                      f"Current: ${current_value:,.2f} | P&L: ${position_pnl:,.2f}")
+            print(format_positions(positions))
         else:
             print(f"💼 Current Portfolio: Empty (no positions)\n")
         
@@ -422,15 +546,14 @@ class TradeExecutor:
             else:
                 print()
 
-            trades = self.execute_buy_trades(signal, signal['id'], execution_date)
+            trades = self.execute_buy_trades(signal, signal['id'], execution_date, now)
 
             if trades:
                 # Update portfolio table
-                self.update_portfolio(trades)
+                self.update_portfolio(trades, now)
 
                 total_spent = sum(t['total'] for t in trades)
-                for trade in trades:
-                    print(f"   ✅ BUY {trade['quantity']:.4f} {trade['symbol']} @ ${trade['price']:.2f} = ${trade['total']:,.2f}")
+                print(format_trades(trades))
                 print(f"\n   Total Spent: ${total_spent:,.2f}")
 
                 # Show final cash balance
@@ -441,15 +564,14 @@ class TradeExecutor:
 
         elif action == 'SELL':
             print(f"🔄 Executing SELL orders:\n")
-            trades = self.execute_sell_trades(signal, signal['id'], execution_date)
+            trades = self.execute_sell_trades(signal, signal['id'], execution_date, now)
 
             if trades:
                 # Update portfolio table
-                self.update_portfolio(trades)
+                self.update_portfolio(trades, now)
 
                 total_proceeds = sum(t['total'] for t in trades)
-                for trade in trades:
-                    print(f"   ✅ SELL {trade['quantity']:.4f} {trade['symbol']} @ ${trade['price']:.2f} = ${trade['total']:,.2f}")
+                print(format_trades(trades))
                 print(f"\n   Total Proceeds: ${total_proceeds:,.2f}")
 
                 # Show final cash balance
@@ -464,9 +586,8 @@ class TradeExecutor:
             # Record HOLD action for tracking
             self.cursor.execute("""
                 INSERT INTO trades (signal_id, trade_date, executed_at, symbol, action, quantity, price, amount)
-                VALUES (%s, %s, %s, 'CASH', 'HOLD', 0, 0, 0)
-            """, (signal['id'], execution_date, datetime.now(timezone.utc)))
-            self.conn.commit()
+                VALUES (%s, %s, %s, 'CASH', 'H', 0, 0, 0)
+            """, (signal['id'], execution_date, now))
 
             # Show cash balance for HOLD days too
             final_cash = self.get_cash_balance()
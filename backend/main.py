@@ -1,19 +1,31 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime, timedelta
-from typing import List, Dict
+from typing import Annotated, List, Dict, Optional
 import logging
 import models
-from database import get_db, init_db, engine
-from config import get_settings
+import schemas
+from database import get_async_db
+from config import get_settings, load_environment
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Load .env into os.environ once, before any loader reads DATABASE_URL
+load_environment()
 settings = get_settings()
 
+# Request-scoped session: FastAPI caches get_async_db per request, so every route and
+# sub-dependency declaring DbSession shares one AsyncSession instead of opening several
+DbSession = Annotated[AsyncSession, Depends(get_async_db)]
+
+# Rows fetched per round trip when streaming history queries
+HISTORY_BATCH_SIZE = 1000
+
 # Run database migrations on startup
 logger.info("Running database migrations...")
 try:
@@ -26,9 +38,12 @@ except Exception as e:
     logger.error(f"Failed to run migrations: {e}")
     # Don't exit - let the app start anyway in case migrations were already run
 
+# orjson encodes the date/float-heavy history payloads natively, so endpoints
+# return raw date objects rather than formatting each row
 app = FastAPI(
     title=settings.api_title,
-    version=settings.api_version
+    version=settings.api_version,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend
@@ -51,79 +66,66 @@ def root():
     }
 
 
-@app.get("/api/prices/latest")
-def get_latest_prices(db: Session = Depends(get_db)):
+@app.get("/api/prices/latest", response_model=schemas.LatestPricesOut)
+async def get_latest_prices(db: DbSession):
     """Get latest prices for all assets"""
-    latest_date = db.query(models.PriceHistory.date).order_by(
-        models.PriceHistory.date.desc()
-    ).first()
-    
-    if not latest_date:
-        return {"prices": [], "date": None}
-    
-    prices = db.query(models.PriceHistory).filter(
-        models.PriceHistory.date == latest_date[0]
-    ).all()
-    
-    return {
-        "date": latest_date[0].isoformat(),
-        "prices": [
-            {
-                "symbol": p.symbol,
-                "close": p.close_price,
-                "open": p.open_price,
-                "high": p.high_price,
-                "low": p.low_price,
-                "volume": p.volume
-            }
-            for p in prices
-        ]
-    }
+    # latest_price holds one row per symbol; keep those on the most recent trading date
+    latest_date = select(func.max(models.LatestPrice.date)).scalar_subquery()
+    prices = (await db.execute(
+        select(models.LatestPrice).where(models.LatestPrice.date == latest_date)
+    )).scalars().all()
+
+    return schemas.json_response(schemas.LatestPricesOut(
+        date=prices[0].date if prices else None,
+        prices=prices
+    ))
 
 
-@app.get("/api/prices/history/{symbol}")
-def get_price_history(
+@app.get("/api/prices/history/{symbol}", response_model=schemas.PriceHistoryOut)
+async def get_price_history(
     symbol: str,
+    db: DbSession,
     days: int = 30,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = None,
+    offset: int = 0
 ):
-    """Get historical prices for a symbol"""
+    """Get historical prices for a symbol, optionally one page at a time"""
     start_date = date.today() - timedelta(days=days)
-    
-    prices = db.query(models.PriceHistory).filter(
-        models.PriceHistory.symbol == symbol.upper(),
-        models.PriceHistory.date >= start_date
-    ).order_by(models.PriceHistory.date.asc()).all()
-    
-    return {
-        "symbol": symbol,
-        "data": [
-            {
-                "date": p.date.isoformat(),
-                "close": p.close_price,
-                "open": p.open_price,
-                "high": p.high_price,
-                "low": p.low_price,
-                "volume": p.volume
-            }
-            for p in prices
-        ]
-    }
+
+    # Select only the serialized columns and stream them in batches rather
+    # than hydrating a full PriceHistory object per row; pydantic-core reads
+    # the rows by attribute and writes the JSON body directly
+    rows = await db.stream(
+        select(
+            models.PriceHistory.date,
+            models.PriceHistory.close_price,
+            models.PriceHistory.open_price,
+            models.PriceHistory.high_price,
+            models.PriceHistory.low_price,
+            models.PriceHistory.volume
+        ).where(
+            models.PriceHistory.symbol == symbol.upper(),
+            models.PriceHistory.date >= start_date
+        ).order_by(models.PriceHistory.date.asc()).offset(offset).limit(limit)
+        .execution_options(yield_per=HISTORY_BATCH_SIZE)
+    )
+
+    return schemas.json_response(schemas.PriceHistoryOut(symbol=symbol, data=[row async for row in rows]))
 
 
 @app.get("/api/signals/latest")
-def get_latest_signal(db: Session = Depends(get_db)):
+async def get_latest_signal(db: DbSession):
     """Get latest allocation signal"""
-    signal = db.query(models.DailySignal).order_by(
-        models.DailySignal.trade_date.desc()
-    ).first()
+    signal = (await db.execute(
+        select(models.DailySignal).order_by(models.DailySignal.trade_date.desc()).limit(1)
+    )).scalars().first()
     
     if not signal:
         return {"signal": None, "message": "No signals generated yet"}
     
     return {
-        "trade_date": signal.trade_date.isoformat(),
-        "generated_at": signal.generated_at.isoformat(),
+        "trade_date": signal.trade_date,
+        "generated_at": signal.generated_at,
         "allocations": signal.allocations,
         "model_type": signal.model_type,
         "confidence": signal.confidence_score
@@ -131,100 +133,101 @@ def get_latest_signal(db: Session = Depends(get_db)):
 
 
 @app.get("/api/portfolio")
-def get_portfolio(db: Session = Depends(get_db)):
+async def get_portfolio(db: DbSession):
     """Get current portfolio holdings"""
-    holdings = db.query(models.Portfolio).all()
-    
+    # Latest close per holding is a primary-key join against latest_price,
+    # so holdings and prices come back in a single round trip
+    holdings = (await db.execute(
+        select(models.Portfolio, models.LatestPrice.close_price).outerjoin(
+            models.LatestPrice, models.LatestPrice.symbol == models.Portfolio.symbol
+        ).where(
+            models.Portfolio.quantity > 0
+        )
+    )).all()
+
     total_value = 0
     positions = []
-    
-    for holding in holdings:
-        if holding.quantity > 0:
-            # Get latest price
-            latest_price = db.query(models.PriceHistory).filter(
-                models.PriceHistory.symbol == holding.symbol
-            ).order_by(models.PriceHistory.date.desc()).first()
-            
-            if latest_price:
-                current_value = holding.quantity * latest_price.close_price
-                total_value += current_value
-                
-                positions.append({
-                    "symbol": holding.symbol,
-                    "quantity": holding.quantity,
-                    "avg_cost": holding.avg_cost,
-                    "current_price": latest_price.close_price,
-                    "current_value": current_value,
-                    "unrealized_pnl": current_value - (holding.quantity * holding.avg_cost)
-                })
-    
+
+    for holding, current_price in holdings:
+        # Holdings without price history (e.g. CASH) have no market value
+        if current_price is None:
+            continue
+
+        current_value = holding.quantity * current_price
+        total_value += current_value
+
+        positions.append({
+            "symbol": holding.symbol,
+            "quantity": holding.quantity,
+            "avg_cost": holding.avg_cost,
+            "current_price": current_price,
+            "current_value": current_value,
+            "unrealized_pnl": current_value - (holding.quantity * holding.avg_cost)
+        })
+
     return {
         "positions": positions,
         "total_value": total_value
     }
 
 
-@app.get("/api/trades/history")
-def get_trade_history(
+@app.get("/api/trades/history", response_model=schemas.TradeHistoryOut)
+async def get_trade_history(
+    db: DbSession,
     days: int = 30,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = None,
+    offset: int = 0
 ):
-    """Get trade history"""
+    """Get trade history, optionally one page at a time"""
     start_date = date.today() - timedelta(days=days)
-    
-    trades = db.query(models.Trade).filter(
-        models.Trade.trade_date >= start_date
-    ).order_by(models.Trade.trade_date.desc()).all()
-    
-    return {
-        "trades": [
-            {
-                "date": t.trade_date.isoformat(),
-                "symbol": t.symbol,
-                "action": t.action.value,
-                "quantity": t.quantity,
-                "price": t.price,
-                "amount": t.amount
-            }
-            for t in trades
-        ]
-    }
-
 
-@app.get("/api/performance")
-def get_performance(
-    days: int = 90,
-    db: Session = Depends(get_db)
+    # Columnar select streamed in batches, as in get_price_history
+    rows = await db.stream(
+        select(
+            models.Trade.trade_date,
+            models.Trade.symbol,
+            models.Trade.action,
+            models.Trade.quantity,
+            models.Trade.price,
+            models.Trade.amount
+        ).where(
+            models.Trade.trade_date >= start_date
+        ).order_by(models.Trade.trade_date.desc()).offset(offset).limit(limit)
+        .execution_options(yield_per=HISTORY_BATCH_SIZE)
+    )
+
+    return schemas.json_response(schemas.TradeHistoryOut(trades=[row async for row in rows]))
+
+
+@app.get("/api/performance", response_model=schemas.PerformanceOut)
+async def get_performance(
+    db: DbSession,
+    days: int = 90
 ):
     """Get performance metrics"""
     start_date = date.today() - timedelta(days=days)
     
-    metrics = db.query(models.PerformanceMetrics).filter(
-        models.PerformanceMetrics.date >= start_date
-    ).order_by(models.PerformanceMetrics.date.asc()).all()
-    
-    if not metrics:
-        return {"performance": [], "summary": None}
-    
-    latest = metrics[-1]
-    
-    return {
-        "performance": [
-            {
-                "date": m.date.isoformat(),
-                "portfolio_value": m.portfolio_value,
-                "total_value": m.total_value,
-                "daily_return": m.daily_return,
-                "cumulative_return": m.cumulative_return
-            }
-            for m in metrics
-        ],
-        "summary": {
-            "total_return": latest.cumulative_return,
-            "sharpe_ratio": latest.sharpe_ratio,
-            "max_drawdown": latest.max_drawdown
-        }
-    }
+    # Columnar select: tuple-backed rows instead of one tracked PerformanceMetrics
+    # instance (with its __dict__ and identity-map entry) per day
+    metrics = (await db.execute(
+        select(
+            models.PerformanceMetrics.date,
+            models.PerformanceMetrics.portfolio_value,
+            models.PerformanceMetrics.total_value,
+            models.PerformanceMetrics.daily_return,
+            models.PerformanceMetrics.cumulative_return,
+            models.PerformanceMetrics.sharpe_ratio,
+            models.PerformanceMetrics.max_drawdown
+        ).where(
+            models.PerformanceMetrics.date >= start_date
+        ).order_by(models.PerformanceMetrics.date.asc())
+    )).all()
+    
+    # The latest row's cumulative statistics summarize the whole window
+    return schemas.json_response(schemas.PerformanceOut(
+        performance=metrics,
+        summary=metrics[-1] if metrics else None
+    ))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,22 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, Enum as SQLEnum
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Float, CHAR, Numeric, Date, DateTime, Index
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func, text
 from database import Base
+from datetime import datetime, timezone
+import csv
 import enum
+import io
+
+import numpy as np
+
+
+def utc_now() -> datetime:
+    """
+    Insert timestamp set client-side, so ORM inserts don't fetch it back with RETURNING.
+    Columns keep server_default=func.now() for the scripts' raw SQL inserts.
+    """
+    return datetime.now(timezone.utc)
 
 
 class ActionType(str, enum.Enum):
@@ -9,20 +24,138 @@ class ActionType(str, enum.Enum):
     SELL = "SELL"
     HOLD = "HOLD"
 
+    @property
+    def code(self) -> str:
+        """One-letter code stored in trades.action"""
+        return self.value[0]
+
+
+ACTIONS_BY_CODE = {action.code: action for action in ActionType}
+
+
+class ActionChar(TypeDecorator):
+    """ActionType stored as its one-letter code ('B', 'S', 'H') in a CHAR column"""
+    impl = CHAR
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else ActionType(value).code
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else ACTIONS_BY_CODE[value]
+
 
 class PriceHistory(Base):
-    """Daily price data for assets"""
+    """Daily price data for assets (range-partitioned by year on date)"""
     __tablename__ = "price_history"
     
-    id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, nullable=False, index=True)
-    symbol = Column(String(10), nullable=False, index=True)
+    # date is part of the primary key because a partitioned table's unique keys must include it
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    date = Column(Date, primary_key=True)
+    # Tickers are plain ASCII, so symbol columns use the "C" collation: index lookups and
+    # joins compare bytes instead of going through the locale's collation rules
+    symbol = Column(String(10, collation="C"), nullable=False)
+    open_price = Column(Float, nullable=False)
+    high_price = Column(Float, nullable=False)
+    low_price = Column(Float, nullable=False)
+    close_price = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
+
+    __table_args__ = (
+        # Per-symbol date lookups and ranges; close/volume reads are index-only scans.
+        # Also serves symbol-only lookups, so symbol has no index of its own
+        Index(
+            'ix_price_history_symbol_date_covering', 'symbol', 'date',
+            postgresql_include=['close_price', 'volume']
+        ),
+        # Cross-symbol date ranges; rows arrive in date order, so a BRIN summary is
+        # enough and costs next to nothing to maintain
+        Index(
+            'ix_price_history_date_brin', 'date',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
+        {'postgresql_partition_by': 'RANGE (date)'},
+    )
+
+    COPY_COLUMNS = ('date', 'symbol', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
+
+    @classmethod
+    def bulk_copy(cls, session, rows) -> int:
+        """
+        Load daily bars with a single COPY FROM STDIN instead of per-object INSERTs
+
+        Runs on the session's own connection, so the rows commit or roll back
+        with the session's transaction. COPY has no ON CONFLICT; callers pass
+        only bars that aren't stored yet.
+
+        Args:
+            session: SQLAlchemy session
+            rows: Iterable of (date, symbol, open, high, low, close, volume) tuples
+
+        Returns:
+            Number of rows copied
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {cls.__tablename__} ({', '.join(cls.COPY_COLUMNS)}) FROM STDIN WITH CSV", buffer
+            )
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    @classmethod
+    def load_matrix(cls, session, symbols, start, end):
+        """
+        Load closing prices for several symbols with one query, as a dates x symbols matrix
+
+        The matrix is column-major, so each symbol's series is a contiguous
+        column for the rolling-window feature math. A symbol with no bar on a
+        date that another symbol traded gets NaN there.
+
+        Args:
+            session: SQLAlchemy session
+            symbols: Symbols, in matrix column order
+            start: First date to include
+            end: Date to stop before (exclusive)
+
+        Returns:
+            Tuple of (dates as datetime64[D] array, closes as float64 array of shape (dates, symbols))
+        """
+        rows = session.query(cls.date, cls.symbol, cls.close_price).filter(
+            cls.symbol.in_(symbols),
+            cls.date >= start,
+            cls.date < end
+        ).all()
+
+        row_dates = np.fromiter((row.date for row in rows), dtype='datetime64[D]', count=len(rows))
+        dates, date_index = np.unique(row_dates, return_inverse=True)
+        column_of = {symbol: column for column, symbol in enumerate(symbols)}
+        symbol_index = np.fromiter((column_of[row.symbol] for row in rows), dtype=np.intp, count=len(rows))
+
+        closes = np.full((len(dates), len(symbols)), np.nan, order='F')
+        closes[date_index, symbol_index] = np.fromiter(
+            (row.close_price for row in rows), dtype=np.float64, count=len(rows)
+        )
+        return dates, closes
+
+
+class LatestPrice(Base):
+    """Most recent price_history row per symbol (kept current by a database trigger)"""
+    __tablename__ = "latest_price"
+
+    symbol = Column(String(10, collation="C"), primary_key=True)
+    date = Column(Date, nullable=False)
     open_price = Column(Float, nullable=False)
     high_price = Column(Float, nullable=False)
     low_price = Column(Float, nullable=False)
     close_price = Column(Float, nullable=False)
     volume = Column(Float, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
 class DailySignal(Base):
@@ -31,15 +164,28 @@ class DailySignal(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     trade_date = Column(Date, nullable=False, index=True, unique=True)
-    generated_at = Column(DateTime(timezone=True), server_default=func.now())
+    generated_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
     
     # Allocation decisions
-    allocations = Column(JSON, nullable=False)  # {"SPY": 500, "QQQ": 500, "DJI": 0}
+    allocations = Column(JSONB, nullable=False)  # {"SPY": 500, "QQQ": 500, "DJI": 0}
     
     # Model metadata
     model_type = Column(String(50), nullable=False)
     confidence_score = Column(Float)
-    features_used = Column(JSON)  # Store feature values for debugging
+    features_used = Column(JSONB)  # Store feature values for debugging
+
+    __table_args__ = (
+        # Half Kelly only aggregates BUY signals over a trade_date window
+        Index(
+            'ix_daily_signals_buy_trade_date', 'trade_date',
+            postgresql_where=text("CAST((features_used ->> 'action') AS VARCHAR) = 'BUY'")
+        ),
+        # Containment lookups (allocations @> '{"SPY": ...}') probe the GIN index
+        Index(
+            'ix_daily_signals_allocations_gin', 'allocations',
+            postgresql_using='gin', postgresql_ops={'allocations': 'jsonb_path_ops'}
+        ),
+    )
 
 
 class Trade(Base):
@@ -48,35 +194,42 @@ class Trade(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     trade_date = Column(Date, nullable=False, index=True)
-    executed_at = Column(DateTime(timezone=True), server_default=func.now())
+    executed_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
     
-    symbol = Column(String(10), nullable=False)
-    action = Column(SQLEnum(ActionType), nullable=False)
-    quantity = Column(Float, nullable=False)
-    price = Column(Float, nullable=False)
-    amount = Column(Float, nullable=False)  # quantity * price
+    symbol = Column(String(10, collation="C"), nullable=False)
+    # One-letter code rather than a native enum: no per-row label lookup, no ALTER TYPE per new action
+    action = Column(ActionChar(1), nullable=False)
+    # Exact decimals, so summed trade amounts don't drift (read back as Decimal)
+    quantity = Column(Numeric(18, 4), nullable=False)
+    price = Column(Numeric(18, 4), nullable=False)
+    amount = Column(Numeric(18, 4), nullable=False)  # quantity * price
     
     # Link to signal
     signal_id = Column(Integer)
 
+    __table_args__ = (
+        # Per-symbol trade history over a date range; also serves symbol-only lookups
+        Index('ix_trades_symbol_trade_date', 'symbol', 'trade_date'),
+    )
+
 
 class Portfolio(Base):
     """Current portfolio holdings"""
     __tablename__ = "portfolio"
     
     id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String(10), nullable=False, unique=True)
+    symbol = Column(String(10, collation="C"), nullable=False, unique=True)
     quantity = Column(Float, nullable=False, default=0)
     avg_cost = Column(Float, nullable=False, default=0)
     last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
 class PerformanceMetrics(Base):
-    """Daily P&L and performance tracking"""
+    """Daily P&L and performance tracking (range-partitioned by year on date)"""
     __tablename__ = "performance_metrics"
 
-    id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, nullable=False, index=True, unique=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    date = Column(Date, primary_key=True, index=True, unique=True)
 
     # Portfolio values
     portfolio_value = Column(Float, nullable=False)
@@ -89,7 +242,9 @@ class PerformanceMetrics(Base):
     sharpe_ratio = Column(Float)
     max_drawdown = Column(Float)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
+
+    __table_args__ = {'postgresql_partition_by': 'RANGE (date)'}
 
 
 class StrategyConstraints(Base):
@@ -128,7 +283,7 @@ class StrategyConstraints(Base):
     risk_free_rate = Column(Float, nullable=False, default=0.05)
 
     # Metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
     created_by = Column(String(100), nullable=True)
     notes = Column(String(500), nullable=True)
 
@@ -141,242 +296,22 @@ class TradingConfig(Base):
     start_date = Column(Date, nullable=False, index=True)
     end_date = Column(Date, nullable=True, index=True)  # NULL means currently active
 
-    # Basic Trading Parameters
-    daily_capital = Column(Float, nullable=False, default=1000.0)
-    assets = Column(JSON, nullable=False)  # ["SPY", "QQQ", "DIA"]
-    lookback_days = Column(Integer, nullable=False, default=252)
-
-    # Regime Detection Thresholds
-    regime_bullish_threshold = Column(Float, nullable=False, default=0.3)
-    regime_bearish_threshold = Column(Float, nullable=False, default=-0.3)
-
-    # Risk Level Thresholds
-    risk_high_threshold = Column(Float, nullable=False, default=70.0)
-    risk_medium_threshold = Column(Float, nullable=False, default=40.0)
-
-    # Allocation Percentages (Bullish Regime)
-    allocation_low_risk = Column(Float, nullable=False, default=0.8)
-    allocation_medium_risk = Column(Float, nullable=False, default=0.5)
-    allocation_high_risk = Column(Float, nullable=False, default=0.3)
-
-    # Neutral Regime Allocation
-    allocation_neutral = Column(Float, nullable=False, default=0.2)
-
-    # Sell Percentage (Bearish Regime)
-    sell_percentage = Column(Float, nullable=False, default=0.7)
-
-    # Asset Ranking Weights
-    momentum_weight = Column(Float, nullable=False, default=0.6)
-    price_momentum_weight = Column(Float, nullable=False, default=0.4)
-
-    # Risk Management Targets
-    max_drawdown_tolerance = Column(Float, nullable=False, default=15.0)
-    min_sharpe_target = Column(Float, nullable=False, default=1.0)
-
-    # Mean Reversion Parameters (NEW)
-    rsi_oversold_threshold = Column(Float, nullable=False, default=30.0)
-    rsi_overbought_threshold = Column(Float, nullable=False, default=70.0)
-    bollinger_std_multiplier = Column(Float, nullable=False, default=2.0)
-    mean_reversion_allocation = Column(Float, nullable=False, default=0.4)  # Allocation for mean reversion signals
-
-    # Adaptive Threshold Parameters (NEW)
-    volatility_adjustment_factor = Column(Float, nullable=False, default=0.4)  # How much to adjust thresholds based on vol
-    base_volatility = Column(Float, nullable=False, default=0.01)  # Historical average volatility baseline
-
-    # Confidence-Based Position Sizing (NEW)
-    min_confidence_threshold = Column(Float, nullable=False, default=0.3)  # Minimum confidence to trade
-    confidence_scaling_factor = Column(Float, nullable=False, default=0.5)  # How much confidence affects sizing
-
-    # Circuit Breaker Parameters (NEW)
-    intramonth_drawdown_limit = Column(Float, nullable=False, default=0.10)  # 10% intra-month max drawdown
-    circuit_breaker_reduction = Column(Float, nullable=False, default=0.5)  # Reduce positions by 50% when triggered
-
-    # Regime Transition Detection
-    regime_transition_threshold = Column(Float, nullable=False, default=0.1)
-    momentum_loss_threshold = Column(Float, nullable=False, default=-0.15)
-    momentum_gain_threshold = Column(Float, nullable=False, default=0.15)
-    strong_trend_threshold = Column(Float, nullable=False, default=0.4)
-
-    # Confidence Scoring
-    regime_confidence_divisor = Column(Float, nullable=False, default=0.5)
-    risk_penalty_min = Column(Float, nullable=False, default=40.0)
-    risk_penalty_max = Column(Float, nullable=False, default=60.0)
-    trend_consistency_threshold = Column(Float, nullable=False, default=1.2)
-    mean_reversion_base_confidence = Column(Float, nullable=False, default=0.6)
-    consistency_bonus = Column(Float, nullable=False, default=0.2)
-    risk_penalty_multiplier = Column(Float, nullable=False, default=0.3)
-    confidence_bucket_high_threshold = Column(Float, nullable=False, default=0.7)
-    confidence_bucket_medium_threshold = Column(Float, nullable=False, default=0.5)
-
-    # Mean Reversion Signals
-    bb_oversold_threshold = Column(Float, nullable=False, default=-0.5)
-    bb_overbought_threshold = Column(Float, nullable=False, default=0.5)
-    oversold_strong_bonus = Column(Float, nullable=False, default=0.3)
-    oversold_mild_bonus = Column(Float, nullable=False, default=0.1)
-    rsi_mild_oversold = Column(Float, nullable=False, default=40.0)
-    bb_mild_oversold = Column(Float, nullable=False, default=0.0)
-    overbought_penalty = Column(Float, nullable=False, default=-0.2)
-
-    # Downward Pressure Detection
-    price_vs_sma_threshold = Column(Float, nullable=False, default=-0.02)
-    high_volatility_threshold = Column(Float, nullable=False, default=0.015)
-    negative_return_threshold = Column(Float, nullable=False, default=-0.03)
-    severe_pressure_threshold = Column(Float, nullable=False, default=0.67)
-    moderate_pressure_threshold = Column(Float, nullable=False, default=0.50)
-    severe_pressure_risk = Column(Float, nullable=False, default=50.0)
-    moderate_pressure_risk = Column(Float, nullable=False, default=45.0)
-
-    # Dynamic Selling Behavior
-    defensive_cash_threshold = Column(Float, nullable=False, default=70.0)
-    sell_defensive_multiplier = Column(Float, nullable=False, default=0.5)
-    sell_aggressive_multiplier = Column(Float, nullable=False, default=1.2)
-    sell_moderate_pressure_multiplier = Column(Float, nullable=False, default=0.6)
-    sell_bullish_risk_multiplier = Column(Float, nullable=False, default=0.3)
-
-    # Risk-Based Thresholds
-    mean_reversion_max_risk = Column(Float, nullable=False, default=60.0)
-    neutral_deleverage_risk = Column(Float, nullable=False, default=55.0)
-    neutral_hold_risk = Column(Float, nullable=False, default=50.0)
-    bullish_excessive_risk = Column(Float, nullable=False, default=65.0)
-    extreme_risk_threshold = Column(Float, nullable=False, default=70.0)
-
-    # Asset Diversification
-    diversify_top_asset_max = Column(Float, nullable=False, default=0.50)
-    diversify_top_asset_min = Column(Float, nullable=False, default=0.40)
-    diversify_second_asset_max = Column(Float, nullable=False, default=0.35)
-    diversify_second_asset_min = Column(Float, nullable=False, default=0.30)
-    diversify_third_asset_max = Column(Float, nullable=False, default=0.25)
-    diversify_third_asset_min = Column(Float, nullable=False, default=0.15)
-    two_asset_top = Column(Float, nullable=False, default=0.65)
-    two_asset_second = Column(Float, nullable=False, default=0.35)
-
-    # Volatility & Normalization
-    volatility_normalization_factor = Column(Float, nullable=False, default=0.02)
-    stability_threshold = Column(Float, nullable=False, default=0.05)
-    stability_discount_factor = Column(Float, nullable=False, default=0.5)
-    correlation_risk_base = Column(Float, nullable=False, default=30.0)
-    correlation_risk_multiplier = Column(Float, nullable=False, default=100.0)
-
-    # Risk Score Calculation Weights
-    risk_volatility_weight = Column(Float, nullable=False, default=0.7)
-    risk_correlation_weight = Column(Float, nullable=False, default=0.3)
-
-    # Indicator Periods
-    rsi_period = Column(Integer, nullable=False, default=14)
-    bollinger_period = Column(Integer, nullable=False, default=20)
-
-    # Trend Consistency
-    trend_aligned_multiplier = Column(Float, nullable=False, default=1.5)
-    trend_mixed_multiplier = Column(Float, nullable=False, default=1.0)
-
-    # Strategy Tuning Parameters (for monthly tuning script)
-    # Market Condition Detection
-    market_condition_r_squared_threshold = Column(Float, nullable=False, default=0.6)
-    market_condition_slope_threshold = Column(Float, nullable=False, default=0.1)
-    market_condition_choppy_r_squared = Column(Float, nullable=False, default=0.3)
-    market_condition_choppy_volatility = Column(Float, nullable=False, default=0.02)
-
-    # Trade Evaluation Scoring
-    score_profitable_bonus = Column(Float, nullable=False, default=0.3)
-    score_sharpe_bonus = Column(Float, nullable=False, default=0.2)
-    score_low_dd_bonus = Column(Float, nullable=False, default=0.2)
-    score_all_horizons_bonus = Column(Float, nullable=False, default=0.2)
-    score_two_horizons_bonus = Column(Float, nullable=False, default=0.1)
-    score_unprofitable_penalty = Column(Float, nullable=False, default=-0.3)
-    score_high_dd_penalty = Column(Float, nullable=False, default=-0.4)
-    score_sharpe_penalty = Column(Float, nullable=False, default=-0.2)
-    score_momentum_bonus = Column(Float, nullable=False, default=0.3)
-    score_choppy_penalty = Column(Float, nullable=False, default=-0.3)
-    score_confidence_bonus = Column(Float, nullable=False, default=0.1)
-    score_mean_reversion_bonus = Column(Float, nullable=False, default=0.15)
-
-    # Tuning Decision Thresholds
-    tune_aggressive_win_rate = Column(Float, nullable=False, default=65.0)
-    tune_aggressive_participation = Column(Float, nullable=False, default=0.5)
-    tune_aggressive_score = Column(Float, nullable=False, default=0.2)
-    tune_conservative_win_rate = Column(Float, nullable=False, default=45.0)
-    tune_conservative_dd = Column(Float, nullable=False, default=15.0)
-    tune_conservative_score = Column(Float, nullable=False, default=-0.1)
-
-    # Parameter Adjustment Amounts
-    tune_allocation_step = Column(Float, nullable=False, default=0.1)
-    tune_neutral_step = Column(Float, nullable=False, default=0.05)
-    tune_risk_threshold_step = Column(Float, nullable=False, default=5.0)
-    tune_sharpe_aggressive_threshold = Column(Float, nullable=False, default=1.5)
-
-    # Sell Strategy Tuning
-    tune_sell_effective_threshold = Column(Float, nullable=False, default=0.7)
-    tune_sell_underperform_threshold = Column(Float, nullable=False, default=-0.2)
-    tune_bearish_sell_participation = Column(Float, nullable=False, default=0.3)
-    tune_high_dd_no_sell_threshold = Column(Float, nullable=False, default=15.0)
-    tune_sell_major_adjustment = Column(Float, nullable=False, default=0.15)
-    tune_sell_minor_adjustment = Column(Float, nullable=False, default=0.1)
-
-    # Confidence Tuning
-    tune_low_conf_poor_threshold = Column(Float, nullable=False, default=40.0)
-    tune_high_conf_strong_threshold = Column(Float, nullable=False, default=70.0)
-    tune_confidence_threshold_step = Column(Float, nullable=False, default=0.05)
-    tune_confidence_scaling_step = Column(Float, nullable=False, default=0.1)
-
-    # Mean Reversion Tuning
-    tune_mr_good_threshold = Column(Float, nullable=False, default=60.0)
-    tune_mr_poor_threshold = Column(Float, nullable=False, default=45.0)
-    tune_rsi_threshold_step = Column(Float, nullable=False, default=5.0)
-
-    # Validation Thresholds
-    validation_sharpe_tolerance = Column(Float, nullable=False, default=0.8)
-    validation_dd_tolerance = Column(Float, nullable=False, default=1.2)
-    validation_passing_score = Column(Float, nullable=False, default=0.5)
-    validation_sharpe_weight = Column(Float, nullable=False, default=0.5)
-    validation_drawdown_weight = Column(Float, nullable=False, default=0.5)
-
-    # Trade Evaluation DD Thresholds
-    score_dd_low_threshold = Column(Float, nullable=False, default=5.0)
-    score_dd_high_threshold = Column(Float, nullable=False, default=20.0)
-
-    # Parameter Tuning Boundary Limits
-    # Allocation Limits
-    tune_allocation_low_risk_max = Column(Float, nullable=False, default=1.0)
-    tune_allocation_low_risk_min = Column(Float, nullable=False, default=0.5)
-    tune_allocation_medium_risk_max = Column(Float, nullable=False, default=0.7)
-    tune_allocation_medium_risk_min = Column(Float, nullable=False, default=0.3)
-    tune_allocation_high_risk_min = Column(Float, nullable=False, default=0.2)
-    tune_allocation_high_risk_max = Column(Float, nullable=False, default=0.5)  # ADDED: Prevent unbounded growth
-    tune_allocation_neutral_min = Column(Float, nullable=False, default=0.1)
-    tune_allocation_neutral_max = Column(Float, nullable=False, default=0.4)  # ADDED: Prevent unbounded growth
-    # Risk Threshold Limits
-    tune_risk_medium_threshold_min = Column(Float, nullable=False, default=30.0)
-    tune_risk_medium_threshold_max = Column(Float, nullable=False, default=60.0)  # ADDED: Prevent unbounded growth
-    tune_risk_high_threshold_min = Column(Float, nullable=False, default=60.0)
-    tune_risk_high_threshold_max = Column(Float, nullable=False, default=80.0)  # ADDED: Prevent unbounded growth
-    # Regime Threshold Limits
-    tune_regime_bullish_threshold_max = Column(Float, nullable=False, default=0.4)
-    tune_regime_bullish_threshold_min = Column(Float, nullable=False, default=0.2)
-    # Sell Percentage Limits
-    tune_sell_percentage_min = Column(Float, nullable=False, default=0.3)
-    tune_sell_percentage_max = Column(Float, nullable=False, default=0.9)
-    # Confidence Parameter Limits
-    tune_min_confidence_threshold_max = Column(Float, nullable=False, default=0.5)
-    tune_confidence_scaling_factor_max = Column(Float, nullable=False, default=0.8)
-    # Mean Reversion Limits
-    tune_mean_reversion_allocation_max = Column(Float, nullable=False, default=0.6)
-    tune_rsi_oversold_threshold_min = Column(Float, nullable=False, default=20.0)
-    tune_rsi_oversold_threshold_max = Column(Float, nullable=False, default=40.0)  # ADDED: Prevent unbounded growth
-
-    # Regime Calculation Weights
-    regime_momentum_weight = Column(Float, nullable=False, default=0.5)
-    regime_sma20_weight = Column(Float, nullable=False, default=0.3)
-    regime_sma50_weight = Column(Float, nullable=False, default=0.2)
-
-    # Adaptive Threshold Clamps
-    adaptive_threshold_clamp_min = Column(Float, nullable=False, default=0.7)
-    adaptive_threshold_clamp_max = Column(Float, nullable=False, default=1.5)
-
-    # Risk Label Thresholds
-    risk_label_high_threshold = Column(Float, nullable=False, default=70.0)
-    risk_label_medium_threshold = Column(Float, nullable=False, default=40.0)
+    assets = Column(JSONB, nullable=False)  # ["SPY", "QQQ", "DIA"]
+
+    # Tunable parameters keyed by config_loader.TradingConfig field name
+    # ({"daily_capital": 1000.0, "lookback_days": 252, ...}). Keys missing from
+    # a row fall back to the dataclass defaults, so adding a parameter needs no DDL
+    params = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
 
     # Metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
     created_by = Column(String(100), nullable=True)  # Who created this version (user/script)
-    notes = Column(String(500), nullable=True)  # Optional notes about why parameters changed
\ No newline at end of file
+    notes = Column(String(500), nullable=True)  # Optional notes about why parameters changed
+
+    __table_args__ = (
+        # Containment lookups (assets @> '["SPY"]') probe the GIN index
+        Index(
+            'ix_trading_config_assets_gin', 'assets',
+            postgresql_using='gin', postgresql_ops={'assets': 'jsonb_path_ops'}
+        ),
+    )
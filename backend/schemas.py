@@ -0,0 +1,98 @@
+"""
+API Schemas
+Pydantic response models for the row-list endpoints in main.py
+"""
+import datetime
+from typing import List, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, Field
+
+from models import ActionType
+
+
+class RowModel(BaseModel):
+    """Base for models read straight off ORM objects or column-select rows"""
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LatestPriceOut(RowModel):
+    """One symbol's latest daily bar"""
+    symbol: str
+    close: float = Field(validation_alias='close_price')
+    open: float = Field(validation_alias='open_price')
+    high: float = Field(validation_alias='high_price')
+    low: float = Field(validation_alias='low_price')
+    volume: float
+
+
+class LatestPricesOut(BaseModel):
+    """Latest bars for every symbol on the most recent trading date"""
+    date: Optional[datetime.date]
+    prices: List[LatestPriceOut]
+
+
+class PriceBarOut(RowModel):
+    """One daily bar in a symbol's price history"""
+    date: datetime.date
+    close: float = Field(validation_alias='close_price')
+    open: float = Field(validation_alias='open_price')
+    high: float = Field(validation_alias='high_price')
+    low: float = Field(validation_alias='low_price')
+    volume: float
+
+
+class PriceHistoryOut(BaseModel):
+    """A symbol's daily bars in date order"""
+    symbol: str
+    data: List[PriceBarOut]
+
+
+class TradeOut(RowModel):
+    """One executed trade"""
+    date: datetime.date = Field(validation_alias='trade_date')
+    symbol: str
+    action: ActionType
+    quantity: float
+    price: float
+    amount: float
+
+
+class TradeHistoryOut(BaseModel):
+    """Executed trades, newest first"""
+    trades: List[TradeOut]
+
+
+class PerformancePointOut(RowModel):
+    """One day's portfolio performance"""
+    date: datetime.date
+    portfolio_value: float
+    total_value: float
+    daily_return: Optional[float]
+    cumulative_return: Optional[float]
+
+
+class PerformanceSummaryOut(RowModel):
+    """Latest cumulative performance statistics"""
+    total_return: Optional[float] = Field(validation_alias='cumulative_return')
+    sharpe_ratio: Optional[float]
+    max_drawdown: Optional[float]
+
+
+class PerformanceOut(BaseModel):
+    """Daily performance series with its latest summary"""
+    performance: List[PerformancePointOut]
+    summary: Optional[PerformanceSummaryOut]
+
+
+def json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model to JSON bytes in pydantic-core
+
+    Args:
+        model: Validated response model
+
+    Returns:
+        Response with the model's JSON body
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
@@ -14,25 +14,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from dotenv import load_dotenv
 
-# Load environment variables from .env file in repo root if DATABASE_URL not set
-if not os.getenv("DATABASE_URL"):
-    # .env is in repository root (parent of backend/)
-    env_file = Path(__file__).parent.parent.parent / '.env'
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+def _ensure_env():
+    """Load the repo-root .env if DATABASE_URL is not set (run as a script, not on import)"""
+    if not os.getenv("DATABASE_URL"):
+        # .env is in repository root (parent of backend/); a missing file is a no-op
+        load_dotenv(Path(__file__).parent.parent.parent / '.env', override=True)
 
 
 def export_price_history():
     """Export all price_history data to JSON file"""
-    conn = psycopg2.connect(DATABASE_URL)
+    conn = psycopg2.connect(os.getenv("DATABASE_URL"))
     cursor = conn.cursor(cursor_factory=RealDictCursor)
 
     try:
@@ -106,4 +100,5 @@ def export_price_history():
 
 
 if __name__ == "__main__":
+    _ensure_env()
     export_price_history()
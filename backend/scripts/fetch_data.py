@@ -200,33 +200,21 @@ def backfill_historical_data(days: int = 100):
             cutoff_date = date.today() - timedelta(days=days)
             data = data[data.index >= cutoff_date]
             
-            count = 0
-            for idx in range(len(data)):
-                trade_date = data.index[idx]
-                row = data.iloc[idx]
-                
-                # Check if exists
-                existing = db.query(PriceHistory).filter(
+            # One query for the dates already stored, then one COPY for the rest
+            existing_dates = {
+                existing_date for (existing_date,) in db.query(PriceHistory.date).filter(
                     PriceHistory.symbol == symbol,
-                    PriceHistory.date == trade_date
-                ).first()
-                
-                if existing:
-                    continue
-                
-                price_record = PriceHistory(
-                    date=trade_date,
-                    symbol=symbol,
-                    open_price=float(row['1. open']),
-                    high_price=float(row['2. high']),
-                    low_price=float(row['3. low']),
-                    close_price=float(row['4. close']),
-                    volume=float(row['5. volume'])
+                    PriceHistory.date >= cutoff_date
                 )
-                
-                db.add(price_record)
-                count += 1
-            
+            }
+            rows = [
+                (trade_date, symbol, float(row['1. open']), float(row['2. high']),
+                 float(row['3. low']), float(row['4. close']), float(row['5. volume']))
+                for trade_date, row in data.iterrows()
+                if trade_date not in existing_dates
+            ]
+            count = PriceHistory.bulk_copy(db, rows) if rows else 0
+
             db.commit()
             print(f"  ✓ Added {count} records for {symbol}")
 
@@ -57,32 +57,20 @@ def backfill_from_yahoo(symbols: list = None, days: int = 3650):
                 print(f"  WARNING: No data returned for {symbol}")
                 continue
 
-            count = 0
-            for idx in range(len(hist)):
-                trade_date = hist.index[idx].date()
-                row = hist.iloc[idx]
-
-                # Check if exists
-                existing = db.query(PriceHistory).filter(
+            # One query for the dates already stored, then one COPY for the rest
+            existing_dates = {
+                existing_date for (existing_date,) in db.query(PriceHistory.date).filter(
                     PriceHistory.symbol == symbol,
-                    PriceHistory.date == trade_date
-                ).first()
-
-                if existing:
-                    continue
-
-                price_record = PriceHistory(
-                    date=trade_date,
-                    symbol=symbol,
-                    open_price=float(row['Open']),
-                    high_price=float(row['High']),
-                    low_price=float(row['Low']),
-                    close_price=float(row['Close']),
-                    volume=float(row['Volume'])
+                    PriceHistory.date >= start_date
                 )
-
-                db.add(price_record)
-                count += 1
+            }
+            rows = [
+                (timestamp.date(), symbol, float(row['Open']), float(row['High']),
+                 float(row['Low']), float(row['Close']), float(row['Volume']))
+                for timestamp, row in hist.iterrows()
+                if timestamp.date() not in existing_dates
+            ]
+            count = PriceHistory.bulk_copy(db, rows) if rows else 0
 
             db.commit()
             print(f"  ✓ Added {count} records for {symbol}")
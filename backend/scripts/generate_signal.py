@@ -13,9 +13,12 @@ Improvements over v1:
 
 import pandas as pd
 import numpy as np
+from numpy.lib import recfunctions as rfn
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timedelta
+from typing import NamedTuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 import sys
 import os
 
@@ -56,6 +59,41 @@ DEFAULT_AVG_LOSS = 0.03
 DEFAULT_VOLATILITY_DIVISOR = 0.001
 
 
+class AssetFeatures(NamedTuple):
+    """Per-asset features for one signal cycle (missing values default to neutral)"""
+    returns_5d: float = 0.0
+    returns_20d: float = 0.0
+    returns_60d: float = 0.0
+    volatility: float = 0.0
+    price_vs_sma20: float = 0.0
+    price_vs_sma50: float = 0.0
+    current_price: float = 0.0
+    rsi: float = RSI_NEUTRAL
+    bollinger_position: float = 0.0
+    bollinger_upper: float = 0.0
+    bollinger_lower: float = 0.0
+
+
+# One float64 column per AssetFeatures field, in field order
+FEATURE_DTYPE = np.dtype([(name, np.float64) for name in AssetFeatures._fields])
+
+
+def feature_table(features_by_asset: dict) -> np.ndarray:
+    """
+    Pack per-asset features into a struct-of-arrays record array
+
+    AssetFeatures are plain tuples, so NumPy converts them in a single pass and
+    each feature is then a column (e.g. table['volatility']) across assets.
+
+    Args:
+        features_by_asset: {symbol: AssetFeatures}
+
+    Returns:
+        np.ndarray: FEATURE_DTYPE records, one per asset in dict order
+    """
+    return np.array(list(features_by_asset.values()), dtype=FEATURE_DTYPE)
+
+
 def calculate_rsi(prices: pd.Series, period: int = None) -> float:
     """
     Calculate Relative Strength Index
@@ -70,15 +108,36 @@ def calculate_rsi(prices: pd.Series, period: int = None) -> float:
     if period is None:
         period = trading_config.rsi_period
 
-    if len(prices) < period + 1:
+    # Convert only the window RSI reads, once, into a contiguous float64 array
+    closes = np.ascontiguousarray(np.asarray(prices)[-(period + 1):], dtype=np.float64)
+    return calculate_rsi_np(closes, period)
+
+
+def calculate_rsi_np(closes: np.ndarray, period: int) -> float:
+    """
+    Calculate Relative Strength Index from a float64 close array
+
+    Only the last period + 1 closes are touched, with no intermediate Series.
+
+    Args:
+        closes: Close prices, oldest first
+        period: RSI period
+
+    Returns:
+        float: RSI value between 0-100
+    """
+    if len(closes) < period + 1:
         return RSI_NEUTRAL  # Neutral if insufficient data
 
-    deltas = prices.diff()
-    gains = deltas.where(deltas > 0, 0.0)
-    losses = -deltas.where(deltas < 0, 0.0)
+    return _rsi_from_deltas(np.diff(closes[-(period + 1):]), period)
+
 
-    avg_gain = gains.tail(period).mean()
-    avg_loss = losses.tail(period).mean()
+def _rsi_from_deltas(deltas: np.ndarray, period: int) -> float:
+    """RSI from the last `period` day-over-day close changes"""
+    # One clipped pass gives the gains; losses are what the net change leaves over
+    total_gain = np.maximum(deltas, 0.0).sum()
+    avg_gain = total_gain / period
+    avg_loss = (total_gain - deltas.sum()) / period
 
     if avg_loss == 0:
         return RSI_MAX
@@ -106,15 +165,35 @@ def calculate_bollinger_bands(prices: pd.Series, period: int = None, num_std: fl
     if num_std is None:
         num_std = trading_config.bollinger_std_multiplier
 
-    if len(prices) < period:
+    # Convert only the band window, once, into a contiguous float64 array
+    closes = np.ascontiguousarray(np.asarray(prices)[-period:], dtype=np.float64)
+    return calculate_bollinger_np(closes, period, num_std)
+
+
+def calculate_bollinger_np(closes: np.ndarray, period: int, num_std: float) -> dict:
+    """
+    Calculate Bollinger Bands position from a float64 close array
+
+    Args:
+        closes: Close prices, oldest first
+        period: Bollinger period
+        num_std: Standard deviation multiplier
+
+    Returns:
+        dict with 'upper', 'lower', 'middle', 'position' (-1 to +1 scale)
+    """
+    if len(closes) < period:
         return {'upper': 0, 'lower': 0, 'middle': 0, 'position': 0}
 
-    sma = prices.tail(period).mean()
-    std = prices.tail(period).std()
+    # Both moments from the same slice: std reuses the mean instead of recomputing it
+    window = closes[-period:]
+    sma = window.mean()
+    centered = window - sma
+    std = np.sqrt(centered.dot(centered) / (period - 1))  # Sample std, as pandas
 
     upper_band = sma + (std * num_std)
     lower_band = sma - (std * num_std)
-    current_price = prices.iloc[-1]
+    current_price = closes[-1]
 
     # Position: -1 = at lower band, 0 = at middle, +1 = at upper band
     band_width = upper_band - lower_band
@@ -132,13 +211,33 @@ def calculate_bollinger_bands(prices: pd.Series, period: int = None, num_std: fl
     }
 
 
-def detect_regime_transition(current_regime_score: float, previous_regime_score: float) -> str:
+class TransitionThresholds(NamedTuple):
+    """detect_regime_transition thresholds read off a TradingConfig once per run"""
+    transition: float
+    bullish: float
+    momentum_loss: float
+    momentum_gain: float
+
+    @classmethod
+    def from_config(cls, config) -> 'TransitionThresholds':
+        """Build the thresholds for a TradingConfig"""
+        return cls(
+            transition=config.regime_transition_threshold,
+            bullish=config.regime_bullish_threshold,
+            momentum_loss=config.momentum_loss_threshold,
+            momentum_gain=config.momentum_gain_threshold,
+        )
+
+
+def detect_regime_transition(current_regime_score: float, previous_regime_score: float,
+                             thresholds: TransitionThresholds = None) -> str:
     """
     Detect regime transitions for early entry/exit signals using tunable thresholds
 
     Args:
         current_regime_score: Current regime score
         previous_regime_score: Previous regime score
+        thresholds: Precomputed thresholds (built from trading_config if not given)
 
     Returns:
         str: 'turning_bullish', 'turning_bearish', 'losing_momentum', 'gaining_momentum', 'stable'
@@ -146,19 +245,21 @@ def detect_regime_transition(current_regime_score: float, previous_regime_score:
     if previous_regime_score is None:
         return 'stable'
 
+    threshold, bullish_threshold, loss_threshold, gain_threshold = (
+        thresholds or TransitionThresholds.from_config(trading_config)
+    )
     delta = current_regime_score - previous_regime_score
 
     # Turning points using tunable threshold
-    threshold = trading_config.regime_transition_threshold
     if current_regime_score > threshold and previous_regime_score < -threshold:
         return 'turning_bullish'
     elif current_regime_score < -threshold and previous_regime_score > threshold:
         return 'turning_bearish'
 
     # Momentum changes within bullish territory using tunable thresholds
-    if current_regime_score > trading_config.regime_bullish_threshold and delta < trading_config.momentum_loss_threshold:
+    if current_regime_score > bullish_threshold and delta < loss_threshold:
         return 'losing_momentum'
-    elif current_regime_score > 0 and delta > trading_config.momentum_gain_threshold:
+    elif current_regime_score > 0 and delta > gain_threshold:
         return 'gaining_momentum'
 
     return 'stable'
@@ -247,207 +348,317 @@ def check_circuit_breaker(db: Session, trade_date: date,
     # Get start of current month
     month_start = date(trade_date.year, trade_date.month, 1)
 
-    # Get performance data for current month
-    perf_data = db.query(PerformanceMetrics).filter(
+    # Running peak of this month's performance data, computed by the database
+    month = select(
+        PerformanceMetrics.total_value.label('value'),
+        func.max(PerformanceMetrics.total_value).over(order_by=PerformanceMetrics.date).label('peak')
+    ).where(
         PerformanceMetrics.date >= month_start,
         PerformanceMetrics.date < trade_date
-    ).order_by(PerformanceMetrics.date.asc()).all()
+    ).subquery()
 
-    if len(perf_data) < 2:
-        return (False, 0.0)
-
-    # Calculate max drawdown this month
-    peak_value = 0
-    max_dd = 0
+    # Max drawdown this month in the same round-trip: one row back instead of the whole month
+    days, max_dd = db.query(
+        func.count(),
+        func.max(case((month.c.peak > 0, (month.c.peak - month.c.value) / month.c.peak)))
+    ).select_from(month).one()
 
-    for data in perf_data:
-        value = float(data.total_value)
-        if value > peak_value:
-            peak_value = value
-
-        if peak_value > 0:
-            dd = (peak_value - value) / peak_value
-            max_dd = max(max_dd, dd)
+    if days < 2:
+        return (False, 0.0)
 
+    max_dd = float(max_dd or 0.0)
     triggered = max_dd >= intramonth_drawdown_limit
     return (triggered, max_dd)
 
 
-def calculate_multi_timeframe_features(df: pd.DataFrame) -> dict:
+def calculate_multi_timeframe_features(closes: np.ndarray) -> AssetFeatures:
     """
     Calculate features with multiple timeframes including mean reversion indicators
 
+    Args:
+        closes: Daily close prices, oldest first (float64; every feature is a slice of it)
+
     Returns:
-        dict with feature values including RSI, Bollinger Bands
+        AssetFeatures with feature values including RSI, Bollinger Bands
     """
-    # Calculate returns over different periods
-    returns_5d = (df['close'].iloc[-1] / df['close'].iloc[-HORIZON_5D] - 1) if len(df) >= HORIZON_5D else 0
-    returns_20d = (df['close'].iloc[-1] / df['close'].iloc[-HORIZON_20D] - 1) if len(df) >= HORIZON_20D else 0
-    returns_60d = (df['close'].iloc[-1] / df['close'].iloc[-HORIZON_60D] - 1) if len(df) >= HORIZON_60D else 0
+    closes = np.asarray(closes, dtype=np.float64)
+    n = len(closes)
+    current_price = closes[-1]
 
-    # Volatility (20-day rolling std of daily returns)
-    daily_returns = df['close'].pct_change()
-    volatility = daily_returns.tail(HORIZON_20D).std() if len(df) >= HORIZON_20D else 0
+    # Calculate returns over different periods
+    returns_5d = (current_price / closes[-HORIZON_5D] - 1) if n >= HORIZON_5D else 0
+    returns_20d = (current_price / closes[-HORIZON_20D] - 1) if n >= HORIZON_20D else 0
+    returns_60d = (current_price / closes[-HORIZON_60D] - 1) if n >= HORIZON_60D else 0
+
+    # One diff of the recent tail feeds both volatility and RSI
+    tail = closes[-(max(HORIZON_20D, RSI_DEFAULT_PERIOD) + 1):]
+    deltas = np.diff(tail)
+
+    # Volatility (20-day std of daily returns)
+    if n >= HORIZON_20D:
+        daily_returns = deltas[-HORIZON_20D:] / tail[-(HORIZON_20D + 1):-1]
+        volatility = daily_returns.std(ddof=1)
+    else:
+        volatility = 0
 
     # Simple moving averages
-    sma_20 = df['close'].tail(HORIZON_20D).mean() if len(df) >= HORIZON_20D else df['close'].iloc[-1]
-    sma_50 = df['close'].tail(HORIZON_50D).mean() if len(df) >= HORIZON_50D else df['close'].iloc[-1]
+    sma_20 = closes[-HORIZON_20D:].mean() if n >= HORIZON_20D else current_price
+    sma_50 = closes[-HORIZON_50D:].mean() if n >= HORIZON_50D else current_price
 
     # Current price vs SMAs
-    price_vs_sma20 = (df['close'].iloc[-1] / sma_20 - 1) if sma_20 > 0 else 0
-    price_vs_sma50 = (df['close'].iloc[-1] / sma_50 - 1) if sma_50 > 0 else 0
+    price_vs_sma20 = (current_price / sma_20 - 1) if sma_20 > 0 else 0
+    price_vs_sma50 = (current_price / sma_50 - 1) if sma_50 > 0 else 0
 
     # NEW: RSI calculation
-    rsi = calculate_rsi(df['close'], period=RSI_DEFAULT_PERIOD)
+    if n >= RSI_DEFAULT_PERIOD + 1:
+        rsi = _rsi_from_deltas(deltas[-RSI_DEFAULT_PERIOD:], RSI_DEFAULT_PERIOD)
+    else:
+        rsi = RSI_NEUTRAL
 
     # NEW: Bollinger Bands
-    bb = calculate_bollinger_bands(df['close'], period=BB_DEFAULT_PERIOD,
-                                   num_std=trading_config.bollinger_std_multiplier)
+    bb = calculate_bollinger_np(closes, BB_DEFAULT_PERIOD, trading_config.bollinger_std_multiplier)
+
+    return AssetFeatures(
+        returns_5d=returns_5d,
+        returns_20d=returns_20d,
+        returns_60d=returns_60d,
+        volatility=volatility,
+        price_vs_sma20=price_vs_sma20,
+        price_vs_sma50=price_vs_sma50,
+        current_price=current_price,
+        rsi=rsi,
+        bollinger_position=bb['position'],
+        bollinger_upper=bb['upper'],
+        bollinger_lower=bb['lower']
+    )
+
+
+def calculate_features_by_asset(closes_by_asset: dict, workers: int = 1) -> dict:
+    """
+    Calculate features for every asset, optionally across worker processes
 
-    return {
-        "returns_5d": returns_5d,
-        "returns_20d": returns_20d,
-        "returns_60d": returns_60d,
-        "volatility": volatility,
-        "price_vs_sma20": price_vs_sma20,
-        "price_vs_sma50": price_vs_sma50,
-        "current_price": df['close'].iloc[-1],
-        "rsi": rsi,
-        "bollinger_position": bb['position'],
-        "bollinger_upper": bb['upper'],
-        "bollinger_lower": bb['lower']
-    }
+    Assets share no state, so each close array is an independent task. Only the
+    ndarrays are sent to the workers.
 
+    Args:
+        closes_by_asset: {symbol: close prices, oldest first}
+        workers: Worker processes to use (1 computes in-process)
 
-def calculate_regime(features_by_asset: dict) -> float:
+    Returns:
+        dict: {symbol: AssetFeatures}, in the input order
+    """
+    symbols = list(closes_by_asset)
+    if workers <= 1 or len(symbols) < 2:
+        return {symbol: calculate_multi_timeframe_features(closes) for symbol, closes in closes_by_asset.items()}
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(symbols))) as executor:
+        return dict(zip(symbols, executor.map(calculate_multi_timeframe_features, closes_by_asset.values())))
+
+
+class SignalWeights(NamedTuple):
+    """Regime and risk weights read off a TradingConfig once per signal run"""
+    regime: np.ndarray  # One weight per _REGIME_FIELDS column
+    volatility_normalization_factor: float
+    stability_threshold: float
+    stability_discount_factor: float
+    correlation_risk_base: float
+    correlation_risk_multiplier: float
+    risk_volatility_weight: float
+    risk_correlation_weight: float
+
+    @classmethod
+    def from_config(cls, config) -> 'SignalWeights':
+        """Build the weights for a TradingConfig"""
+        # Momentum is averaged across its three timeframes, so each gets a third of the weight
+        momentum_weight = config.regime_momentum_weight / 3
+        return cls(
+            regime=np.array([
+                momentum_weight,
+                momentum_weight,
+                momentum_weight,
+                config.regime_sma20_weight,
+                config.regime_sma50_weight,
+            ]),
+            volatility_normalization_factor=config.volatility_normalization_factor,
+            stability_threshold=config.stability_threshold,
+            stability_discount_factor=config.stability_discount_factor,
+            correlation_risk_base=config.correlation_risk_base,
+            correlation_risk_multiplier=config.correlation_risk_multiplier,
+            risk_volatility_weight=config.risk_volatility_weight,
+            risk_correlation_weight=config.risk_correlation_weight,
+        )
+
+
+# Feature columns read by calculate_regime, in matrix column order
+_REGIME_FIELDS = ['returns_5d', 'returns_20d', 'returns_60d', 'price_vs_sma20', 'price_vs_sma50']
+
+
+def calculate_regime(features: np.ndarray, weights: SignalWeights = None) -> float:
     """
     Detect market regime: bullish, neutral, or bearish
 
+    Each asset's regime is a weighted sum of its (n_assets, 5) feature row, so
+    every asset is scored with one matrix-vector product.
+
+    Args:
+        features: feature_table() records, one per asset
+        weights: Precomputed weights (built from trading_config if not given)
+
     Returns:
         float: Regime score (-1 to +1, positive = bullish)
     """
-    regime_scores = []
-
-    for symbol, features in features_by_asset.items():
-        # Multi-timeframe momentum
-        short_momentum = features.get('returns_5d', 0)
-        medium_momentum = features.get('returns_20d', 0)
-        long_momentum = features['returns_60d']
-
-        # Trend consistency (all pointing same direction = stronger signal)
-        momentum_avg = (short_momentum + medium_momentum + long_momentum) / 3
-
-        # Price vs moving averages
-        price_vs_sma20 = features['price_vs_sma20']
-        price_vs_sma50 = features['price_vs_sma50']
-
-        # Combine signals using tunable weights
-        asset_regime = (
-            momentum_avg * trading_config.regime_momentum_weight +
-            price_vs_sma20 * trading_config.regime_sma20_weight +
-            price_vs_sma50 * trading_config.regime_sma50_weight
-        )
-
-        regime_scores.append(asset_regime)
+    weights = weights or SignalWeights.from_config(trading_config)
 
-    # Average across all assets
-    overall_regime = sum(regime_scores) / len(regime_scores)
+    # Multi-timeframe momentum (5d, 20d, 60d) followed by price vs 20/50-day SMAs
+    regime_inputs = rfn.structured_to_unstructured(features[_REGIME_FIELDS])
 
-    return overall_regime
+    # Momentum averaged across timeframes (trend consistency), combined with
+    # the moving-average signals using tunable weights; then averaged across assets
+    return float((regime_inputs @ weights.regime).mean())
 
 
-def calculate_risk_score(features_by_asset: dict) -> float:
+def calculate_risk_score(features: np.ndarray, weights: SignalWeights = None) -> float:
     """
     Calculate overall market risk level using tunable weights
 
     This is a CRITICAL function that drives risk-based allocation decisions.
     All weights are now tunable to allow quantitative optimization.
 
+    Args:
+        features: feature_table() records, one per asset
+        weights: Precomputed weights (built from trading_config if not given)
+
     Returns:
         float: Risk score (0-100, higher = riskier)
     """
-    volatilities = [f['volatility'] for f in features_by_asset.values()]
-    avg_vol = sum(volatilities) / len(volatilities)
+    weights = weights or SignalWeights.from_config(trading_config)
+
+    avg_vol = features['volatility'].mean()
+    recent_std = features['returns_5d'].std()
+    momentum_std = features['returns_60d'].std()
 
     # Normalize volatility to 0-100 scale using tunable normalization factor
-    vol_score = min(PERCENTAGE_MULTIPLIER, (avg_vol / trading_config.volatility_normalization_factor) * PERCENTAGE_MULTIPLIER)
+    vol_score = min(PERCENTAGE_MULTIPLIER, (avg_vol / weights.volatility_normalization_factor) * PERCENTAGE_MULTIPLIER)
 
     # Check for recent stability: if last 5 days have low volatility, reduce risk score
     # This helps system recover faster after market selloffs
-    recent_returns = [f.get('returns_5d', 0) for f in features_by_asset.values()]
-    recent_stability = 1.0 - min(1.0, np.std(recent_returns) / trading_config.stability_threshold)  # 0 = volatile, 1 = stable
+    recent_stability = 1.0 - min(1.0, recent_std / weights.stability_threshold)  # 0 = volatile, 1 = stable
 
     # Apply stability discount using tunable factor
-    vol_score = vol_score * (1.0 - recent_stability * trading_config.stability_discount_factor)
+    vol_score = vol_score * (1.0 - recent_stability * weights.stability_discount_factor)
 
     # Correlation risk: When all assets move together = systemic risk
-    momentums = [f['returns_60d'] for f in features_by_asset.values()]
-    momentum_std = np.std(momentums)
-    correlation_risk = max(0, trading_config.correlation_risk_base - momentum_std * trading_config.correlation_risk_multiplier)
+    correlation_risk = max(0, weights.correlation_risk_base - momentum_std * weights.correlation_risk_multiplier)
 
     # Combined risk score using TUNABLE WEIGHTS
     # This is the critical formula that was previously hard-coded as 0.7/0.3
-    risk_score = (vol_score * trading_config.risk_volatility_weight +
-                  correlation_risk * trading_config.risk_correlation_weight)
+    risk_score = (vol_score * weights.risk_volatility_weight +
+                  correlation_risk * weights.risk_correlation_weight)
 
     return min(PERCENTAGE_MULTIPLIER, max(0, risk_score))
 
 
-def rank_assets(features_by_asset: dict) -> dict:
+def classify_mean_reversion(features: np.ndarray, symbols: list) -> dict:
+    """
+    Classify each asset's RSI / Bollinger mean reversion state using tunable thresholds
+
+    Tiers are checked in order and the first match wins: 'oversold_strong',
+    'oversold_mild', 'overbought', otherwise 'none'. Computed once per cycle
+    and shared by rank_assets and detect_mean_reversion_opportunity.
+
+    Args:
+        features: feature_table() records, one per asset
+        symbols: Asset symbols in the same order as features
+
+    Returns:
+        dict: {symbol: classification}
+    """
+    if not len(features):
+        return {}
+
+    rsi = features['rsi']
+    bb_position = features['bollinger_position']
+
+    classes = np.select(
+        [
+            (rsi < trading_config.rsi_oversold_threshold) & (bb_position < trading_config.bb_oversold_threshold),
+            (rsi < trading_config.rsi_mild_oversold) & (bb_position < trading_config.bb_mild_oversold),
+            (rsi > trading_config.rsi_overbought_threshold) & (bb_position > trading_config.bb_overbought_threshold),
+        ],
+        ['oversold_strong', 'oversold_mild', 'overbought'],
+        default='none'
+    )
+    return dict(zip(symbols, classes.tolist()))
+
+
+def rank_assets(features: np.ndarray, symbols: list, mean_reversion_classes: dict = None) -> dict:
     """
     Rank assets using multiple factors including mean reversion signals
 
+    Features are stacked into one array per factor so every asset is scored
+    with the same vectorized expression.
+
+    Args:
+        features: feature_table() records, one per asset
+        symbols: Asset symbols in the same order as features
+        mean_reversion_classes: Output of classify_mean_reversion (computed if not given)
+
     Returns:
         dict: {symbol: composite_score}
     """
-    scores = {}
-
-    for symbol, features in features_by_asset.items():
-        # Risk-adjusted momentum (primary factor)
-        momentum_score = features['returns_60d'] / max(features['volatility'], DEFAULT_VOLATILITY_DIVISOR)
-
-        # Trend consistency: Are all timeframes aligned?
-        short_momentum = features.get('returns_5d', 0)
-        medium_momentum = features.get('returns_20d', 0)
-        long_momentum = features['returns_60d']
-
-        # Check if all positive or all negative using tunable multipliers
-        all_positive = all(m > 0 for m in [short_momentum, medium_momentum, long_momentum])
-        all_negative = all(m < 0 for m in [short_momentum, medium_momentum, long_momentum])
-        trend_consistency = trading_config.trend_aligned_multiplier if (all_positive or all_negative) else trading_config.trend_mixed_multiplier
-
-        # Price momentum relative to moving averages
-        price_momentum = (features['price_vs_sma20'] + features['price_vs_sma50']) / 2
-
-        # Mean reversion bonus using tunable thresholds and bonuses
-        rsi = features.get('rsi', RSI_NEUTRAL)
-        bb_position = features.get('bollinger_position', 0)
-
-        # Oversold assets get a bonus, overbought get a penalty (all tunable)
-        mean_reversion_bonus = 0
-        if rsi < trading_config.rsi_oversold_threshold and bb_position < trading_config.bb_oversold_threshold:
-            mean_reversion_bonus = trading_config.oversold_strong_bonus  # Strong oversold signal
-        elif rsi < trading_config.rsi_mild_oversold and bb_position < trading_config.bb_mild_oversold:
-            mean_reversion_bonus = trading_config.oversold_mild_bonus  # Mild oversold
-        elif rsi > trading_config.rsi_overbought_threshold and bb_position > trading_config.bb_overbought_threshold:
-            mean_reversion_bonus = trading_config.overbought_penalty  # Overbought penalty
-
-        # Composite score
-        composite = (
-            momentum_score * trading_config.momentum_weight * trend_consistency +
-            price_momentum * trading_config.price_momentum_weight +
-            mean_reversion_bonus
-        )
+    if not len(features):
+        return {}
+    if mean_reversion_classes is None:
+        mean_reversion_classes = classify_mean_reversion(features, symbols)
+
+    returns_5d = features['returns_5d']
+    returns_20d = features['returns_20d']
+    returns_60d = features['returns_60d']
+
+    # Risk-adjusted momentum (primary factor)
+    momentum_score = returns_60d / np.maximum(features['volatility'], DEFAULT_VOLATILITY_DIVISOR)
+
+    # Trend consistency: all timeframes aligned (all positive or all negative) using tunable multipliers
+    momentum = np.stack([returns_5d, returns_20d, returns_60d])
+    aligned = (momentum > 0).all(axis=0) | (momentum < 0).all(axis=0)
+    trend_consistency = np.where(
+        aligned, trading_config.trend_aligned_multiplier, trading_config.trend_mixed_multiplier
+    )
+
+    # Price momentum relative to moving averages
+    price_momentum = (features['price_vs_sma20'] + features['price_vs_sma50']) / 2
+
+    # Oversold assets get a bonus, overbought get a penalty (all tunable)
+    bonus_by_class = {
+        'oversold_strong': trading_config.oversold_strong_bonus,
+        'oversold_mild': trading_config.oversold_mild_bonus,
+        'overbought': trading_config.overbought_penalty,
+        'none': 0.0,
+    }
+    mean_reversion_bonus = np.array(
+        [bonus_by_class[mean_reversion_classes[symbol]] for symbol in symbols], dtype=np.float64
+    )
 
-        scores[symbol] = composite
+    # Composite score
+    composite = (
+        momentum_score * trading_config.momentum_weight * trend_consistency +
+        price_momentum * trading_config.price_momentum_weight +
+        mean_reversion_bonus
+    )
 
-    return scores
+    return dict(zip(symbols, composite.tolist()))
 
 
-def detect_mean_reversion_opportunity(features_by_asset: dict, regime_score: float) -> tuple:
+def detect_mean_reversion_opportunity(features_by_asset: dict, regime_score: float,
+                                      mean_reversion_classes: dict = None) -> tuple:
     """
     Check if there's a mean reversion opportunity in neutral/mild regimes using tunable thresholds
 
+    Args:
+        features_by_asset: {symbol: features}
+        regime_score: Current regime score
+        mean_reversion_classes: Output of classify_mean_reversion (computed if not given)
+
     Returns:
         tuple: (has_opportunity: bool, opportunity_type: str, assets: list)
     """
@@ -455,19 +666,14 @@ def detect_mean_reversion_opportunity(features_by_asset: dict, regime_score: flo
     if abs(regime_score) > trading_config.strong_trend_threshold:
         return (False, None, [])
 
-    oversold_assets = []
-    overbought_assets = []
-
-    for symbol, features in features_by_asset.items():
-        rsi = features.get('rsi', RSI_NEUTRAL)
-        bb_position = features.get('bollinger_position', 0)
+    if mean_reversion_classes is None:
+        mean_reversion_classes = classify_mean_reversion(
+            feature_table(features_by_asset), list(features_by_asset)
+        )
 
-        # Check for oversold bounce opportunity using tunable thresholds
-        if rsi < trading_config.rsi_oversold_threshold and bb_position < trading_config.bb_oversold_threshold:
-            oversold_assets.append(symbol)
-        # Check for overbought reversal using tunable thresholds
-        elif rsi > trading_config.rsi_overbought_threshold and bb_position > trading_config.bb_overbought_threshold:
-            overbought_assets.append(symbol)
+    # Strongly oversold assets are bounce candidates, overbought assets reversal candidates
+    oversold_assets = [symbol for symbol, cls in mean_reversion_classes.items() if cls == 'oversold_strong']
+    overbought_assets = [symbol for symbol, cls in mean_reversion_classes.items() if cls == 'overbought']
 
     if oversold_assets:
         return (True, 'oversold_bounce', oversold_assets)
@@ -477,7 +683,7 @@ def detect_mean_reversion_opportunity(features_by_asset: dict, regime_score: flo
     return (False, None, [])
 
 
-def detect_downward_pressure(features_by_asset: dict, risk_score: float) -> tuple:
+def detect_downward_pressure(features: np.ndarray, risk_score: float) -> tuple:
     """
     Detect sustained downward pressure using tunable thresholds
 
@@ -487,32 +693,26 @@ def detect_downward_pressure(features_by_asset: dict, risk_score: float) -> tupl
     Returns:
         tuple: (has_pressure: bool, severity: str, reason: str)
     """
-    # Check multiple assets for consistent negative signals
-    negative_momentum_count = 0
-    below_sma_count = 0
-    high_vol_negative_count = 0
-    total_assets = len(features_by_asset)
+    # Check multiple assets for consistent negative signals, one array per metric
+    total_assets = len(features)
 
-    for symbol, features in features_by_asset.items():
-        # Check if all timeframes are negative (sustained downtrend)
-        returns_5d = features.get('returns_5d', 0)
-        returns_20d = features.get('returns_20d', 0)
-        returns_60d = features.get('returns_60d', 0)
+    returns_5d = features['returns_5d']
+    returns_20d = features['returns_20d']
+    returns_60d = features['returns_60d']
+    price_vs_sma20 = features['price_vs_sma20']
+    price_vs_sma50 = features['price_vs_sma50']
+    volatility = features['volatility']
 
-        if returns_5d < 0 and returns_20d < 0 and returns_60d < 0:
-            negative_momentum_count += 1
+    # All timeframes negative (sustained downtrend)
+    negative_momentum_count = int(((returns_5d < 0) & (returns_20d < 0) & (returns_60d < 0)).sum())
 
-        # Check if price is below both key moving averages (tunable threshold)
-        price_vs_sma20 = features.get('price_vs_sma20', 0)
-        price_vs_sma50 = features.get('price_vs_sma50', 0)
+    # Price below both key moving averages (tunable threshold)
+    below_sma_count = int(((price_vs_sma20 < trading_config.price_vs_sma_threshold) &
+                           (price_vs_sma50 < trading_config.price_vs_sma_threshold)).sum())
 
-        if price_vs_sma20 < trading_config.price_vs_sma_threshold and price_vs_sma50 < trading_config.price_vs_sma_threshold:
-            below_sma_count += 1
-
-        # Check for high volatility + negative short-term momentum (tunable thresholds)
-        volatility = features.get('volatility', 0)
-        if volatility > trading_config.high_volatility_threshold and returns_5d < trading_config.negative_return_threshold:
-            high_vol_negative_count += 1
+    # High volatility + negative short-term momentum (tunable thresholds)
+    high_vol_negative_count = int(((volatility > trading_config.high_volatility_threshold) &
+                                   (returns_5d < trading_config.negative_return_threshold)).sum())
 
     # Determine if there's significant downward pressure
     # Require majority of assets showing negative signals (tunable thresholds)
@@ -527,56 +727,113 @@ def detect_downward_pressure(features_by_asset: dict, risk_score: float) -> tupl
 
     # Moderate downward pressure using tunable thresholds
     elif (negative_momentum_pct >= trading_config.moderate_pressure_threshold and risk_score > trading_config.moderate_pressure_risk) or \
-         (below_sma_pct >= trading_config.severe_pressure_threshold and returns_5d < trading_config.price_vs_sma_threshold):
+         (below_sma_pct >= trading_config.severe_pressure_threshold and returns_5d[-1] < trading_config.price_vs_sma_threshold):
         return (True, "moderate", f"Emerging downward pressure in {negative_momentum_count}/{total_assets} assets")
 
     return (False, "none", "")
 
 
+class DecisionThresholds(NamedTuple):
+    """
+    decide_action thresholds, allocations and sell sizes read off a TradingConfig once per run
+
+    sell_percentage_max and the bearish_sell_* parameters are not TradingConfig
+    columns, so the branches that use them still read trading_config directly.
+    """
+    defensive_cash_threshold: float
+    severe_defensive_sell_pct: float
+    moderate_pressure_sell_pct: float
+    regime_transition_threshold: float
+    extreme_risk_threshold: float
+    sell_percentage: float
+    mean_reversion_max_risk: float
+    mean_reversion_allocation: float
+    neutral_deleverage_risk: float
+    neutral_hold_risk: float
+    allocation_neutral: float
+    bullish_excessive_risk: float
+    bullish_risk_sell_pct: float
+    risk_high_threshold: float
+    allocation_high_risk: float
+    risk_medium_threshold: float
+    allocation_medium_risk: float
+    allocation_low_risk: float
+
+    @classmethod
+    def from_config(cls, config) -> 'DecisionThresholds':
+        """Build the thresholds for a TradingConfig, pre-multiplying the sell sizes"""
+        sell_pct = config.sell_percentage
+        return cls(
+            defensive_cash_threshold=config.defensive_cash_threshold,
+            # Scale down if already heavily defensive to avoid over-selling
+            severe_defensive_sell_pct=min(sell_pct * config.sell_defensive_multiplier, sell_pct),
+            moderate_pressure_sell_pct=sell_pct * config.sell_moderate_pressure_multiplier,
+            regime_transition_threshold=config.regime_transition_threshold,
+            extreme_risk_threshold=config.extreme_risk_threshold,
+            sell_percentage=sell_pct,
+            mean_reversion_max_risk=config.mean_reversion_max_risk,
+            mean_reversion_allocation=config.mean_reversion_allocation,
+            neutral_deleverage_risk=config.neutral_deleverage_risk,
+            neutral_hold_risk=config.neutral_hold_risk,
+            allocation_neutral=config.allocation_neutral,
+            bullish_excessive_risk=config.bullish_excessive_risk,
+            bullish_risk_sell_pct=sell_pct * config.sell_bullish_risk_multiplier,
+            risk_high_threshold=config.risk_high_threshold,
+            allocation_high_risk=config.allocation_high_risk,
+            risk_medium_threshold=config.risk_medium_threshold,
+            allocation_medium_risk=config.allocation_medium_risk,
+            allocation_low_risk=config.allocation_low_risk,
+        )
+
+
 def decide_action(regime_score: float, risk_score: float, has_holdings: bool,
                   mean_reversion_opportunity: tuple, adaptive_bullish_threshold: float,
                   adaptive_bearish_threshold: float, current_drawdown: float,
-                  features_by_asset: dict, cash_pct: float = 0.0) -> tuple:
+                  features: np.ndarray, cash_pct: float = 0.0,
+                  thresholds: DecisionThresholds = None) -> tuple:
     """
     Decide whether to BUY, SELL, or HOLD with enhanced logic
 
     Note: Removed circuit breaker - strategy should learn from mistakes, not cease operations
 
     Args:
+        features: feature_table() records, one per asset
         cash_pct: Current percentage of portfolio in cash (0-100)
+        thresholds: Precomputed thresholds (built from trading_config if not given)
 
     Returns:
         tuple: (action: str, allocation_pct: float, signal_type: str)
     """
+    thresholds = thresholds or DecisionThresholds.from_config(trading_config)
     has_mr_opportunity, mr_type, mr_assets = mean_reversion_opportunity
 
     # REMOVED: Circuit breaker logic - strategy must continue operating to learn
 
     # NEW: Detect downward pressure early to avoid being caught in market crashes
-    has_pressure, pressure_severity, pressure_reason = detect_downward_pressure(features_by_asset, risk_score)
+    has_pressure, pressure_severity, pressure_reason = detect_downward_pressure(features, risk_score)
 
     if has_pressure and has_holdings:
         if pressure_severity == "severe":
             # Severe downward pressure - sell aggressively using tunable thresholds
             # Scale down if already heavily defensive to avoid over-selling
-            if cash_pct > trading_config.defensive_cash_threshold:
-                sell_pct = min(trading_config.sell_percentage * trading_config.sell_defensive_multiplier, trading_config.sell_percentage)
+            if cash_pct > thresholds.defensive_cash_threshold:
+                sell_pct = thresholds.severe_defensive_sell_pct
             else:
                 sell_pct = min(trading_config.sell_percentage_max, trading_config.sell_percentage * trading_config.sell_aggressive_multiplier)
             return ("SELL", sell_pct, f"downward_pressure_severe")
-        elif pressure_severity == "moderate" and regime_score < trading_config.regime_transition_threshold:
+        elif pressure_severity == "moderate" and regime_score < thresholds.regime_transition_threshold:
             # Moderate pressure in non-bullish regime - reduce exposure unless already very defensive
-            if cash_pct > trading_config.defensive_cash_threshold:
+            if cash_pct > thresholds.defensive_cash_threshold:
                 # Already defensive, let normal logic handle it
                 pass
             else:
-                sell_pct = trading_config.sell_percentage * trading_config.sell_moderate_pressure_multiplier
+                sell_pct = thresholds.moderate_pressure_sell_pct
                 return ("SELL", sell_pct, "downward_pressure_moderate")
 
     # Sell aggressively when risk is VERY HIGH, regardless of regime (tunable threshold)
-    if risk_score > trading_config.extreme_risk_threshold and has_holdings:
+    if risk_score > thresholds.extreme_risk_threshold and has_holdings:
         # Risk is very high - sell most holdings
-        sell_pct = trading_config.sell_percentage
+        sell_pct = thresholds.sell_percentage
         return ("SELL", sell_pct, "extreme_risk_protection")
 
     # Bearish regime
@@ -591,40 +848,40 @@ def decide_action(regime_score: float, risk_score: float, has_holdings: bool,
 
     # Neutral regime with mean reversion opportunity
     elif adaptive_bearish_threshold <= regime_score <= adaptive_bullish_threshold:
-        if has_mr_opportunity and mr_type == 'oversold_bounce' and risk_score < trading_config.mean_reversion_max_risk:
+        if has_mr_opportunity and mr_type == 'oversold_bounce' and risk_score < thresholds.mean_reversion_max_risk:
             # Mean reversion buy opportunity (tunable risk threshold)
-            allocation_pct = trading_config.mean_reversion_allocation
+            allocation_pct = thresholds.mean_reversion_allocation
             return ("BUY", allocation_pct, "mean_reversion_oversold")
-        elif risk_score > trading_config.neutral_deleverage_risk and has_holdings:
+        elif risk_score > thresholds.neutral_deleverage_risk and has_holdings:
             # High risk in neutral = SELL some holdings (tunable threshold)
-            sell_pct = trading_config.sell_percentage * trading_config.sell_moderate_pressure_multiplier
+            sell_pct = thresholds.moderate_pressure_sell_pct
             return ("SELL", sell_pct, "neutral_high_risk_deleverage")
-        elif risk_score > trading_config.neutral_hold_risk:
+        elif risk_score > thresholds.neutral_hold_risk:
             # Sit out risky neutral periods (tunable threshold)
             return ("HOLD", 0.0, "neutral_high_risk")
         else:
             # Small cautious buy
-            return ("BUY", trading_config.allocation_neutral, "neutral_cautious")
+            return ("BUY", thresholds.allocation_neutral, "neutral_cautious")
 
     # Bullish regime
     else:
         # Even in bullish, if risk is very high, SELL instead of buying (tunable threshold)
-        if risk_score > trading_config.bullish_excessive_risk and has_holdings:
+        if risk_score > thresholds.bullish_excessive_risk and has_holdings:
             # Risk too high even though bullish - reduce exposure
-            sell_pct = trading_config.sell_percentage * trading_config.sell_bullish_risk_multiplier
+            sell_pct = thresholds.bullish_risk_sell_pct
             return ("SELL", sell_pct, "bullish_excessive_risk")
-        elif risk_score > trading_config.risk_high_threshold:
+        elif risk_score > thresholds.risk_high_threshold:
             # High risk in bullish - buy less or hold (tunable threshold)
-            if has_holdings and risk_score > trading_config.bullish_excessive_risk:
+            if has_holdings and risk_score > thresholds.bullish_excessive_risk:
                 return ("HOLD", 0.0, "bullish_high_risk_hold")
             else:
-                allocation_pct = trading_config.allocation_high_risk
+                allocation_pct = thresholds.allocation_high_risk
                 return ("BUY", allocation_pct, "bullish_high_risk")
-        elif risk_score > trading_config.risk_medium_threshold:
-            allocation_pct = trading_config.allocation_medium_risk
+        elif risk_score > thresholds.risk_medium_threshold:
+            allocation_pct = thresholds.allocation_medium_risk
             return ("BUY", allocation_pct, "bullish_medium_risk")
         else:
-            allocation_pct = trading_config.allocation_low_risk
+            allocation_pct = thresholds.allocation_low_risk
             return ("BUY", allocation_pct, "bullish_momentum")
 
 
@@ -653,20 +910,28 @@ def allocate_diversified(asset_scores: dict, total_amount: float) -> dict:
 
     if len(sorted_assets) >= 3 and all(score > 0 for _, score in sorted_assets[:3]):
         # All three are positive - diversify using tunable limits
+        top_assets = sorted_assets[:3]
         total_score = sum(score for _, score in sorted_assets)
 
         # Normalize scores
-        weights = [score / total_score for _, score in sorted_assets]
-
-        # Apply concentration limits using tunable parameters
-        allocations[sorted_assets[0][0]] = total_amount * min(trading_config.diversify_top_asset_max, max(trading_config.diversify_top_asset_min, weights[0]))
-        allocations[sorted_assets[1][0]] = total_amount * min(trading_config.diversify_second_asset_max, max(trading_config.diversify_second_asset_min, weights[1]))
-        allocations[sorted_assets[2][0]] = total_amount * min(trading_config.diversify_third_asset_max, max(trading_config.diversify_third_asset_min, weights[2]))
+        weights = np.array([score for _, score in top_assets]) / total_score
+
+        # Apply concentration limits using tunable parameters (per rank)
+        min_weights = np.array([
+            trading_config.diversify_top_asset_min,
+            trading_config.diversify_second_asset_min,
+            trading_config.diversify_third_asset_min,
+        ])
+        max_weights = np.array([
+            trading_config.diversify_top_asset_max,
+            trading_config.diversify_second_asset_max,
+            trading_config.diversify_third_asset_max,
+        ])
+        weights = np.clip(weights, min_weights, max_weights)
 
         # Normalize to exactly total_amount
-        total_allocated = sum(allocations.values())
-        for symbol in allocations:
-            allocations[symbol] = allocations[symbol] * (total_amount / total_allocated)
+        amounts = total_amount * weights / weights.sum()
+        allocations.update(zip((symbol for symbol, _ in top_assets), amounts.tolist()))
 
     elif len(sorted_assets) >= 2 and sorted_assets[1][1] > 0:
         # Only top 2 are positive - use tunable split
@@ -695,7 +960,38 @@ def get_previous_regime_score(db: Session, trade_date: date) -> float:
     return None
 
 
-def capital_scaling_adjustment(capital: float) -> float:
+class CapitalScaleTiers(NamedTuple):
+    """Capital scaling breakpoints and factors, read off the strategy constraints once"""
+    tier1_threshold: float
+    tier1_factor: float
+    tier2_threshold: float
+    tier2_factor: float
+    tier3_threshold: float
+    tier3_factor: float
+    max_reduction: float
+
+    @classmethod
+    def from_constraints(cls, strategy_constraints) -> 'CapitalScaleTiers':
+        """Snapshot the capital_scale_* fields of a StrategyConstraints"""
+        return cls(
+            strategy_constraints.capital_scale_tier1_threshold,
+            strategy_constraints.capital_scale_tier1_factor,
+            strategy_constraints.capital_scale_tier2_threshold,
+            strategy_constraints.capital_scale_tier2_factor,
+            strategy_constraints.capital_scale_tier3_threshold,
+            strategy_constraints.capital_scale_tier3_factor,
+            strategy_constraints.capital_scale_max_reduction,
+        )
+
+
+# Capital beyond tier 3 over which the factor decays toward max_reduction
+CAPITAL_SCALE_EXCESS_SPAN = 2_000_000
+
+# Constraints are loaded once per process, so their tiers are too
+CAPITAL_SCALE_TIERS = CapitalScaleTiers.from_constraints(constraints)
+
+
+def capital_scaling_adjustment(capital: float, tiers: CapitalScaleTiers = None) -> float:
     """
     Calculate capital scaling factor using tunable constraints
 
@@ -704,17 +1000,13 @@ def capital_scaling_adjustment(capital: float) -> float:
 
     Args:
         capital: Current available capital
+        tiers: Scaling tiers to apply (defaults to the active constraints' tiers)
 
     Returns:
         Scaling factor between constraints.capital_scale_max_reduction and 1.0
     """
-    tier1_threshold = constraints.capital_scale_tier1_threshold
-    tier1_factor = constraints.capital_scale_tier1_factor
-    tier2_threshold = constraints.capital_scale_tier2_threshold
-    tier2_factor = constraints.capital_scale_tier2_factor
-    tier3_threshold = constraints.capital_scale_tier3_threshold
-    tier3_factor = constraints.capital_scale_tier3_factor
-    max_reduction = constraints.capital_scale_max_reduction
+    (tier1_threshold, tier1_factor, tier2_threshold, tier2_factor,
+     tier3_threshold, tier3_factor, max_reduction) = tiers or CAPITAL_SCALE_TIERS
 
     if capital < tier1_threshold:
         # Small capital: No scaling needed
@@ -732,10 +1024,50 @@ def capital_scaling_adjustment(capital: float) -> float:
     else:
         # Beyond Tier 3: Conservative asymptotic minimum
         excess_capital = capital - tier3_threshold
-        additional_reduction = min(tier3_factor - max_reduction, excess_capital / 2_000_000)
+        additional_reduction = min(tier3_factor - max_reduction, excess_capital / CAPITAL_SCALE_EXCESS_SPAN)
         return max(max_reduction, tier3_factor - additional_reduction)
 
 
+def capital_scaling_adjustment_batch(capitals: np.ndarray, tiers: CapitalScaleTiers = None) -> np.ndarray:
+    """
+    Vectorized capital_scaling_adjustment over many capital values
+
+    np.searchsorted maps each capital to its tier, and the interpolation is
+    table driven, so the whole array is scaled without per-value branching.
+
+    Args:
+        capitals: Available capital values
+        tiers: Scaling tiers to apply (defaults to the active constraints' tiers)
+
+    Returns:
+        np.ndarray: Scaling factor for each capital value
+    """
+    tiers = tiers or CAPITAL_SCALE_TIERS
+    capitals = np.asarray(capitals, dtype=np.float64)
+    thresholds = np.array([tiers.tier1_threshold, tiers.tier2_threshold, tiers.tier3_threshold])
+    factors = np.array([tiers.tier1_factor, tiers.tier2_factor, tiers.tier3_factor])
+
+    # 0 = below tier 1, 1 = tier 1 to 2, 2 = tier 2 to 3, 3 = beyond tier 3 (strict < as the scalar version)
+    tier = np.searchsorted(thresholds, capitals, side='right')
+
+    # Linear reduction from the tier's lower breakpoint toward the next one
+    lower = np.clip(tier - 1, 0, 1)
+    start_threshold = thresholds[lower]
+    start_factor = factors[lower]
+    range_size = thresholds[lower + 1] - start_threshold
+    reduction = start_factor - factors[lower + 1]
+    interpolated = start_factor - ((capitals - start_threshold) / range_size) * reduction
+
+    # Beyond tier 3: conservative asymptotic minimum
+    additional_reduction = np.minimum(
+        tiers.tier3_factor - tiers.max_reduction,
+        (capitals - tiers.tier3_threshold) / CAPITAL_SCALE_EXCESS_SPAN
+    )
+    asymptotic = np.maximum(tiers.max_reduction, tiers.tier3_factor - additional_reduction)
+
+    return np.select([tier == 0, tier == 3], [tiers.tier1_factor, asymptotic], default=interpolated)
+
+
 def calculate_half_kelly(db: Session, trade_date: date, lookback_days: int = HORIZON_60D) -> float:
     """
     Calculate half Kelly allocation based on recent trade performance
@@ -758,42 +1090,30 @@ def calculate_half_kelly(db: Session, trade_date: date, lookback_days: int = HOR
     """
     lookback_start = trade_date - timedelta(days=lookback_days)
 
-    # Get recent BUY trades with their outcomes
-    trades = db.query(DailySignal).filter(
+    # Use signal confidence of each BUY as a proxy for trade quality
+    # In a full implementation, we'd track actual P&L
+    confidence = func.coalesce(DailySignal.features_used['confidence_score'].as_float(), HALF_KELLY_DEFAULT)
+    # Use tunable kelly_confidence_threshold to determine wins
+    is_win = confidence > constraints.kelly_confidence_threshold
+
+    # Count and sum wins/losses over recent BUY signals in one aggregate query
+    total_trades, wins, total_win_return, total_loss_return = db.query(
+        func.count(),
+        func.count(case((is_win, 1))),
+        func.sum(case((is_win, confidence), else_=0.0)),
+        func.sum(case((is_win, 0.0), else_=1.0 - confidence))
+    ).filter(
         DailySignal.trade_date >= lookback_start,
-        DailySignal.trade_date < trade_date
-    ).all()
+        DailySignal.trade_date < trade_date,
+        DailySignal.features_used['action'].as_string() == 'BUY'
+    ).one()
 
-    if not trades or len(trades) < constraints.min_trades_for_kelly:
+    if not total_trades or total_trades < constraints.min_trades_for_kelly:
         # Insufficient data - use conservative default
         return HALF_KELLY_DEFAULT
 
-    # Calculate win rate and payoff ratio from signals
-    wins = 0
-    total_trades = 0
-    total_win_return = 0.0
-    total_loss_return = 0.0
-
-    for signal in trades:
-        features = signal.features_used
-        if not features or features.get('action') != 'BUY':
-            continue
-
-        total_trades += 1
-
-        # Use signal confidence as a proxy for trade quality
-        # In a full implementation, we'd track actual P&L
-        confidence = features.get('confidence_score', HALF_KELLY_DEFAULT)
-
-        # Use tunable kelly_confidence_threshold to determine wins
-        if confidence > constraints.kelly_confidence_threshold:
-            wins += 1
-            total_win_return += confidence
-        else:
-            total_loss_return += (1.0 - confidence)
-
-    if total_trades < constraints.min_trades_for_kelly:
-        return HALF_KELLY_DEFAULT
+    total_win_return = float(total_win_return)
+    total_loss_return = float(total_loss_return)
 
     # Calculate statistics using default constants
     win_rate = wins / total_trades
@@ -843,53 +1163,51 @@ def generate_signal(trade_date: date = None):
         # Fetch historical data for each asset
         lookback_start = trade_date - timedelta(days=trading_config.lookback_days + 30)
 
-        features_by_asset = {}
+        closes_by_asset = {}
 
-        for symbol in trading_config.assets:
-            prices = db.query(PriceHistory).filter(
-                PriceHistory.symbol == symbol,
-                PriceHistory.date < trade_date,
-                PriceHistory.date >= lookback_start
-            ).order_by(PriceHistory.date.asc()).all()
+        # Only closes feed the features; one query loads every asset's series as a matrix column
+        _, closes = PriceHistory.load_matrix(db, trading_config.assets, lookback_start, trade_date)
+
+        for symbol, column in zip(trading_config.assets, closes.T):
+            prices = column[~np.isnan(column)]
 
             # Use tunable min_data_days constraint
             if len(prices) < constraints.min_data_days:
                 print(f"WARNING: Insufficient data for {symbol} ({len(prices)} days, need {constraints.min_data_days})")
                 continue
 
-            # Convert to DataFrame
-            df = pd.DataFrame([
-                {
-                    'date': p.date,
-                    'close': p.close_price,
-                    'open': p.open_price,
-                    'high': p.high_price,
-                    'low': p.low_price,
-                    'volume': p.volume
-                }
-                for p in prices
-            ])
+            closes_by_asset[symbol] = prices
 
-            # Calculate features with multiple timeframes
-            features = calculate_multi_timeframe_features(df)
-            features_by_asset[symbol] = features
+        # Calculate features with multiple timeframes
+        features_by_asset = calculate_features_by_asset(closes_by_asset, settings.feature_workers)
 
+        for symbol, features in features_by_asset.items():
             print(f"{symbol}:")
-            print(f"  Price: ${features['current_price']:.2f}")
-            print(f"  5d: {features['returns_5d']*100:+.2f}% | 20d: {features['returns_20d']*100:+.2f}% | 60d: {features['returns_60d']*100:+.2f}%")
-            print(f"  Volatility: {features['volatility']*100:.2f}%")
-            print(f"  RSI: {features['rsi']:.1f} | BB Position: {features['bollinger_position']:.2f}")
+            print(f"  Price: ${features.current_price:.2f}")
+            print(f"  5d: {features.returns_5d*100:+.2f}% | 20d: {features.returns_20d*100:+.2f}% | 60d: {features.returns_60d*100:+.2f}%")
+            print(f"  Volatility: {features.volatility*100:.2f}%")
+            print(f"  RSI: {features.rsi:.1f} | BB Position: {features.bollinger_position:.2f}")
 
         if not features_by_asset:
             error_msg = f"ERROR: No data available for any assets on {trade_date}. Need at least 60 days of price history."
             print(error_msg)
             raise ValueError(error_msg)
 
+        # Struct-of-arrays view shared by every scoring step; the dict stays for
+        # per-symbol logging and lookups
+        features = feature_table(features_by_asset)
+        symbols = list(features_by_asset)
+
+        # Regime/risk weights and transition/decision thresholds are read off the config once for this run
+        signal_weights = SignalWeights.from_config(trading_config)
+        transition_thresholds = TransitionThresholds.from_config(trading_config)
+        decision_thresholds = DecisionThresholds.from_config(trading_config)
+
         # Step 1: Detect market regime
-        regime_score = calculate_regime(features_by_asset)
+        regime_score = calculate_regime(features, signal_weights)
 
         # Step 2: Calculate adaptive thresholds based on current volatility
-        avg_volatility = sum(f['volatility'] for f in features_by_asset.values()) / len(features_by_asset)
+        avg_volatility = float(features['volatility'].mean())
         adaptive_bullish_threshold = calculate_adaptive_threshold(
             trading_config.regime_bullish_threshold,
             avg_volatility,
@@ -909,11 +1227,11 @@ def generate_signal(trade_date: date = None):
 
         # Step 3: Detect regime transition
         prev_regime_score = get_previous_regime_score(db, trade_date)
-        regime_transition = detect_regime_transition(regime_score, prev_regime_score)
+        regime_transition = detect_regime_transition(regime_score, prev_regime_score, transition_thresholds)
         print(f"  Regime Transition: {regime_transition}")
 
         # Step 4: Calculate risk level
-        risk_score = calculate_risk_score(features_by_asset)
+        risk_score = calculate_risk_score(features, signal_weights)
         # Use tunable risk label thresholds
         risk_label = "HIGH" if risk_score > trading_config.risk_label_high_threshold else \
                      "MEDIUM" if risk_score > trading_config.risk_label_medium_threshold else "LOW"
@@ -926,21 +1244,24 @@ def generate_signal(trade_date: date = None):
         if current_dd > trading_config.intramonth_drawdown_limit:
             print(f"  ⚠️  WARNING: Intra-month drawdown {current_dd*100:.1f}% exceeds {trading_config.intramonth_drawdown_limit*100:.0f}% - continuing operations")
 
-        # Step 6: Rank assets
-        asset_scores = rank_assets(features_by_asset)
+        # Step 6: Rank assets (mean reversion states are classified once and reused in step 7)
+        mean_reversion_classes = classify_mean_reversion(features, symbols)
+        asset_scores = rank_assets(features, symbols, mean_reversion_classes)
         print(f"\nAsset Rankings:")
         for symbol, score in sorted(asset_scores.items(), key=lambda x: x[1], reverse=True):
-            rsi = features_by_asset[symbol]['rsi']
-            bb_pos = features_by_asset[symbol]['bollinger_position']
+            rsi = features_by_asset[symbol].rsi
+            bb_pos = features_by_asset[symbol].bollinger_position
             print(f"  {symbol}: {score:.4f} (RSI:{rsi:.1f}, BB:{bb_pos:+.2f})")
 
         # Step 7: Check for mean reversion opportunity
-        mean_reversion_opportunity = detect_mean_reversion_opportunity(features_by_asset, regime_score)
+        mean_reversion_opportunity = detect_mean_reversion_opportunity(
+            features_by_asset, regime_score, mean_reversion_classes
+        )
         if mean_reversion_opportunity[0]:
             print(f"\nMean Reversion: {mean_reversion_opportunity[1]} in {mean_reversion_opportunity[2]}")
 
         # NEW: Step 7b: Check for downward pressure
-        has_pressure, pressure_severity, pressure_reason = detect_downward_pressure(features_by_asset, risk_score)
+        has_pressure, pressure_severity, pressure_reason = detect_downward_pressure(features, risk_score)
         if has_pressure:
             print(f"\n⚠️  Downward Pressure Detected: {pressure_severity.upper()}")
             print(f"   Reason: {pressure_reason}")
@@ -975,14 +1296,14 @@ def generate_signal(trade_date: date = None):
             regime_score, risk_score, has_holdings,
             mean_reversion_opportunity,
             adaptive_bullish_threshold, adaptive_bearish_threshold,
-            current_dd, features_by_asset, cash_pct
+            current_dd, features, cash_pct, decision_thresholds
         )
         print(f"\nDecision: {action} (allocation: {allocation_pct*100:.0f}%, type: {signal_type})")
 
         # Step 10: Calculate confidence score
         trend_consistency = max(
             1.5 if all(
-                m > 0 for m in [f.get('returns_5d', 0), f.get('returns_20d', 0), f['returns_60d']]
+                m > 0 for m in [f.returns_5d, f.returns_20d, f.returns_60d]
             ) else 1.0
             for f in features_by_asset.values()
         )
@@ -1121,13 +1442,13 @@ def generate_signal(trade_date: date = None):
                 "avg_volatility": float(avg_volatility),
                 "assets": {
                     symbol: {
-                        "returns_5d": float(f["returns_5d"]),
-                        "returns_20d": float(f["returns_20d"]),
-                        "returns_60d": float(f["returns_60d"]),
-                        "volatility": float(f["volatility"]),
+                        "returns_5d": float(f.returns_5d),
+                        "returns_20d": float(f.returns_20d),
+                        "returns_60d": float(f.returns_60d),
+                        "volatility": float(f.volatility),
                         "score": float(asset_scores.get(symbol, 0)),
-                        "rsi": float(f["rsi"]),
-                        "bollinger_position": float(f["bollinger_position"])
+                        "rsi": float(f.rsi),
+                        "bollinger_position": float(f.bollinger_position)
                     }
                     for symbol, f in features_by_asset.items()
                 }
@@ -13,6 +13,7 @@ from pathlib import Path
 from datetime import datetime, timedelta, date
 import json
 import psycopg2
+from psycopg2.extras import Json
 import subprocess
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -33,40 +34,41 @@ def create_initial_config(start_date: date):
         # Delete existing configs
         cursor.execute("DELETE FROM trading_config")
 
-        # Insert aggressive config
+        # Insert aggressive config (parameters go into the params JSONB column)
         cursor.execute("""
             INSERT INTO trading_config (
-                start_date, end_date, daily_capital, assets, lookback_days,
-                regime_bullish_threshold, regime_bearish_threshold,
-                risk_high_threshold, risk_medium_threshold,
-                allocation_low_risk, allocation_medium_risk, allocation_high_risk,
-                allocation_neutral, sell_percentage,
-                momentum_weight, price_momentum_weight,
-                max_drawdown_tolerance, min_sharpe_target,
-                rsi_oversold_threshold, rsi_overbought_threshold,
-                bollinger_std_multiplier, mean_reversion_allocation,
-                volatility_adjustment_factor, base_volatility,
-                min_confidence_threshold, confidence_scaling_factor,
-                intramonth_drawdown_limit, circuit_breaker_reduction,
-                created_by, notes
+                start_date, end_date, assets, params, created_by, notes
             ) VALUES (
-                %s, NULL, 1000.0, '["SPY", "QQQ", "DIA"]'::jsonb, 252,
-                0.1, -0.1,
-                70.0, 40.0,
-                1.0, 1.0, 0.9,
-                0.7,
-                0.7,
-                0.6, 0.4,
-                20.0, 0.8,
-                30.0, 70.0,
-                2.0, 0.5,
-                0.2, 0.01,
-                0.01,               
-                0.2,
-                0.15, 0.5,
+                %s, NULL, '["SPY", "QQQ", "DIA"]'::jsonb, %s,
                 'initial_training', 'Initial aggressive config for training'
             )
-        """, (start_date,))
+        """, (start_date, Json({
+            'daily_capital': 1000.0,
+            'lookback_days': 252,
+            'regime_bullish_threshold': 0.1,
+            'regime_bearish_threshold': -0.1,
+            'risk_high_threshold': 70.0,
+            'risk_medium_threshold': 40.0,
+            'allocation_low_risk': 1.0,
+            'allocation_medium_risk': 1.0,
+            'allocation_high_risk': 0.9,
+            'allocation_neutral': 0.7,
+            'sell_percentage': 0.7,
+            'momentum_weight': 0.6,
+            'price_momentum_weight': 0.4,
+            'max_drawdown_tolerance': 20.0,
+            'min_sharpe_target': 0.8,
+            'rsi_oversold_threshold': 30.0,
+            'rsi_overbought_threshold': 70.0,
+            'bollinger_std_multiplier': 2.0,
+            'mean_reversion_allocation': 0.5,
+            'volatility_adjustment_factor': 0.2,
+            'base_volatility': 0.01,
+            'min_confidence_threshold': 0.01,
+            'confidence_scaling_factor': 0.2,
+            'intramonth_drawdown_limit': 0.15,
+            'circuit_breaker_reduction': 0.5
+        })))
 
         conn.commit()
         print("  ✓ Initial config created")
@@ -317,21 +319,35 @@ def generate_prod_config(start_date, end_date):
     cursor = conn.cursor()
 
     try:
-        # Get the most recent (active) config
+        # Get the most recent (active) config; parameters are read out of params
         cursor.execute("""
             SELECT
-                regime_bullish_threshold, regime_bearish_threshold,
-                risk_high_threshold, risk_medium_threshold,
-                allocation_low_risk, allocation_medium_risk, allocation_high_risk,
-                allocation_neutral, sell_percentage,
-                momentum_weight, price_momentum_weight,
-                max_drawdown_tolerance, min_sharpe_target,
-                rsi_oversold_threshold, rsi_overbought_threshold,
-                bollinger_std_multiplier, mean_reversion_allocation,
-                volatility_adjustment_factor, base_volatility,
-                min_confidence_threshold, confidence_scaling_factor,
-                intramonth_drawdown_limit, circuit_breaker_reduction,
-                daily_capital, assets, lookback_days
+                params -> 'regime_bullish_threshold',
+                params -> 'regime_bearish_threshold',
+                params -> 'risk_high_threshold',
+                params -> 'risk_medium_threshold',
+                params -> 'allocation_low_risk',
+                params -> 'allocation_medium_risk',
+                params -> 'allocation_high_risk',
+                params -> 'allocation_neutral',
+                params -> 'sell_percentage',
+                params -> 'momentum_weight',
+                params -> 'price_momentum_weight',
+                params -> 'max_drawdown_tolerance',
+                params -> 'min_sharpe_target',
+                params -> 'rsi_oversold_threshold',
+                params -> 'rsi_overbought_threshold',
+                params -> 'bollinger_std_multiplier',
+                params -> 'mean_reversion_allocation',
+                params -> 'volatility_adjustment_factor',
+                params -> 'base_volatility',
+                params -> 'min_confidence_threshold',
+                params -> 'confidence_scaling_factor',
+                params -> 'intramonth_drawdown_limit',
+                params -> 'circuit_breaker_reduction',
+                params -> 'daily_capital',
+                assets,
+                params -> 'lookback_days'
             FROM trading_config
             WHERE end_date IS NULL
             ORDER BY created_at DESC
@@ -360,6 +376,8 @@ def generate_prod_config(start_date, end_date):
          daily_capital, assets, lookback_days) = result
 
         notes = f"Trained via continuous backtest ({start_date} to {end_date})"
+        # The seed migration replays this file before parameters move into the
+        # params column, so it keeps the original one-column-per-parameter layout
         output_file = Path(__file__).parent.parent / "alembic" / "seed_data" / "trading_config_initial.sql"
 
         with open(output_file, 'w') as f:
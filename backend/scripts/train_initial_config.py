@@ -63,6 +63,8 @@ def generate_config_sql(output_file: str, start_date: str = '2015-01-01', notes:
         'notes': notes
     }
 
+    # Written against the schema as of the seed migration (27c553c12df9), which
+    # still has one column per parameter; a later migration folds them into params
     with open(output_file, 'w') as f:
         f.write("-- Initial trading configuration\n")
         f.write("-- Generated on: {}\n".format(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
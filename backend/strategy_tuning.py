@@ -16,6 +16,7 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
+from types import SimpleNamespace
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -47,6 +48,9 @@ MONTH_DAYS_APPROX = 30
 TOP_N_WORST_TRADES = 5
 REPORT_SEPARATOR_WIDTH = 80
 
+# trades.action one-letter codes
+ACTION_NAMES = {'B': 'BUY', 'S': 'SELL', 'H': 'HOLD'}
+
 
 @dataclass
 class TradeEvaluation:
@@ -246,7 +250,7 @@ class StrategyTuner:
         for trade in trades:
             trade_date = trade['trade_date']
             symbol = trade['symbol']
-            action = trade['action']
+            action = ACTION_NAMES[trade['action']]
             amount = float(trade['amount'])
             quantity = float(trade['quantity'])
             price = float(trade['price'])
@@ -638,8 +642,9 @@ class StrategyTuner:
         Returns:
             Updated TradingConfig
         """
-        # Create new params based on current config
-        new_params = TradingConfig(
+        # Create new params based on current config. TradingConfig is frozen, so
+        # adjustments go onto a mutable draft that is frozen again on return
+        new_params = SimpleNamespace(**TradingConfig(
             daily_capital=self.current_params.daily_capital,
             assets=self.current_params.assets,
             lookback_days=self.current_params.lookback_days,
@@ -667,7 +672,7 @@ class StrategyTuner:
             confidence_scaling_factor=self.current_params.confidence_scaling_factor,
             intramonth_drawdown_limit=self.current_params.intramonth_drawdown_limit,
             circuit_breaker_reduction=self.current_params.circuit_breaker_reduction
-        )
+        ).to_dict())
 
         momentum_perf = condition_analysis['momentum']
         choppy_perf = condition_analysis['choppy']
@@ -860,7 +865,7 @@ class StrategyTuner:
             elif risk_assessment_working:
                 print(f"  ✅ Risk score weights working well - maintaining current balance")
 
-        return new_params
+        return TradingConfig(**vars(new_params))
 
     def save_parameters(self, params: TradingConfig, report_path: str, start_date: date):
         """
@@ -47,14 +47,14 @@ class E2EAnalytics:
 
         # Load daily budget from test config
         self.cursor.execute("""
-            SELECT daily_capital FROM test_trading_config
+            SELECT params -> 'daily_capital' AS daily_capital FROM test_trading_config
             WHERE start_date <= %s
             AND (end_date IS NULL OR end_date >= %s)
             ORDER BY start_date DESC
             LIMIT 1
         """, (start_date, start_date))
         row = self.cursor.fetchone()
-        if row:
+        if row and row['daily_capital'] is not None:
             self.daily_budget = Decimal(str(row['daily_capital']))
         else:
             self.daily_budget = Decimal("1000.0")
@@ -146,14 +146,14 @@ class E2EAnalytics:
         self.cursor.execute("""
             SELECT COALESCE(SUM(amount), 0) as total_spent
             FROM test_trades
-            WHERE trade_date >= %s AND trade_date <= %s AND action = 'BUY'
+            WHERE trade_date >= %s AND trade_date <= %s AND action = 'B'
         """, (self.start_date, self.end_date))
         total_spent = Decimal(str(self.cursor.fetchone()['total_spent']))
 
         self.cursor.execute("""
             SELECT COALESCE(SUM(amount), 0) as total_proceeds
             FROM test_trades
-            WHERE trade_date >= %s AND trade_date <= %s AND action = 'SELL'
+            WHERE trade_date >= %s AND trade_date <= %s AND action = 'S'
         """, (self.start_date, self.end_date))
         cash_from_sells = Decimal(str(self.cursor.fetchone()['total_proceeds']))
 
@@ -174,7 +174,7 @@ class E2EAnalytics:
             self.cursor.execute("""
                 SELECT COALESCE(SUM(amount), 0) as invested_today
                 FROM test_trades
-                WHERE trade_date = %s AND action = 'BUY'
+                WHERE trade_date = %s AND action = 'B'
             """, (trade_date,))
             invested_today = Decimal(str(self.cursor.fetchone()['invested_today']))
 
@@ -13,7 +13,7 @@ from typing import List, Dict, Optional
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import numpy as np
 
 # Add parent directories to path
@@ -68,7 +68,10 @@ class E2EBacktest:
         """, (reference_date, reference_date))
         row = self.cursor.fetchone()
         if row:
-            return dict(row)
+            # Parameters live in the params JSONB column; flatten them into the config
+            config = dict(row)
+            config.update(config.pop('params', None) or {})
+            return config
         else:
             # Return defaults if no config found
             return {
@@ -538,29 +541,32 @@ class E2EBacktest:
         prices = {row['symbol']: Decimal(str(row['open_price'])) for row in self.cursor.fetchall()}
 
         # Execute trades based on allocations
+        trades = []
         for symbol, amount in allocations.items():
             if amount > 0 and symbol in prices:
                 price = prices[symbol]
                 quantity = Decimal(str(amount)) / price
-
-                # Insert trade
-                self.cursor.execute("""
-                    INSERT INTO test_trades
-                    (trade_date, symbol, action, quantity, price, amount, signal_id)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (trade_date, symbol, 'BUY', float(quantity), float(price), float(amount), signal_id))
-
-                # Update portfolio
-                self.cursor.execute("""
-                    INSERT INTO test_portfolio (symbol, quantity, avg_cost)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (symbol) DO UPDATE SET
-                        quantity = test_portfolio.quantity + EXCLUDED.quantity,
-                        avg_cost = (test_portfolio.avg_cost * test_portfolio.quantity +
-                                    EXCLUDED.avg_cost * EXCLUDED.quantity) /
-                                   (test_portfolio.quantity + EXCLUDED.quantity),
-                        last_updated = CURRENT_TIMESTAMP
-                """, (symbol, float(quantity), float(price)))
+                trades.append((trade_date, symbol, 'B', float(quantity), float(price), float(amount), signal_id))
+
+        if trades:
+            # One multi-row INSERT for the day's trades
+            execute_values(self.cursor, """
+                INSERT INTO test_trades
+                (trade_date, symbol, action, quantity, price, amount, signal_id)
+                VALUES %s
+            """, trades)
+
+            # One multi-row upsert for the portfolio (symbols are unique per signal)
+            execute_values(self.cursor, """
+                INSERT INTO test_portfolio (symbol, quantity, avg_cost)
+                VALUES %s
+                ON CONFLICT (symbol) DO UPDATE SET
+                    quantity = test_portfolio.quantity + EXCLUDED.quantity,
+                    avg_cost = (test_portfolio.avg_cost * test_portfolio.quantity +
+                                EXCLUDED.avg_cost * EXCLUDED.quantity) /
+                               (test_portfolio.quantity + EXCLUDED.quantity),
+                    last_updated = CURRENT_TIMESTAMP
+            """, [(symbol, quantity, price) for _, symbol, _, quantity, price, _, _ in trades])
 
         self.conn.commit()
         return True
@@ -591,7 +597,7 @@ class E2EBacktest:
         self.cursor.execute("""
             SELECT COALESCE(SUM(amount), 0) as total_injected
             FROM test_trades
-            WHERE trade_date >= %s AND trade_date <= %s AND action = 'BUY'
+            WHERE trade_date >= %s AND trade_date <= %s AND action = 'B'
         """, (self.start_date, trade_date))
         result = self.cursor.fetchone()
         cash_injected = Decimal(str(result['total_injected']))
@@ -600,7 +606,7 @@ class E2EBacktest:
         self.cursor.execute("""
             SELECT COALESCE(SUM(amount), 0) as total_proceeds
             FROM test_trades
-            WHERE trade_date >= %s AND trade_date <= %s AND action = 'SELL'
+            WHERE trade_date >= %s AND trade_date <= %s AND action = 'S'
         """, (self.start_date, trade_date))
         result = self.cursor.fetchone()
         cash_from_sells = Decimal(str(result['total_proceeds']))
@@ -682,7 +688,7 @@ class E2EBacktest:
         self.cursor.execute("""
             SELECT SUM(amount) as total_injected
             FROM test_trades
-            WHERE trade_date >= %s AND trade_date <= %s AND action = 'BUY'
+            WHERE trade_date >= %s AND trade_date <= %s AND action = 'B'
         """, (self.start_date, self.end_date))
         result = self.cursor.fetchone()
         total_injected = Decimal(str(result['total_injected'])) if result['total_injected'] else Decimal(0)
@@ -12,7 +12,7 @@ from typing import Dict, List, Tuple
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, Json
 import numpy as np
 
 # Add parent directories to path
@@ -69,7 +69,10 @@ class E2EStrategyTuner:
         """)
         row = self.cursor.fetchone()
         if row:
-            return dict(row)
+            # Parameters live in the params JSONB column; flatten them into the config
+            config = dict(row)
+            config.update(config.pop('params', None) or {})
+            return config
         else:
             return self._get_default_config()
 
@@ -328,81 +331,41 @@ class E2EStrategyTuner:
             WHERE end_date IS NULL
         """, (effective_date - timedelta(days=1),))
 
-        # Insert new config
+        # Insert new config; the parameters go into the params JSONB column
         self.cursor.execute("""
             INSERT INTO test_trading_config (
-                start_date,
-                end_date,
-                daily_capital,
-                assets,
-                lookback_days,
-                regime_bullish_threshold,
-                regime_bearish_threshold,
-                risk_high_threshold,
-                risk_medium_threshold,
-                allocation_low_risk,
-                allocation_medium_risk,
-                allocation_high_risk,
-                allocation_neutral,
-                sell_percentage,
-                momentum_weight,
-                price_momentum_weight,
-                max_drawdown_tolerance,
-                min_sharpe_target,
-                rsi_oversold_threshold,
-                rsi_overbought_threshold,
-                bollinger_std_multiplier,
-                mean_reversion_allocation,
-                volatility_adjustment_factor,
-                base_volatility,
-                min_confidence_threshold,
-                confidence_scaling_factor,
-                intramonth_drawdown_limit,
-                circuit_breaker_reduction,
-                created_by,
-                notes
-            ) VALUES (
-                %s, NULL, %s, %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s, %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s
-            )
+                start_date, end_date, assets, params, created_by, notes
+            ) VALUES (%s, NULL, %s, %s, %s, %s)
         """, (
             effective_date,
-            params.get('daily_capital', 1000.0),
-            '["SPY", "QQQ", "DIA"]',
-            params.get('lookback_days', 252),
-            params.get('regime_bullish_threshold', 0.3),
-            params.get('regime_bearish_threshold', -0.3),
-            params.get('risk_high_threshold', 70.0),
-            params.get('risk_medium_threshold', 40.0),
-            params.get('allocation_low_risk', 0.8),
-            params.get('allocation_medium_risk', 0.5),
-            params.get('allocation_high_risk', 0.3),
-            params.get('allocation_neutral', 0.2),
-            params.get('sell_percentage', 0.7),
-            params.get('momentum_weight', 0.6),
-            params.get('price_momentum_weight', 0.4),
-            params.get('max_drawdown_tolerance', 15.0),
-            params.get('min_sharpe_target', 1.0),
-            params.get('rsi_oversold_threshold', 30.0),
-            params.get('rsi_overbought_threshold', 70.0),
-            params.get('bollinger_std_multiplier', 2.0),
-            params.get('mean_reversion_allocation', 0.4),
-            params.get('volatility_adjustment_factor', 0.4),
-            params.get('base_volatility', 0.01),
-            params.get('min_confidence_threshold', 0.3),
-            params.get('confidence_scaling_factor', 0.5),
-            params.get('intramonth_drawdown_limit', 0.10),
-            params.get('circuit_breaker_reduction', 0.5),
+            Json(["SPY", "QQQ", "DIA"]),
+            Json({
+                'daily_capital': params.get('daily_capital', 1000.0),
+                'lookback_days': params.get('lookback_days', 252),
+                'regime_bullish_threshold': params.get('regime_bullish_threshold', 0.3),
+                'regime_bearish_threshold': params.get('regime_bearish_threshold', -0.3),
+                'risk_high_threshold': params.get('risk_high_threshold', 70.0),
+                'risk_medium_threshold': params.get('risk_medium_threshold', 40.0),
+                'allocation_low_risk': params.get('allocation_low_risk', 0.8),
+                'allocation_medium_risk': params.get('allocation_medium_risk', 0.5),
+                'allocation_high_risk': params.get('allocation_high_risk', 0.3),
+                'allocation_neutral': params.get('allocation_neutral', 0.2),
+                'sell_percentage': params.get('sell_percentage', 0.7),
+                'momentum_weight': params.get('momentum_weight', 0.6),
+                'price_momentum_weight': params.get('price_momentum_weight', 0.4),
+                'max_drawdown_tolerance': params.get('max_drawdown_tolerance', 15.0),
+                'min_sharpe_target': params.get('min_sharpe_target', 1.0),
+                'rsi_oversold_threshold': params.get('rsi_oversold_threshold', 30.0),
+                'rsi_overbought_threshold': params.get('rsi_overbought_threshold', 70.0),
+                'bollinger_std_multiplier': params.get('bollinger_std_multiplier', 2.0),
+                'mean_reversion_allocation': params.get('mean_reversion_allocation', 0.4),
+                'volatility_adjustment_factor': params.get('volatility_adjustment_factor', 0.4),
+                'base_volatility': params.get('base_volatility', 0.01),
+                'min_confidence_threshold': params.get('min_confidence_threshold', 0.3),
+                'confidence_scaling_factor': params.get('confidence_scaling_factor', 0.5),
+                'intramonth_drawdown_limit': params.get('intramonth_drawdown_limit', 0.10),
+                'circuit_breaker_reduction': params.get('circuit_breaker_reduction', 0.5)
+            }),
             'e2e_strategy_tuner',
             f'Tuned from {self.train_start} to {self.train_end}'
         ))
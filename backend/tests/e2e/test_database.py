@@ -2,13 +2,41 @@
 Test database operations for E2E testing.
 Provides utilities to set up and tear down test database tables.
 """
+import csv
+import io
 import json
 import os
 from datetime import date
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import RealDictCursor, execute_values
+from dotenv import load_dotenv
+from psycopg2.extras import RealDictCursor, Json
+
+
+def bulk_copy(cursor, table, columns, rows):
+    """
+    Load rows into a table with a single COPY FROM STDIN
+
+    COPY skips the per-row parse/plan of INSERT, so it is the fastest way to
+    seed large fixture tables (e.g. synthetic price history).
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target table name
+        columns: Column names, in the order of each row's values
+        rows: Iterable of row tuples
+
+    Returns:
+        Number of rows copied
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH CSV", buffer)
+    return cursor.rowcount
 
 
 class E2ETestDatabaseManager:
@@ -28,14 +56,8 @@ class E2ETestDatabaseManager:
         if database_url is None:
             # Load from .env in repo root if DATABASE_URL not set
             if not os.getenv("DATABASE_URL"):
-                env_file = Path(__file__).parent.parent.parent.parent / '.env'
-                if env_file.exists():
-                    with open(env_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith('#') and '=' in line:
-                                key, value = line.split('=', 1)
-                                os.environ[key] = value
+                # A missing file is a no-op
+                load_dotenv(Path(__file__).parent.parent.parent.parent / '.env', override=True)
             database_url = os.getenv("DATABASE_URL")
         self.database_url = database_url
         self.conn = None
@@ -103,14 +125,9 @@ class E2ETestDatabaseManager:
         # Clear existing test price history
         self.cursor.execute("DELETE FROM test_price_history")
 
-        # Insert price history in batches
-        insert_query = """
-            INSERT INTO test_price_history
-            (date, symbol, open_price, high_price, low_price, close_price, volume)
-            VALUES %s
-        """
-
-        values = [
+        # Load price history in one COPY
+        columns = ('date', 'symbol', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
+        values = (
             (
                 record['date'],
                 record['symbol'],
@@ -121,9 +138,9 @@ class E2ETestDatabaseManager:
                 record['volume']
             )
             for record in records
-        ]
+        )
 
-        execute_values(self.cursor, insert_query, values)
+        bulk_copy(self.cursor, 'test_price_history', columns, values)
         self.conn.commit()
 
         return len(records)
@@ -134,52 +151,39 @@ class E2ETestDatabaseManager:
 
         self.cursor.execute("""
             INSERT INTO test_trading_config (
-                start_date,
-                end_date,
-                daily_capital,
-                assets,
-                lookback_days,
-                regime_bullish_threshold,
-                regime_bearish_threshold,
-                risk_high_threshold,
-                risk_medium_threshold,
-                allocation_low_risk,
-                allocation_medium_risk,
-                allocation_high_risk,
-                allocation_neutral,
-                sell_percentage,
-                momentum_weight,
-                price_momentum_weight,
-                max_drawdown_tolerance,
-                min_sharpe_target,
-                rsi_oversold_threshold,
-                rsi_overbought_threshold,
-                bollinger_std_multiplier,
-                mean_reversion_allocation,
-                volatility_adjustment_factor,
-                base_volatility,
-                min_confidence_threshold,
-                confidence_scaling_factor,
-                intramonth_drawdown_limit,
-                circuit_breaker_reduction,
-                created_by,
-                notes
+                start_date, end_date, assets, params, created_by, notes
             ) VALUES (
-                %s, NULL, 1000.0, %s, 252,
-                0.3, -0.3,
-                70.0, 40.0,
-                0.8, 0.5, 0.3,
-                0.2, 0.7,
-                0.6, 0.4,
-                15.0, 1.0,
-                30.0, 70.0, 2.0, 0.4,
-                0.4, 0.01,
-                0.3, 0.5,
-                0.10, 0.5,
+                %s, NULL, %s, %s,
                 'e2e_test_reset',
                 'Default test configuration for E2E testing'
             )
-        """, (date(1970, 1, 1), '["SPY", "QQQ", "DIA"]'))
+        """, (date(1970, 1, 1), Json(["SPY", "QQQ", "DIA"]), Json({
+            'daily_capital': 1000.0,
+            'lookback_days': 252,
+            'regime_bullish_threshold': 0.3,
+            'regime_bearish_threshold': -0.3,
+            'risk_high_threshold': 70.0,
+            'risk_medium_threshold': 40.0,
+            'allocation_low_risk': 0.8,
+            'allocation_medium_risk': 0.5,
+            'allocation_high_risk': 0.3,
+            'allocation_neutral': 0.2,
+            'sell_percentage': 0.7,
+            'momentum_weight': 0.6,
+            'price_momentum_weight': 0.4,
+            'max_drawdown_tolerance': 15.0,
+            'min_sharpe_target': 1.0,
+            'rsi_oversold_threshold': 30.0,
+            'rsi_overbought_threshold': 70.0,
+            'bollinger_std_multiplier': 2.0,
+            'mean_reversion_allocation': 0.4,
+            'volatility_adjustment_factor': 0.4,
+            'base_volatility': 0.01,
+            'min_confidence_threshold': 0.3,
+            'confidence_scaling_factor': 0.5,
+            'intramonth_drawdown_limit': 0.10,
+            'circuit_breaker_reduction': 0.5
+        })))
 
         self.conn.commit()
 
@@ -6,7 +6,8 @@ This script:
 2. Creates fresh test_* tables
 3. Seeds with minimal test data
 
-Run before each test suite to ensure clean state.
+Run before each test suite to ensure clean state. The steps share one pooled
+connection rather than reconnecting for each.
 """
 import os
 import sys
@@ -14,191 +15,137 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import psycopg2
+from typing import List
+
+from sqlalchemy import DefaultClause, MetaData
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+import models
 from config import get_settings
+from connection_pool import close_all_pools, pooled_connection
 
 settings = get_settings()
 
 
+# Production models mirrored by the test_* tables
+TEST_TABLE_MODELS = (
+    models.PriceHistory,
+    models.DailySignal,
+    models.Trade,
+    models.Portfolio,
+    models.PerformanceMetrics,
+    models.TradingConfig,
+)
+
+
+def mirrored_table_ddl(model) -> List[str]:
+    """
+    CREATE statements for a model's test_* table, generated from the production model
+
+    The table and its named indexes get a test_ prefix so they sit alongside
+    the production objects; everything else comes straight from
+    the model, so the test schema never drifts from it. Scalar model defaults
+    become server defaults so partial INSERTs still fill the remaining columns.
+    Partitioned tables get a single DEFAULT partition to hold every row.
+
+    Args:
+        model: SQLAlchemy model class
+
+    Returns:
+        CREATE TABLE / CREATE INDEX statements, in execution order
+    """
+    source_name = model.__tablename__
+    name = f"test_{source_name}"
+    table = model.__table__.to_metadata(MetaData(), name=name)
+    dialect = postgresql.dialect()
+
+    statements = []
+    for column in table.columns:
+        if column.default is not None and column.server_default is None:
+            column.server_default = DefaultClause(repr(column.default.arg))
+    statements.append(CreateTable(table))
+
+    for index in table.indexes:
+        # Column-level indexes are already named after the new table
+        if name not in index.name:
+            index.name = index.name.replace(source_name, name, 1)
+        statements.append(CreateIndex(index))
+
+    ddl = [str(statement.compile(dialect=dialect)).strip() for statement in statements]
+    if table.dialect_options['postgresql']['partition_by']:
+        ddl.append(f"CREATE TABLE {name}_default PARTITION OF {name} DEFAULT")
+    return ddl
+
+
+# Setup SQL, assembled once at import. Each is a multi-statement script that
+# psycopg2 sends in a single round trip.
+
+# One DROP TABLE for every test table. The DROP TYPE only cleans up test
+# databases built before trades.action stopped being an enum; nothing creates
+# test_actiontype any more.
+DROP_TEST_TABLES_SQL = f"""
+    DROP TABLE IF EXISTS {", ".join(f"test_{model.__tablename__}" for model in TEST_TABLE_MODELS)} CASCADE;
+    DROP TYPE IF EXISTS test_actiontype CASCADE;
+"""
+
+CREATE_TEST_TABLES_SQL = ";\n".join(
+    statement for model in TEST_TABLE_MODELS for statement in mirrored_table_ddl(model)
+)
+
+SEED_TEST_CONFIG_SQL = """
+    INSERT INTO test_trading_config (
+        start_date, assets, created_by, notes
+    ) VALUES (
+        '2020-01-01', '["SPY", "QQQ", "DIA"]'::jsonb,
+        'test_setup', 'Minimal test configuration'
+    );
+"""
+
+
 def drop_test_tables():
     """Drop all test tables"""
-    conn = psycopg2.connect(settings.database_url)
-    cursor = conn.cursor()
+    with pooled_connection(settings.database_url) as conn:
+        cursor = conn.cursor()
 
-    try:
-        print("Dropping test tables...")
-        cursor.execute("""
-            DROP TABLE IF EXISTS test_performance_metrics CASCADE;
-            DROP TABLE IF EXISTS test_trades CASCADE;
-            DROP TABLE IF EXISTS test_daily_signals CASCADE;
-            DROP TABLE IF EXISTS test_portfolio CASCADE;
-            DROP TABLE IF EXISTS test_price_history CASCADE;
-            DROP TABLE IF EXISTS test_trading_config CASCADE;
-            DROP TYPE IF EXISTS test_actiontype CASCADE;
-        """)
-        conn.commit()
-        print("  ✓ Dropped all test tables")
-    finally:
-        cursor.close()
-        conn.close()
+        try:
+            print("Dropping test tables...")
+            cursor.execute(DROP_TEST_TABLES_SQL)
+            conn.commit()
+            print("  ✓ Dropped all test tables")
+        finally:
+            cursor.close()
 
 
 def create_test_tables():
     """Create fresh test tables"""
-    conn = psycopg2.connect(settings.database_url)
-    cursor = conn.cursor()
+    with pooled_connection(settings.database_url) as conn:
+        cursor = conn.cursor()
 
-    try:
-        print("Creating test tables...")
-
-        # Create enum type
-        cursor.execute("""
-            CREATE TYPE test_actiontype AS ENUM ('BUY', 'SELL', 'HOLD');
-        """)
-
-        # test_price_history
-        cursor.execute("""
-            CREATE TABLE test_price_history (
-                id SERIAL PRIMARY KEY,
-                date DATE NOT NULL,
-                symbol VARCHAR(10) NOT NULL,
-                open_price FLOAT NOT NULL,
-                high_price FLOAT NOT NULL,
-                low_price FLOAT NOT NULL,
-                close_price FLOAT NOT NULL,
-                volume FLOAT NOT NULL,
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            );
-            CREATE INDEX idx_test_price_history_date ON test_price_history(date);
-            CREATE INDEX idx_test_price_history_symbol ON test_price_history(symbol);
-        """)
-
-        # test_daily_signals
-        cursor.execute("""
-            CREATE TABLE test_daily_signals (
-                id SERIAL PRIMARY KEY,
-                trade_date DATE NOT NULL UNIQUE,
-                generated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                allocations JSON NOT NULL,
-                model_type VARCHAR(50) NOT NULL,
-                confidence_score FLOAT,
-                features_used JSON
-            );
-            CREATE INDEX idx_test_daily_signals_trade_date ON test_daily_signals(trade_date);
-        """)
-
-        # test_trades
-        cursor.execute("""
-            CREATE TABLE test_trades (
-                id SERIAL PRIMARY KEY,
-                trade_date DATE NOT NULL,
-                executed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                symbol VARCHAR(10) NOT NULL,
-                action test_actiontype NOT NULL,
-                quantity FLOAT NOT NULL,
-                price FLOAT NOT NULL,
-                amount FLOAT NOT NULL,
-                signal_id INTEGER
-            );
-            CREATE INDEX idx_test_trades_trade_date ON test_trades(trade_date);
-        """)
-
-        # test_portfolio
-        cursor.execute("""
-            CREATE TABLE test_portfolio (
-                id SERIAL PRIMARY KEY,
-                symbol VARCHAR(10) NOT NULL UNIQUE,
-                quantity FLOAT NOT NULL DEFAULT 0,
-                avg_cost FLOAT NOT NULL DEFAULT 0,
-                last_updated TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-
-        # test_performance_metrics
-        cursor.execute("""
-            CREATE TABLE test_performance_metrics (
-                id SERIAL PRIMARY KEY,
-                date DATE NOT NULL UNIQUE,
-                portfolio_value FLOAT NOT NULL,
-                cash_balance FLOAT NOT NULL,
-                total_value FLOAT NOT NULL,
-                daily_return FLOAT,
-                cumulative_return FLOAT,
-                sharpe_ratio FLOAT,
-                max_drawdown FLOAT,
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            );
-            CREATE INDEX idx_test_performance_metrics_date ON test_performance_metrics(date);
-        """)
-
-        # test_trading_config
-        cursor.execute("""
-            CREATE TABLE test_trading_config (
-                id SERIAL PRIMARY KEY,
-                start_date DATE NOT NULL,
-                end_date DATE,
-                daily_capital FLOAT NOT NULL DEFAULT 1000.0,
-                assets JSONB NOT NULL,
-                lookback_days INTEGER NOT NULL DEFAULT 252,
-                regime_bullish_threshold FLOAT NOT NULL DEFAULT 0.3,
-                regime_bearish_threshold FLOAT NOT NULL DEFAULT -0.3,
-                risk_high_threshold FLOAT NOT NULL DEFAULT 70.0,
-                risk_medium_threshold FLOAT NOT NULL DEFAULT 40.0,
-                allocation_low_risk FLOAT NOT NULL DEFAULT 0.8,
-                allocation_medium_risk FLOAT NOT NULL DEFAULT 0.5,
-                allocation_high_risk FLOAT NOT NULL DEFAULT 0.3,
-                allocation_neutral FLOAT NOT NULL DEFAULT 0.2,
-                sell_percentage FLOAT NOT NULL DEFAULT 0.7,
-                momentum_weight FLOAT NOT NULL DEFAULT 0.6,
-                price_momentum_weight FLOAT NOT NULL DEFAULT 0.4,
-                max_drawdown_tolerance FLOAT NOT NULL DEFAULT 15.0,
-                min_sharpe_target FLOAT NOT NULL DEFAULT 1.0,
-                rsi_oversold_threshold FLOAT NOT NULL DEFAULT 30.0,
-                rsi_overbought_threshold FLOAT NOT NULL DEFAULT 70.0,
-                bollinger_std_multiplier FLOAT NOT NULL DEFAULT 2.0,
-                mean_reversion_allocation FLOAT NOT NULL DEFAULT 0.4,
-                volatility_adjustment_factor FLOAT NOT NULL DEFAULT 0.4,
-                base_volatility FLOAT NOT NULL DEFAULT 0.01,
-                min_confidence_threshold FLOAT NOT NULL DEFAULT 0.3,
-                confidence_scaling_factor FLOAT NOT NULL DEFAULT 0.5,
-                intramonth_drawdown_limit FLOAT NOT NULL DEFAULT 0.10,
-                circuit_breaker_reduction FLOAT NOT NULL DEFAULT 0.5,
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                created_by VARCHAR(100),
-                notes VARCHAR(500)
-            );
-        """)
-
-        conn.commit()
-        print("  ✓ Created all test tables")
-    finally:
-        cursor.close()
-        conn.close()
+        try:
+            print("Creating test tables...")
+            cursor.execute(CREATE_TEST_TABLES_SQL)
+
+            conn.commit()
+            print("  ✓ Created all test tables")
+        finally:
+            cursor.close()
 
 
 def seed_minimal_test_data():
     """Insert minimal test data for basic tests"""
-    conn = psycopg2.connect(settings.database_url)
-    cursor = conn.cursor()
+    with pooled_connection(settings.database_url) as conn:
+        cursor = conn.cursor()
 
-    try:
-        print("Seeding minimal test data...")
-
-        # Insert test config
-        cursor.execute("""
-            INSERT INTO test_trading_config (
-                start_date, assets, created_by, notes
-            ) VALUES (
-                '2020-01-01', '["SPY", "QQQ", "DIA"]'::jsonb,
-                'test_setup', 'Minimal test configuration'
-            );
-        """)
-
-        conn.commit()
-        print("  ✓ Seeded test data")
-    finally:
-        cursor.close()
-        conn.close()
+        try:
+            print("Seeding minimal test data...")
+
+            cursor.execute(SEED_TEST_CONFIG_SQL)
+
+            conn.commit()
+            print("  ✓ Seeded test data")
+        finally:
+            cursor.close()
 
 
 def main():
@@ -208,9 +155,12 @@ def main():
     print("=" * 60)
     print()
 
-    drop_test_tables()
-    create_test_tables()
-    seed_minimal_test_data()
+    try:
+        drop_test_tables()
+        create_test_tables()
+        seed_minimal_test_data()
+    finally:
+        close_all_pools()
 
     print()
     print("✓ Test database ready!")
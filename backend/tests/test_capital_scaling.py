@@ -155,6 +155,34 @@ class TestCapitalScalingImpact:
         print(f"  Large capital ($500k): Position ${large_position:,.0f}, Risk ${large_risk:,.0f}")
         print(f"  Risk ratio: {risk_ratio:.1f}x (vs 100x without scaling)")
 
+    def test_explicit_tiers(self):
+        """Caller-supplied tiers override the active constraints"""
+        from scripts.generate_signal import CapitalScaleTiers, capital_scaling_adjustment
+        from constraints_loader import StrategyConstraints
+
+        tiers = CapitalScaleTiers.from_constraints(StrategyConstraints(
+            capital_scale_tier1_threshold=1_000.0,
+            capital_scale_tier2_threshold=2_000.0,
+        ))
+
+        assert tiers.tier1_threshold == 1_000.0
+        assert tiers.max_reduction == 0.35
+        assert capital_scaling_adjustment(1_500, tiers) == pytest.approx(0.875)
+        assert capital_scaling_adjustment(1_500) == 1.0
+
+    def test_batch_matches_scalar(self):
+        """The searchsorted batch version agrees with the scalar tiers, including breakpoints"""
+        from scripts.generate_signal import capital_scaling_adjustment, capital_scaling_adjustment_batch
+        import numpy as np
+
+        capitals = np.array([0, 9_999, 10_000, 30_000, 50_000, 125_000, 200_000, 500_000, 10_000_000],
+                            dtype=np.float64)
+
+        factors = capital_scaling_adjustment_batch(capitals)
+
+        assert factors.shape == capitals.shape
+        assert factors.tolist() == [capital_scaling_adjustment(c) for c in capitals]
+
 
 class TestHalfKellyCalculation:
     """Test half Kelly calculation (note: requires mock data)"""
@@ -166,7 +194,8 @@ class TestHalfKellyCalculation:
         from datetime import date
 
         mock_db = MagicMock()
-        mock_db.query.return_value.filter.return_value.all.return_value = []
+        # (BUY count, wins, total win return, total loss return) over no rows
+        mock_db.query.return_value.filter.return_value.one.return_value = (0, 0, None, None)
 
         half_kelly = calculate_half_kelly(mock_db, date(2025, 1, 1))
         assert half_kelly == 0.5
@@ -174,29 +203,36 @@ class TestHalfKellyCalculation:
     def test_half_kelly_bounds(self):
         """Half Kelly should be clamped between 0.1 and 0.8"""
         from scripts.generate_signal import calculate_half_kelly
-        from unittest.mock import MagicMock, Mock
+        from unittest.mock import MagicMock
         from datetime import date
 
         # Mock high win rate scenario
         mock_db = MagicMock()
-        mock_signals = []
-
-        # Create 20 winning trades
-        for i in range(20):
-            signal = Mock()
-            signal.features_used = {
-                'action': 'BUY',
-                'confidence_score': 0.9  # High confidence = wins
-            }
-            mock_signals.append(signal)
 
-        mock_db.query.return_value.filter.return_value.all.return_value = mock_signals
+        # 20 winning BUY signals at 0.9 confidence, aggregated by the database
+        mock_db.query.return_value.filter.return_value.one.return_value = (20, 20, 18.0, 0.0)
 
         half_kelly = calculate_half_kelly(mock_db, date(2025, 1, 1))
 
         # Should be clamped to max 0.8
         assert 0.1 <= half_kelly <= 0.8
 
+    def test_half_kelly_from_aggregates(self):
+        """Half Kelly is computed from the four aggregates of one query"""
+        from scripts.generate_signal import calculate_half_kelly
+        from unittest.mock import MagicMock
+        from datetime import date
+
+        mock_db = MagicMock()
+        # 12 BUYs: 8 wins summing 6.0 confidence, 4 losses summing 2.0 shortfall
+        mock_db.query.return_value.filter.return_value.one.return_value = (12, 8, 6.0, 2.0)
+
+        half_kelly = calculate_half_kelly(mock_db, date(2025, 1, 1))
+
+        # win_rate 2/3, payoff (6/8) / (2/4) = 1.5 -> kelly 4/9
+        assert half_kelly == pytest.approx((2 / 3 * 1.5 - 1 / 3) / 1.5 * 0.5)
+        mock_db.query.return_value.filter.return_value.all.assert_not_called()
+
 
 class TestIntegratedCapitalScaling:
     """Integration tests for capital scaling in real scenarios"""
@@ -45,6 +45,12 @@ class TestSettings:
         assert settings.model_type == "momentum"
         assert settings.market_close_time == "16:30"
         assert settings.signal_generation_time == "06:00"
+        assert settings.debug is False
+        assert settings.db_pool_size == 10
+        assert settings.db_max_overflow == 20
+        assert settings.db_pool_recycle_seconds == 1800
+        assert settings.db_pool_pre_ping is False
+        assert settings.feature_workers == 1
 
     @patch.dict(os.environ, {
         "DATABASE_URL": "postgresql://custom:custom@db:5432/prod",
@@ -81,6 +87,18 @@ class TestSettings:
         # Should be the same instance
         assert settings1 is settings2
 
+    @patch('config.load_dotenv')
+    def test_load_environment_reads_dotenv_once(self, mock_load_dotenv):
+        """Test that .env is parsed once per process, not per caller"""
+        from config import load_environment
+        load_environment.cache_clear()
+
+        load_environment()
+        load_environment()
+
+        mock_load_dotenv.assert_called_once()
+        load_environment.cache_clear()
+
 
 class TestGetTradingConfig:
     """Test get_trading_config function"""
@@ -2,17 +2,35 @@
 Unit tests for config_loader.py
 Tests configuration loading and version management with mocked database
 """
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from datetime import date, timedelta
 import json
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 
 # Import the modules to test
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config_loader import TradingConfig, ConfigLoader, get_active_trading_config
+from config_loader import (
+    TradingConfig, ConfigLoader, AsyncConfigLoader,
+    get_active_trading_config, get_active_trading_config_async
+)
+
+
+def set_tuple_row(mock_cursor, row):
+    """Make a mock cursor return `row` (a dict) the way a plain tuple cursor would"""
+    mock_cursor.description = [(name,) for name in row]
+    mock_cursor.fetchone.return_value = tuple(row.values())
+
+
+def set_active_version(mock_cursor, row, lookups=1):
+    """Make a mock cursor answer `lookups` version-token queries, then return `row` for the full fetch"""
+    set_tuple_row(mock_cursor, row)
+    version = (row['id'], row.get('end_date'))
+    mock_cursor.fetchone.side_effect = [version, tuple(row.values())] + [version] * (lookups - 1)
 
 
 class TestTradingConfig:
@@ -75,6 +93,8 @@ class TestTradingConfig:
         assert result['lookback_days'] == 200
         assert result['regime_bullish_threshold'] == 0.35
         assert result['min_sharpe_target'] == 1.2
+        # Every field is present, in declaration order
+        assert list(result) == list(TradingConfig.__dataclass_fields__)
 
     def test_from_db_row(self):
         """Test creating config from database row"""
@@ -203,6 +223,91 @@ class TestTradingConfig:
         assert config.intramonth_drawdown_limit == 0.10
         assert config.circuit_breaker_reduction == 0.5
 
+    def test_from_db_row_converts_numeric_types(self):
+        """Test that NUMERIC/float column values are coerced to the declared field types"""
+        from decimal import Decimal
+
+        mock_row = {
+            'id': 4,
+            'daily_capital': Decimal('1000.00'),
+            'assets': ["SPY"],
+            'lookback_days': 252.0,
+            'regime_bullish_threshold': Decimal('0.3'),
+            'regime_bearish_threshold': -0.3,
+            'risk_high_threshold': 70.0,
+            'risk_medium_threshold': 40.0,
+            'allocation_low_risk': 0.8,
+            'allocation_medium_risk': 0.5,
+            'allocation_high_risk': 0.3,
+            'allocation_neutral': 0.2,
+            'sell_percentage': 0.7,
+            'momentum_weight': 0.6,
+            'price_momentum_weight': 0.4,
+            'max_drawdown_tolerance': 15.0,
+            'min_sharpe_target': 1.0,
+            'rsi_period': Decimal('14'),
+            'unknown_column': 'ignored'
+        }
+
+        config = TradingConfig.from_db_row(mock_row)
+
+        assert config.daily_capital == 1000.0 and type(config.daily_capital) is float
+        assert config.regime_bullish_threshold == 0.3 and type(config.regime_bullish_threshold) is float
+        assert config.lookback_days == 252 and type(config.lookback_days) is int
+        assert config.rsi_period == 14 and type(config.rsi_period) is int
+        assert config.id == 4
+
+    def test_from_db_tuple(self):
+        """Test creating config from a positional row and its column names"""
+        columns = ['id', 'start_date', 'end_date', 'daily_capital', 'assets', 'lookback_days',
+                   'regime_bullish_threshold', 'regime_bearish_threshold', 'risk_high_threshold',
+                   'risk_medium_threshold', 'allocation_low_risk', 'allocation_medium_risk',
+                   'allocation_high_risk', 'allocation_neutral', 'sell_percentage',
+                   'momentum_weight', 'price_momentum_weight', 'max_drawdown_tolerance',
+                   'min_sharpe_target', 'rsi_oversold_threshold', 'created_at']
+        row = (5, date(2025, 11, 1), None, 1000.0, ["SPY", "QQQ"], 252,
+               0.3, -0.3, 70.0, 40.0, 0.8, 0.5, 0.3, 0.2, 0.7, 0.6, 0.4, 15.0, 1.0,
+               None, '2025-11-01 00:00:00')
+
+        config = TradingConfig.from_db_tuple(columns, row)
+
+        assert config.id == 5
+        assert config.start_date == date(2025, 11, 1)
+        assert config.end_date is None
+        assert config.assets == ["SPY", "QQQ"]
+        assert config.min_sharpe_target == 1.0
+        # NULL column falls back to the dataclass default
+        assert config.rsi_oversold_threshold == 30.0
+        # Columns without a matching field (created_at) are ignored
+        assert not hasattr(config, 'created_at')
+
+    def test_from_db_row_reads_params_column(self):
+        """Test that parameters stored in the params JSONB column become fields"""
+        params = {
+            'daily_capital': 1000, 'lookback_days': 252.0,
+            'regime_bullish_threshold': 0.3, 'regime_bearish_threshold': -0.3,
+            'risk_high_threshold': 70.0, 'risk_medium_threshold': 40.0,
+            'allocation_low_risk': 0.8, 'allocation_medium_risk': 0.5,
+            'allocation_high_risk': 0.3, 'allocation_neutral': 0.2,
+            'sell_percentage': 0.7, 'momentum_weight': 0.6, 'price_momentum_weight': 0.4,
+            'max_drawdown_tolerance': 15.0, 'min_sharpe_target': 1.0,
+            'rsi_period': 21, 'retired_param': 1.0
+        }
+        row = {'id': 7, 'start_date': date(2025, 11, 1), 'end_date': None,
+               'assets': ["SPY"], 'created_by': 'tuning', 'notes': None, 'params': params}
+
+        config = TradingConfig.from_db_row(row)
+
+        assert config.id == 7
+        assert config.assets == ["SPY"]
+        assert config.daily_capital == 1000.0 and type(config.daily_capital) is float
+        assert config.lookback_days == 252 and type(config.lookback_days) is int
+        assert config.rsi_period == 21
+        # Keys without a matching field are ignored
+        assert not hasattr(config, 'retired_param')
+        # Parameters missing from params fall back to the dataclass defaults
+        assert config.bollinger_period == 20
+
     def test_create_config_with_enhanced_fields(self):
         """Test creating a config with enhanced fields"""
         config = TradingConfig(
@@ -272,11 +377,42 @@ class TestTradingConfig:
         assert '2025-11-01' in json_str
         assert '2025-11-30' in json_str
 
+    def test_config_is_immutable(self):
+        """Test that configs are frozen so cached instances can be shared safely"""
+        from dataclasses import FrozenInstanceError, replace
+
+        config = TradingConfig(
+            daily_capital=1000.0,
+            assets=["SPY"],
+            lookback_days=252,
+            regime_bullish_threshold=0.3,
+            regime_bearish_threshold=-0.3,
+            risk_high_threshold=70.0,
+            risk_medium_threshold=40.0,
+            allocation_low_risk=0.8,
+            allocation_medium_risk=0.5,
+            allocation_high_risk=0.3,
+            allocation_neutral=0.2,
+            sell_percentage=0.7,
+            momentum_weight=0.6,
+            price_momentum_weight=0.4,
+            max_drawdown_tolerance=15.0,
+            min_sharpe_target=1.0
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            config.daily_capital = 2000.0
+
+        updated = replace(config, daily_capital=2000.0)
+        assert updated.daily_capital == 2000.0
+        assert config.daily_capital == 1000.0
+        assert not hasattr(config, '__dict__')
+
 
 class TestConfigLoader:
     """Test ConfigLoader database operations"""
 
-    @patch('config_loader.psycopg2.connect')
+    @patch('psycopg2.connect')
     def test_get_active_config_success(self, mock_connect):
         """Test loading active configuration from database"""
         # Setup mock
@@ -285,13 +421,99 @@ class TestConfigLoader:
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        # Mock database return
-        mock_cursor.fetchone.return_value = {
+        # Mock database return: parameters arrive in the params JSONB column
+        set_active_version(mock_cursor, {
             'id': 1,
             'start_date': date(2025, 11, 1),
             'end_date': None,
-            'daily_capital': 1000.0,
             'assets': ["SPY", "QQQ", "DIA"],
+            'created_by': 'migration',
+            'notes': None,
+            'params': {
+                'daily_capital': 1000.0,
+                'lookback_days': 252,
+                'regime_bullish_threshold': 0.3,
+                'regime_bearish_threshold': -0.3,
+                'risk_high_threshold': 70.0,
+                'risk_medium_threshold': 40.0,
+                'allocation_low_risk': 0.8,
+                'allocation_medium_risk': 0.5,
+                'allocation_high_risk': 0.3,
+                'allocation_neutral': 0.2,
+                'sell_percentage': 0.7,
+                'momentum_weight': 0.6,
+                'price_momentum_weight': 0.4,
+                'max_drawdown_tolerance': 15.0,
+                'min_sharpe_target': 1.0
+            }
+        })
+
+        loader = ConfigLoader("postgresql://test")
+        config = loader.get_active_config()
+
+        # Verify
+        assert config.id == 1
+        assert config.daily_capital == 1000.0
+        assert config.assets == ["SPY", "QQQ", "DIA"]
+
+        # The version token is looked up first, then the full row by id
+        calls = mock_cursor.execute.call_args_list
+        assert len(calls) == 4  # PREPARE + EXECUTE for each statement
+        version_sql = calls[0][0][0]
+        assert version_sql.startswith('PREPARE cfg_active(date)')
+        assert 'SELECT id, end_date FROM trading_config' in version_sql
+        assert 'WHERE start_date <=' in version_sql
+        assert calls[1][0][0] == 'EXECUTE cfg_active(%s)'
+        # Only the columns the dataclass reads are projected, never SELECT *
+        row_sql = calls[2][0][0]
+        assert row_sql.startswith('PREPARE cfg_by_id(integer)')
+        assert 'SELECT *' not in row_sql
+        assert 'SELECT id, start_date, end_date, assets, created_by, notes, params' in row_sql
+        assert calls[3] == ((('EXECUTE cfg_by_id(%s)', (1,))),)
+
+    @patch('psycopg2.connect')
+    def test_get_active_config_reuses_parsed_version(self, mock_connect):
+        """Test that a known version token skips fetching the full row"""
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        set_active_version(mock_cursor, {
+            'id': 1, 'start_date': date(2025, 11, 1), 'end_date': None,
+            'assets': ["SPY"], 'created_by': 'test', 'notes': None,
+            'params': {
+                'daily_capital': 1000.0, 'lookback_days': 252,
+                'regime_bullish_threshold': 0.3, 'regime_bearish_threshold': -0.3,
+                'risk_high_threshold': 70.0, 'risk_medium_threshold': 40.0,
+                'allocation_low_risk': 0.8, 'allocation_medium_risk': 0.5,
+                'allocation_high_risk': 0.3, 'allocation_neutral': 0.2,
+                'sell_percentage': 0.7, 'momentum_weight': 0.6, 'price_momentum_weight': 0.4,
+                'max_drawdown_tolerance': 15.0, 'min_sharpe_target': 1.0
+            }
+        }, lookups=2)
+
+        loader = ConfigLoader("postgresql://test")
+        first = loader.get_active_config(date(2025, 11, 3))
+        second = loader.get_active_config(date(2025, 11, 4))
+
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert first is second
+        assert statements.count('EXECUTE cfg_active(%s)') == 2
+        assert statements.count('EXECUTE cfg_by_id(%s)') == 1
+
+    @patch('psycopg2.connect')
+    def test_get_active_config_prepares_once_per_connection(self, mock_connect):
+        """Test that a pooled connection only PREPAREs the statement once"""
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        set_active_version(mock_cursor, {
+            'id': 1,
+            'daily_capital': 1000.0,
+            'assets': ["SPY"],
             'lookback_days': 252,
             'regime_bullish_threshold': 0.3,
             'regime_bearish_threshold': -0.3,
@@ -305,26 +527,18 @@ class TestConfigLoader:
             'momentum_weight': 0.6,
             'price_momentum_weight': 0.4,
             'max_drawdown_tolerance': 15.0,
-            'min_sharpe_target': 1.0,
-            'created_by': 'migration',
-            'notes': None
-        }
+            'min_sharpe_target': 1.0
+        }, lookups=2)
 
         loader = ConfigLoader("postgresql://test")
-        config = loader.get_active_config()
+        loader.get_active_config(date(2025, 11, 3))
+        loader.get_active_config(date(2025, 11, 4))
 
-        # Verify
-        assert config.id == 1
-        assert config.daily_capital == 1000.0
-        assert config.assets == ["SPY", "QQQ", "DIA"]
-
-        # Check query was called correctly
-        mock_cursor.execute.assert_called_once()
-        call_args = mock_cursor.execute.call_args[0]
-        assert 'SELECT * FROM trading_config' in call_args[0]
-        assert 'WHERE start_date <=' in call_args[0]
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert sum(1 for sql in statements if sql.startswith('PREPARE cfg_active')) == 1
+        assert statements.count('EXECUTE cfg_active(%s)') == 2
 
-    @patch('config_loader.psycopg2.connect')
+    @patch('psycopg2.connect')
     def test_get_active_config_no_result(self, mock_connect):
         """Test loading config when no active config exists"""
         mock_cursor = MagicMock()
@@ -340,7 +554,7 @@ class TestConfigLoader:
 
         assert "No active trading configuration found" in str(exc_info.value)
 
-    @patch('config_loader.psycopg2.connect')
+    @patch('psycopg2.connect')
     def test_get_active_config_for_specific_date(self, mock_connect):
         """Test loading config for a specific historical date"""
         mock_cursor = MagicMock()
@@ -348,7 +562,7 @@ class TestConfigLoader:
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        mock_cursor.fetchone.return_value = {
+        set_active_version(mock_cursor, {
             'id': 2,
             'start_date': date(2025, 10, 1),
             'end_date': date(2025, 10, 31),
@@ -370,7 +584,7 @@ class TestConfigLoader:
             'min_sharpe_target': 1.0,
             'created_by': 'test',
             'notes': None
-        }
+        })
 
         loader = ConfigLoader("postgresql://test")
         config = loader.get_active_config(date(2025, 10, 15))
@@ -379,11 +593,10 @@ class TestConfigLoader:
         assert config.daily_capital == 900.0
         assert config.assets == ["SPY", "QQQ"]
 
-        # Verify date was passed to query
-        call_args = mock_cursor.execute.call_args[0]
-        assert date(2025, 10, 15) in call_args[1]
+        # Verify date was passed to the version query
+        assert mock_cursor.execute.call_args_list[1][0] == ('EXECUTE cfg_active(%s)', (date(2025, 10, 15),))
 
-    @patch('config_loader.psycopg2.connect')
+    @patch('psycopg2.connect')
     def test_create_new_version_basic(self, mock_connect):
         """Test creating a new config version"""
         mock_cursor = MagicMock()
@@ -392,7 +605,7 @@ class TestConfigLoader:
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock returning new ID
-        mock_cursor.fetchone.return_value = {'id': 3}
+        mock_cursor.fetchone.return_value = (3,)
 
         new_config = TradingConfig(
             daily_capital=1100.0,
@@ -423,20 +636,22 @@ class TestConfigLoader:
 
         assert new_id == 3
 
-        # Verify UPDATE was called to close previous config
+        # Verify close-previous UPDATE and INSERT went out as one statement
         calls = mock_cursor.execute.call_args_list
-        assert len(calls) == 2  # UPDATE + INSERT
+        assert len(calls) == 1  # UPDATE (as CTE) + INSERT
 
-        # First call: UPDATE to close previous
-        update_call = calls[0][0]
-        assert 'UPDATE trading_config' in update_call[0]
-        assert 'SET end_date' in update_call[0]
+        sql, params = calls[0][0]
+        assert 'WITH closed AS' in sql
+        assert 'UPDATE trading_config' in sql
+        assert 'SET end_date' in sql
+        assert 'INSERT INTO trading_config' in sql
+        assert sql.index('UPDATE trading_config') < sql.index('INSERT INTO trading_config')
 
-        # Second call: INSERT new config
-        insert_call = calls[1][0]
-        assert 'INSERT INTO trading_config' in insert_call[0]
+        # First parameter closes the previous config the day before the new start
+        assert params[0] == date(2025, 11, 30)
+        assert params[1] == date(2025, 12, 1)
 
-    @patch('config_loader.psycopg2.connect')
+    @patch('psycopg2.connect')
     def test_create_new_version_assets_json_conversion(self, mock_connect):
         """Test that assets list is wrapped in Json() for JSONB column"""
         from psycopg2.extras import Json as PsycopgJson
@@ -445,7 +660,7 @@ class TestConfigLoader:
         mock_conn = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = {'id': 5}
+        mock_cursor.fetchone.return_value = (5,)
 
         new_config = TradingConfig(
             daily_capital=1000.0,
@@ -486,14 +701,22 @@ class TestConfigLoader:
         # Verify the underlying value
         assert assets_param.adapted == ["SPY", "QQQ", "DIA"]
 
-    @patch('config_loader.psycopg2.connect')
+        # Every other parameter goes into the params JSONB column by name
+        params_param = insert_params[3]
+        assert isinstance(params_param, PsycopgJson)
+        assert params_param.adapted['daily_capital'] == 1000.0
+        assert params_param.adapted['rsi_period'] == 14
+        assert 'assets' not in params_param.adapted
+        assert 'start_date' not in params_param.adapted
+
+    @patch('psycopg2.connect')
     def test_create_new_version_without_closing_previous(self, mock_connect):
         """Test creating new version without closing previous"""
         mock_cursor = MagicMock()
         mock_conn = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = {'id': 4}
+        mock_cursor.fetchone.return_value = (4,)
 
         new_config = TradingConfig(
             daily_capital=1000.0,
@@ -527,8 +750,9 @@ class TestConfigLoader:
         calls = mock_cursor.execute.call_args_list
         assert len(calls) == 1  # Only INSERT
         assert 'INSERT INTO trading_config' in calls[0][0][0]
+        assert 'UPDATE trading_config' not in calls[0][0][0]
 
-    @patch('config_loader.psycopg2.connect')
+    @patch('psycopg2.connect')
     def test_create_new_version_rollback_on_error(self, mock_connect):
         """Test that transaction is rolled back on error"""
         mock_cursor = MagicMock()
@@ -536,8 +760,10 @@ class TestConfigLoader:
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        # Make INSERT raise an error
-        mock_cursor.execute.side_effect = [None, Exception("DB Error")]
+        # Make the UPDATE + INSERT statement raise an error
+        mock_cursor.execute.side_effect = Exception("DB Error")
+        # After our rollback the connection is idle, so the pool won't roll back again
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
 
         new_config = TradingConfig(
             daily_capital=1000.0,
@@ -567,6 +793,105 @@ class TestConfigLoader:
         mock_conn.rollback.assert_called_once()
 
 
+class TestAsyncConfigLoader:
+    """Test the asyncpg-backed loader"""
+
+    def _mock_pool(self, row):
+        pool = MagicMock()
+        pool.fetchrow = AsyncMock(return_value=row)
+        pool.close = AsyncMock()
+        return pool
+
+    @patch('config_loader.asyncpg.create_pool', new_callable=AsyncMock)
+    def test_get_active_config(self, mock_create_pool):
+        """Test that the async loader maps the row and reuses its pool"""
+        pool = self._mock_pool({
+            'id': 3,
+            'end_date': None,
+            'daily_capital': 1000,
+            'assets': ["SPY", "QQQ"],
+            'lookback_days': 252,
+            'regime_bullish_threshold': 0.3,
+            'regime_bearish_threshold': -0.3,
+            'risk_high_threshold': 70.0,
+            'risk_medium_threshold': 40.0,
+            'allocation_low_risk': 0.8,
+            'allocation_medium_risk': 0.5,
+            'allocation_high_risk': 0.3,
+            'allocation_neutral': 0.2,
+            'sell_percentage': 0.7,
+            'momentum_weight': 0.6,
+            'price_momentum_weight': 0.4,
+            'max_drawdown_tolerance': 15.0,
+            'min_sharpe_target': 1.0
+        })
+        mock_create_pool.return_value = pool
+
+        async def run():
+            loader = AsyncConfigLoader("postgresql://test")
+            first = await loader.get_active_config(date(2025, 11, 3))
+            second = await loader.get_active_config(date(2025, 11, 4))
+            await loader.close()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first.id == 3
+        assert first.daily_capital == 1000.0
+        assert isinstance(first.daily_capital, float)
+        assert first.assets == ["SPY", "QQQ"]
+        assert second is first
+        mock_create_pool.assert_awaited_once()
+        # Version lookups for both dates; the full row is fetched once, by id
+        queries = [call[0] for call in pool.fetchrow.await_args_list]
+        assert len(queries) == 3
+        sql, as_of = queries[0]
+        assert 'SELECT id, end_date FROM trading_config' in sql
+        assert as_of == date(2025, 11, 3)
+        assert queries[1][1] == 3
+        assert queries[2][1] == date(2025, 11, 4)
+        pool.close.assert_awaited_once()
+
+    @patch('config_loader.asyncpg.create_pool', new_callable=AsyncMock)
+    def test_get_active_config_no_result(self, mock_create_pool):
+        """Test that a missing config raises ValueError"""
+        mock_create_pool.return_value = self._mock_pool(None)
+
+        loader = AsyncConfigLoader("postgresql://test")
+
+        with pytest.raises(ValueError, match="No active trading configuration found"):
+            asyncio.run(loader.get_active_config(date(2025, 11, 3)))
+
+    @patch('config_loader.get_async_config_loader')
+    def test_convenience_function_caches_per_date(self, mock_get_loader):
+        """Test that the async convenience function shares the per-date cache"""
+        mock_loader = MagicMock()
+        mock_loader.get_active_config = AsyncMock(side_effect=lambda d: f"config for {d}")
+        mock_get_loader.return_value = mock_loader
+
+        first = asyncio.run(get_active_trading_config_async(date(2025, 11, 3)))
+        second = asyncio.run(get_active_trading_config_async(date(2025, 11, 3)))
+
+        assert first is second
+        assert mock_loader.get_active_config.await_count == 1
+
+
+class TestGetConfigLoader:
+    """Test the shared loader instance"""
+
+    @patch('config_loader._config_loader', None)
+    def test_returns_same_instance(self):
+        """Test that the loader is created once and then reused"""
+        from config_loader import get_config_loader
+
+        with patch('config_loader.ConfigLoader') as mock_cls:
+            first = get_config_loader()
+            second = get_config_loader()
+
+        assert first is second
+        mock_cls.assert_called_once_with()
+
+
 class TestGetActiveTradingConfig:
     """Test the convenience function"""
 
@@ -601,6 +926,77 @@ class TestGetActiveTradingConfig:
         mock_loader.get_active_config.assert_called_once_with(None)
         assert config.daily_capital == 1000.0
 
+    @patch('config_loader.get_config_loader')
+    def test_convenience_function_caches_per_date(self, mock_get_loader):
+        """Test that repeated lookups for the same date skip the database"""
+        mock_loader = MagicMock()
+        mock_get_loader.return_value = mock_loader
+        mock_loader.get_active_config.side_effect = lambda d: f"config for {d}"
+
+        first = get_active_trading_config(date(2025, 11, 3))
+        second = get_active_trading_config(date(2025, 11, 3))
+        other = get_active_trading_config(date(2025, 11, 4))
+
+        assert first is second
+        assert other == "config for 2025-11-04"
+        assert mock_loader.get_active_config.call_count == 2
+
+    @patch('config_loader.get_config_loader')
+    def test_convenience_function_defers_overlapping_windows_to_loader(self, mock_get_loader, mock_trading_config):
+        """Test that an open-ended cached config doesn't answer dates a later version starts on"""
+        from dataclasses import replace
+
+        mock_loader = MagicMock()
+        mock_get_loader.return_value = mock_loader
+        older = replace(mock_trading_config, start_date=date(2025, 11, 1), end_date=None)
+        newer = replace(mock_trading_config, id=2, start_date=date(2025, 12, 1), end_date=None)
+        mock_loader.get_active_config.side_effect = [older, newer]
+
+        assert get_active_trading_config(date(2025, 11, 3)) is older
+        # The database settles overlapping windows by latest start_date
+        assert get_active_trading_config(date(2025, 12, 15)) is newer
+        assert mock_loader.get_active_config.call_count == 2
+
+    @patch('psycopg2.connect')
+    @patch('config_loader.get_config_loader')
+    def test_cache_invalidated_by_new_version(self, mock_get_loader, mock_connect):
+        """Test that writing a new config version drops cached configs"""
+        from config_loader import _config_cache
+
+        mock_get_loader.return_value = MagicMock()
+        get_active_trading_config(date(2025, 11, 3))
+        assert len(_config_cache) == 1
+
+        mock_conn = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchone.return_value = (7,)
+
+        new_config = TradingConfig(
+            daily_capital=1000.0,
+            assets=["SPY"],
+            lookback_days=252,
+            regime_bullish_threshold=0.3,
+            regime_bearish_threshold=-0.3,
+            risk_high_threshold=70.0,
+            risk_medium_threshold=40.0,
+            allocation_low_risk=0.8,
+            allocation_medium_risk=0.5,
+            allocation_high_risk=0.3,
+            allocation_neutral=0.2,
+            sell_percentage=0.7,
+            momentum_weight=0.6,
+            price_momentum_weight=0.4,
+            max_drawdown_tolerance=15.0,
+            min_sharpe_target=1.0
+        )
+        ConfigLoader("postgresql://test").create_new_version(
+            new_config,
+            start_date=date(2025, 12, 1),
+            close_previous=False
+        )
+
+        assert len(_config_cache) == 0
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
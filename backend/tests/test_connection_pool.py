@@ -0,0 +1,101 @@
+"""
+Unit tests for connection_pool.py
+Tests shared pool creation and connection borrowing with mocked psycopg2
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_pool import get_pool, pooled_connection, prepare_once, close_all_pools
+
+
+class TestGetPool:
+    """Test pool creation and reuse"""
+
+    @patch('psycopg2.connect')
+    def test_same_url_reuses_pool(self, mock_connect):
+        """Test that the pool is created once per database URL"""
+        mock_connect.return_value = MagicMock()
+
+        first = get_pool("postgresql://test/a")
+        second = get_pool("postgresql://test/a")
+
+        assert first is second
+        # minconn connections are opened eagerly, only once
+        assert mock_connect.call_count == 1
+
+    @patch('psycopg2.connect')
+    def test_different_urls_get_separate_pools(self, mock_connect):
+        """Test that each database URL has its own pool"""
+        mock_connect.return_value = MagicMock()
+
+        assert get_pool("postgresql://test/a") is not get_pool("postgresql://test/b")
+
+    @patch('psycopg2.connect')
+    def test_close_all_pools_forgets_pools(self, mock_connect):
+        """Test that closing pools forces a fresh pool on next use"""
+        mock_connect.return_value = MagicMock()
+
+        first = get_pool("postgresql://test/a")
+        close_all_pools()
+
+        assert get_pool("postgresql://test/a") is not first
+
+
+class TestPooledConnection:
+    """Test borrowing connections"""
+
+    @patch('psycopg2.connect')
+    def test_connection_reused_across_borrows(self, mock_connect):
+        """Test that a returned connection is handed out again without reconnecting"""
+        mock_conn = MagicMock()
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        mock_connect.return_value = mock_conn
+
+        with pooled_connection("postgresql://test") as conn:
+            assert conn is mock_conn
+        with pooled_connection("postgresql://test") as conn:
+            assert conn is mock_conn
+
+        assert mock_connect.call_count == 1
+        mock_conn.close.assert_not_called()
+
+    @patch('psycopg2.connect')
+    def test_connection_returned_on_error(self, mock_connect):
+        """Test that the connection goes back to the pool when the body raises"""
+        mock_conn = MagicMock()
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        mock_connect.return_value = mock_conn
+
+        with pytest.raises(RuntimeError):
+            with pooled_connection("postgresql://test"):
+                raise RuntimeError("query failed")
+
+        with pooled_connection("postgresql://test") as conn:
+            assert conn is mock_conn
+        assert mock_connect.call_count == 1
+
+
+class TestPrepareOnce:
+    """Test server-side statement preparation"""
+
+    def test_statement_without_parameters(self):
+        """Test that a parameterless statement is prepared without a type list"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        prepare_once(mock_conn, "cash_balance", "", "SELECT 1")
+        prepare_once(mock_conn, "cash_balance", "", "SELECT 1")
+
+        mock_cursor.execute.assert_called_once_with("PREPARE cash_balance AS SELECT 1")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
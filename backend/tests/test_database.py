@@ -112,6 +112,41 @@ class TestGetDb:
         mock_session.close.assert_called_once()
 
 
+class TestAsyncDatabase:
+    """Test the asyncpg engine URL and get_async_db dependency"""
+
+    @patch('database.settings')
+    def test_async_url_uses_asyncpg_and_ssl(self, mock_settings):
+        """Test that the URL switches driver and renames sslmode to asyncpg's ssl"""
+        mock_settings.database_url = "postgresql://user:pw@db.example.com:5432/app?sslmode=require"
+
+        from database import get_async_database_url
+
+        url = get_async_database_url()
+
+        assert url.drivername == "postgresql+asyncpg"
+        assert url.host == "db.example.com"
+        assert dict(url.query) == {"ssl": "require"}
+
+    @patch('database.AsyncSessionLocal')
+    def test_get_async_db_yields_and_closes_session(self, mock_session_local):
+        """Test that get_async_db yields the session and exits its context"""
+        import asyncio
+        from database import get_async_db
+
+        session = MagicMock()
+        mock_session_local.return_value.__aenter__.return_value = session
+
+        async def use_dependency():
+            gen = get_async_db()
+            yielded = await gen.__anext__()
+            await gen.aclose()
+            return yielded
+
+        assert asyncio.run(use_dependency()) is session
+        mock_session_local.return_value.__aexit__.assert_awaited_once()
+
+
 class TestInitDb:
     """Test init_db function"""
 
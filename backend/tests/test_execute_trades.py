@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 from datetime import date, datetime, timezone, timedelta
 from decimal import Decimal
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 import os
 import sys
 
@@ -15,7 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class TestTradeExecutorInit:
     """Test TradeExecutor initialization"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_executor_init(self, mock_get_settings, mock_connect):
         """Test TradeExecutor initialization"""
@@ -36,7 +37,7 @@ class TestTradeExecutorInit:
         assert executor.conn is mock_conn
         assert executor.cursor is mock_cursor
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_executor_close(self, mock_get_settings, mock_connect):
         """Test TradeExecutor close method"""
@@ -55,13 +56,50 @@ class TestTradeExecutorInit:
         executor.close()
 
         mock_cursor.close.assert_called_once()
-        mock_conn.close.assert_called_once()
+        # Connection goes back to the pool rather than being closed
+        mock_conn.close.assert_not_called()
+
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_executors_reuse_pooled_connection(self, mock_get_settings, mock_connect):
+        """Test that a second executor reuses the connection returned by the first"""
+        mock_conn = MagicMock()
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        mock_connect.return_value = mock_conn
+
+        from execute_trades import TradeExecutor
+
+        first = TradeExecutor()
+        first.close()
+        second = TradeExecutor()
+        second.close()
+
+        assert second.conn is first.conn
+        mock_connect.assert_called_once()
+
+
+class TestFloatAsDecimal:
+    """Test the FLOAT8 -> Decimal typecaster used by the executor's cursor"""
+
+    def test_parses_wire_text_exactly(self):
+        """Test that values keep their database text representation"""
+        from execute_trades import FLOAT_AS_DECIMAL
+
+        assert FLOAT_AS_DECIMAL('580.1', None) == Decimal('580.1')
+        assert str(FLOAT_AS_DECIMAL('0.0001', None)) == '0.0001'
+
+    def test_null_stays_none(self):
+        """Test that NULL is returned as None"""
+        from execute_trades import FLOAT_AS_DECIMAL
+
+        assert FLOAT_AS_DECIMAL(None, None) is None
 
 
 class TestGetLatestSignal:
     """Test get_latest_signal method"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_get_latest_signal_success(self, mock_get_settings, mock_connect):
         """Test getting latest signal successfully"""
@@ -93,7 +131,7 @@ class TestGetLatestSignal:
         assert signal['allocations']['SPY'] == 400.0
         assert signal['features_used']['action'] == 'BUY'
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_get_latest_signal_no_signals(self, mock_get_settings, mock_connect):
         """Test getting latest signal when none exist"""
@@ -117,58 +155,129 @@ class TestGetLatestSignal:
         assert "No signals found" in str(exc_info.value)
 
 
-class TestGetOpeningPrice:
-    """Test get_opening_price method"""
+class TestGetPortfolioSnapshot:
+    """Test positions valued with P&L totals in one query"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_get_opening_price_success(self, mock_get_settings, mock_connect):
-        """Test getting opening price successfully"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
+    def test_snapshot_uses_db_totals(self, mock_get_settings, mock_connect):
+        """Test that positions and totals come from a single LATERAL query"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'symbol': 'SPY', 'quantity': Decimal('2'), 'avg_cost': Decimal('500'),
+             'cost': Decimal('1000'), 'value': Decimal('1100'),
+             'total_cost': Decimal('1400'), 'total_value': Decimal('1540')},
+            {'symbol': 'QQQ', 'quantity': Decimal('1'), 'avg_cost': Decimal('400'),
+             'cost': Decimal('400'), 'value': Decimal('440'),
+             'total_cost': Decimal('1400'), 'total_value': Decimal('1540')},
+        ]
+
+        from execute_trades import TradeExecutor
 
+        executor = TradeExecutor()
+        positions, pnl = executor.get_portfolio_snapshot()
+
+        mock_cursor.execute.assert_called_once()
+        sql = mock_cursor.execute.call_args[0][0]
+        assert 'LATERAL' in sql
+        assert 'DISTINCT ON' not in sql
+        assert positions['SPY']['value'] == Decimal('1100')
+        assert pnl['total_cost'] == Decimal('1400')
+        assert pnl['pnl'] == Decimal('140')
+        assert pnl['pnl_pct'] == Decimal('10')
+
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_snapshot_empty_portfolio(self, mock_get_settings, mock_connect):
+        """Test that an empty portfolio has zero totals"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = {'open_price': 580.50}
+        mock_cursor.fetchall.return_value = []
 
         from execute_trades import TradeExecutor
 
         executor = TradeExecutor()
-        price = executor.get_opening_price('SPY', '2025-11-15')
+        positions, pnl = executor.get_portfolio_snapshot()
 
-        assert price == Decimal('580.50')
+        assert positions == {}
+        assert pnl['pnl'] == Decimal(0)
+        assert pnl['pnl_pct'] == Decimal(0)
 
-    @patch('execute_trades.psycopg2.connect')
+
+class TestGetOpeningPrices:
+    """Test bulk opening price lookup"""
+
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_get_opening_price_not_found(self, mock_get_settings, mock_connect):
-        """Test getting opening price when not found"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
+    def test_get_opening_prices_single_query(self, mock_get_settings, mock_connect):
+        """Test that all symbols are priced with one ANY(...) query"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'symbol': 'SPY', 'open_price': Decimal('580.5')},
+            {'symbol': 'QQQ', 'open_price': Decimal('490.25')},
+        ]
+
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        prices = executor.get_opening_prices(['SPY', 'QQQ'], '2025-11-15')
 
+        assert prices == {'SPY': Decimal('580.5'), 'QQQ': Decimal('490.25')}
+        # PREPARE once, then EXECUTE the named plan with the whole symbol list
+        prepare_call, execute_call = mock_cursor.execute.call_args_list
+        assert prepare_call[0][0].startswith('PREPARE trade_opening_prices(text[], date)')
+        assert 'ANY($1)' in prepare_call[0][0]
+        assert execute_call[0] == ('EXECUTE trade_opening_prices(%s, %s)', (['SPY', 'QQQ'], '2025-11-15'))
+
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_opening_prices_prepared_once_per_connection(self, mock_get_settings, mock_connect):
+        """Test that repeated lookups reuse the prepared plan"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None
+        mock_cursor.fetchall.return_value = [{'symbol': 'SPY', 'open_price': Decimal('580.5')}]
 
         from execute_trades import TradeExecutor
 
         executor = TradeExecutor()
+        executor.get_opening_prices(['SPY'], '2025-11-14')
+        executor.get_opening_prices(['SPY'], '2025-11-15')
 
-        with pytest.raises(Exception) as exc_info:
-            executor.get_opening_price('XYZ', '2025-11-15')
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert sum(sql.startswith('PREPARE') for sql in statements) == 1
+        assert sum(sql.startswith('EXECUTE') for sql in statements) == 2
 
-        assert "No opening price found" in str(exc_info.value)
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_get_opening_prices_missing_symbol(self, mock_get_settings, mock_connect):
+        """Test that a symbol without a price raises"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [{'symbol': 'SPY', 'open_price': Decimal('580.5')}]
+
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        with pytest.raises(Exception, match="No opening price found for QQQ"):
+            executor.get_opening_prices(['SPY', 'QQQ'], '2025-11-15')
 
 
 class TestGetCurrentPositions:
     """Test get_current_positions method"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_get_current_positions(self, mock_get_settings, mock_connect):
         """Test getting current positions"""
@@ -205,7 +314,7 @@ class TestGetCurrentPositions:
         assert positions['SPY']['quantity'] == Decimal('1.5')
         assert positions['QQQ']['avg_cost'] == Decimal('495.0')
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_get_current_positions_empty(self, mock_get_settings, mock_connect):
         """Test getting empty positions"""
@@ -227,72 +336,64 @@ class TestGetCurrentPositions:
         assert positions == {}
 
 
-class TestCalculatePortfolioPnL:
-    """Test calculate_portfolio_pnl method"""
+class TestMicros:
+    """Test integer micro-dollar helpers"""
 
-    @patch('execute_trades.psycopg2.connect')
-    @patch('execute_trades.get_settings')
-    def test_calculate_pnl_profit(self, mock_get_settings, mock_connect):
-        """Test P&L calculation with profit"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
-        mock_connect.return_value = MagicMock()
+    def test_round_trip(self):
+        """Test that amounts survive conversion to millionths and back"""
+        from execute_trades import to_micros, from_micros
 
-        from execute_trades import TradeExecutor
+        assert to_micros(Decimal('580.123456')) == 580_123_456
+        assert to_micros(0.1) == 100_000
+        assert from_micros(580_123_456) == Decimal('580.123456')
+        assert from_micros(-10_000_000) == Decimal('-10')
 
-        executor = TradeExecutor()
+    def test_div_round_half_up(self):
+        """Test rounded integer division for positive and negative numerators"""
+        from execute_trades import _div_round
 
-        positions = {
-            'SPY': {
-                'quantity': Decimal('1.0'),
-                'avg_cost': Decimal('580.0'),
-                'total_cost': Decimal('580.0')
-            }
-        }
-
-        current_prices = {'SPY': Decimal('590.0')}
+        assert _div_round(7, 2) == 4
+        assert _div_round(5, 3) == 2
+        assert _div_round(-7, 2) == -3
+        assert _div_round(-5, 3) == -2
 
-        pnl = executor.calculate_portfolio_pnl(positions, current_prices)
 
-        assert pnl['total_cost'] == Decimal('580.0')
-        assert pnl['total_value'] == Decimal('590.0')
-        assert pnl['pnl'] == Decimal('10.0')
-        assert float(pnl['pnl_pct']) > 0
-
-    @patch('execute_trades.psycopg2.connect')
-    @patch('execute_trades.get_settings')
-    def test_calculate_pnl_loss(self, mock_get_settings, mock_connect):
-        """Test P&L calculation with loss"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
-        mock_connect.return_value = MagicMock()
+class TestReportFormatting:
+    """Test the single-write report blocks"""
 
-        from execute_trades import TradeExecutor
+    def test_format_trades(self):
+        """Test one line per trade, joined without a trailing newline"""
+        from execute_trades import format_trades
 
-        executor = TradeExecutor()
+        report = format_trades([
+            {'side': 'BUY', 'quantity': Decimal('0.6892'), 'symbol': 'SPY',
+             'price': Decimal('580.37'), 'total': Decimal('399.991004')},
+            {'side': 'SELL', 'quantity': Decimal('2'), 'symbol': 'QQQ',
+             'price': Decimal('400'), 'total': Decimal('1800')},
+        ])
 
-        positions = {
-            'SPY': {
-                'quantity': Decimal('1.0'),
-                'avg_cost': Decimal('580.0'),
-                'total_cost': Decimal('580.0')
-            }
-        }
+        assert report == (
+            "   ✅ BUY 0.6892 SPY @ $580.37 = $399.99\n"
+            "   ✅ SELL 2.0000 QQQ @ $400.00 = $1,800.00"
+        )
+        assert format_trades([]) == ""
 
-        current_prices = {'SPY': Decimal('570.0')}
+    def test_format_positions(self):
+        """Test that position lines include per-position P&L"""
+        from execute_trades import format_positions
 
-        pnl = executor.calculate_portfolio_pnl(positions, current_prices)
+        report = format_positions({
+            'SPY': {'quantity': Decimal('1.5'), 'avg_cost': Decimal('575'),
+                    'cost': Decimal('862.5'), 'value': Decimal('885')},
+        })
 
-        assert pnl['pnl'] == Decimal('-10.0')
-        assert float(pnl['pnl_pct']) < 0
+        assert report == "      SPY: 1.5000 shares @ $575.00 avg | Current: $885.00 | P&L: $22.50"
 
 
 class TestExecuteBuyTrades:
     """Test execute_buy_trades method"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_execute_buy_trades(self, mock_get_settings, mock_connect):
         """Test executing buy trades"""
@@ -320,9 +421,10 @@ class TestExecuteBuyTrades:
         assert len(trades) == 2
         assert trades[0]['side'] == 'BUY'
         mock_cursor.execute.assert_called()
-        mock_conn.commit.assert_called_once()
+        # run() owns the transaction
+        mock_conn.commit.assert_not_called()
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_execute_buy_trades_skip_zero_allocation(self, mock_get_settings, mock_connect):
         """Test that zero allocations are skipped"""
@@ -348,115 +450,277 @@ class TestExecuteBuyTrades:
         assert len(trades) == 0
 
 
-class TestUpdatePortfolio:
-    """Test update_portfolio method"""
+class TestEnsureCashExists:
+    """Test ensure_cash_exists method"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_update_portfolio_new_position(self, mock_get_settings, mock_connect):
-        """Test updating portfolio with new position"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
+    def test_single_idempotent_insert_per_transaction(self, mock_get_settings, mock_connect):
+        """Test that CASH is created with one ON CONFLICT insert and later calls skip the database"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
 
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        executor.ensure_cash_exists()
+        executor.ensure_cash_exists()
+        executor.add_cash(Decimal('100'))
+
+        inserts = [c for c in mock_cursor.execute.call_args_list if 'INSERT INTO portfolio' in c[0][0]]
+        assert len(inserts) == 1
+        assert 'ON CONFLICT (symbol) DO NOTHING' in inserts[0][0][0]
+        mock_cursor.fetchone.assert_not_called()
+
+
+class TestBatchedTradeWrites:
+    """Test that each action writes its trades and cash movement in one batch"""
+
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_buy_basket_single_insert_and_cash_update(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that buys use one multi-row INSERT and one CASH update"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None  # No existing position
+        mock_cursor.fetchall.return_value = [
+            {'symbol': 'SPY', 'open_price': Decimal('500.0')},
+            {'symbol': 'QQQ', 'open_price': Decimal('400.0')},
+        ]
+        mock_cursor.fetchone.return_value = {'quantity': Decimal('2000.0')}    # cash balance
 
         from execute_trades import TradeExecutor
 
         executor = TradeExecutor()
+        trades = executor.execute_buy_trades(
+            {'allocations': {'SPY': 500.0, 'QQQ': 400.0}}, 7, '2025-11-15'
+        )
+
+        assert [t['symbol'] for t in trades] == ['SPY', 'QQQ']
+        mock_execute_values.assert_called_once()
+        rows = mock_execute_values.call_args[0][2]
+        assert [(r[0], r[3], r[4], r[5]) for r in rows] == [
+            (7, 'SPY', 'B', Decimal('1.0000')),
+            (7, 'QQQ', 'B', Decimal('1.0000')),
+        ]
 
-        trades = [{
-            'symbol': 'SPY',
-            'quantity': Decimal('0.69'),
-            'price': Decimal('580.0'),
-            'side': 'BUY',
-            'total': Decimal('400.2')
-        }]
+        cash_updates = [c for c in mock_cursor.execute.call_args_list if c[0][0].startswith('EXECUTE trade_adjust_cash')]
+        assert len(cash_updates) == 1
+        assert cash_updates[0][0][1][0] == Decimal('-900.0')
+        # run() owns the transaction
+        mock_conn.commit.assert_not_called()
 
-        executor.update_portfolio(trades)
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_buy_fractional_shares_rounded_to_four_places(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test fractional quantities and totals computed in integer micro-dollars"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [{'symbol': 'SPY', 'open_price': Decimal('580.37')}]
+        mock_cursor.fetchone.return_value = {'quantity': Decimal('1000.0')}    # cash balance
 
-        # Should insert new position
-        mock_cursor.execute.assert_called()
-        mock_conn.commit.assert_called_once()
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        trades = executor.execute_buy_trades({'allocations': {'SPY': 400.0}}, 7, '2025-11-15')
 
-    @patch('execute_trades.psycopg2.connect')
+        # 400 / 580.37 = 0.68921... -> 0.6892 shares costing 399.991004
+        assert trades[0]['quantity'] == Decimal('0.6892')
+        assert trades[0]['total'] == Decimal('399.991004')
+        assert trades[0]['price'] == Decimal('580.37')
+
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_update_portfolio_existing_position(self, mock_get_settings, mock_connect):
-        """Test updating existing portfolio position"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
+    def test_buy_basket_insufficient_cash_writes_nothing(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that the whole basket is rejected when cash can't cover it"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'symbol': 'SPY', 'open_price': Decimal('500.0')},
+            {'symbol': 'QQQ', 'open_price': Decimal('400.0')},
+        ]
+        mock_cursor.fetchone.return_value = {'quantity': Decimal('600.0')}
 
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        with pytest.raises(ValueError, match="Insufficient cash"):
+            executor.execute_buy_trades(
+                {'allocations': {'SPY': 500.0, 'QQQ': 400.0}}, 7, '2025-11-15'
+            )
+
+        mock_execute_values.assert_not_called()
+        mock_conn.commit.assert_not_called()
+
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_sell_records_negative_quantities(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that sells are batched with negative quantities and summed proceeds"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = {
-            'quantity': 1.0,
-            'avg_cost': 575.0
-        }
+        mock_cursor.fetchall.side_effect = [
+            [   # positions
+                {'symbol': 'SPY', 'quantity': Decimal('2.0'), 'avg_cost': Decimal('450.0')},
+                {'symbol': 'QQQ', 'quantity': Decimal('4.0'), 'avg_cost': Decimal('350.0')},
+            ],
+            [   # opening prices
+                {'symbol': 'SPY', 'open_price': Decimal('500.0')},
+                {'symbol': 'QQQ', 'open_price': Decimal('400.0')},
+            ],
+        ]
 
         from execute_trades import TradeExecutor
 
         executor = TradeExecutor()
+        trades = executor.execute_sell_trades({
+            'features_used': {
+                'allocation_pct': 0.5,
+                'assets': {'SPY': {'score': -2.0}, 'QQQ': {'score': -1.0}}
+            }
+        }, 7, '2025-11-15')
+
+        assert len(trades) == 2
+        rows = mock_execute_values.call_args[0][2]
+        assert [(r[3], r[4], r[5]) for r in rows] == [
+            ('SPY', 'S', Decimal('-1.0000')),
+            ('QQQ', 'S', Decimal('-2.0000')),
+        ]
+        cash_updates = [c for c in mock_cursor.execute.call_args_list if c[0][0].startswith('EXECUTE trade_adjust_cash')]
+        assert len(cash_updates) == 1
+        assert cash_updates[0][0][1][0] == Decimal('1300.0')
+        # run() owns the transaction
+        mock_conn.commit.assert_not_called()
 
-        trades = [{
-            'symbol': 'SPY',
-            'quantity': Decimal('0.5'),
-            'price': Decimal('580.0'),
-            'side': 'BUY',
-            'total': Decimal('290.0')
-        }]
+
+class TestUpdatePortfolio:
+    """Test update_portfolio method"""
+
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_update_portfolio_buys_single_upsert(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that buys are written with one UPSERT computing the weighted average cost"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+
+        trades = [
+            {'symbol': 'SPY', 'quantity': Decimal('0.69'), 'price': Decimal('580.0'), 'side': 'BUY', 'total': Decimal('400.2')},
+            {'symbol': 'QQQ', 'quantity': Decimal('0.5'), 'price': Decimal('480.0'), 'side': 'BUY', 'total': Decimal('240.0')},
+        ]
 
         executor.update_portfolio(trades)
 
-        # Should update existing position with weighted average
-        mock_cursor.execute.assert_called()
-        mock_conn.commit.assert_called_once()
+        mock_execute_values.assert_called_once()
+        sql, rows = mock_execute_values.call_args[0][1:3]
+        assert 'ON CONFLICT (symbol) DO UPDATE' in sql
+        assert 'portfolio.quantity * portfolio.avg_cost + EXCLUDED.quantity * EXCLUDED.avg_cost' in sql
+        assert [row[:3] for row in rows] == [
+            ('SPY', Decimal('0.69'), Decimal('580.0')),
+            ('QQQ', Decimal('0.5'), Decimal('480.0')),
+        ]
+        # No per-symbol SELECT round-trips
+        mock_cursor.execute.assert_not_called()
+        # run() owns the transaction
+        mock_conn.commit.assert_not_called()
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_update_portfolio_sell_partial(self, mock_get_settings, mock_connect):
-        """Test selling partial position"""
-        mock_settings = Mock()
-        mock_settings.database_url = "postgresql://test"
-        mock_get_settings.return_value = mock_settings
+    def test_update_portfolio_sells_update_then_close(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that sells decrement in one UPDATE and then delete closed positions"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
 
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+
+        trades = [
+            {'symbol': 'SPY', 'quantity': Decimal('1.0'), 'price': Decimal('590.0'), 'side': 'SELL', 'total': Decimal('590.0')},
+            {'symbol': 'DIA', 'quantity': Decimal('2.0'), 'price': Decimal('440.0'), 'side': 'SELL', 'total': Decimal('880.0')},
+        ]
+
+        executor.update_portfolio(trades)
+
+        mock_execute_values.assert_called_once()
+        sql, rows = mock_execute_values.call_args[0][1:3]
+        assert 'UPDATE portfolio' in sql
+        assert 'FROM (VALUES %s)' in sql
+        assert [row[:2] for row in rows] == [('SPY', Decimal('1.0')), ('DIA', Decimal('2.0'))]
+
+        mock_cursor.execute.assert_called_once()
+        delete_sql, params = mock_cursor.execute.call_args[0]
+        assert 'DELETE FROM portfolio' in delete_sql
+        assert params == (['SPY', 'DIA'],)
+        # run() owns the transaction
+        mock_conn.commit.assert_not_called()
+
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_update_portfolio_no_trades(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that an empty trade list issues no statements"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = {
-            'quantity': 2.0,
-            'avg_cost': 575.0
-        }
 
         from execute_trades import TradeExecutor
 
         executor = TradeExecutor()
+        executor.update_portfolio([])
+
+        mock_execute_values.assert_not_called()
+        mock_cursor.execute.assert_not_called()
+
+    @patch('execute_trades.execute_values')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_update_portfolio_uses_run_timestamp(self, mock_get_settings, mock_connect, mock_execute_values):
+        """Test that rows are stamped with the run's cached time unless one is passed in"""
+        mock_conn = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = MagicMock()
 
-        trades = [{
-            'symbol': 'SPY',
-            'quantity': Decimal('1.0'),
-            'price': Decimal('590.0'),
-            'side': 'SELL',
-            'total': Decimal('590.0')
-        }]
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        executor._now = datetime(2025, 11, 10, 14, 30, tzinfo=timezone.utc)
+        trades = [{'symbol': 'SPY', 'quantity': Decimal('1.0'), 'price': Decimal('580.0'), 'side': 'BUY', 'total': Decimal('580.0')}]
 
         executor.update_portfolio(trades)
+        assert mock_execute_values.call_args[0][2][0][3] == executor._now
 
-        mock_cursor.execute.assert_called()
-        mock_conn.commit.assert_called_once()
+        explicit = datetime(2025, 11, 11, 9, 0, tzinfo=timezone.utc)
+        executor.update_portfolio(trades, now=explicit)
+        assert mock_execute_values.call_args[0][2][0][3] == explicit
 
 
 class TestExecuteSellTrades:
     """Test execute_sell_trades method"""
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_execute_sell_trades_with_positions(self, mock_get_settings, mock_connect):
         """Test executing sell trades when positions exist"""
@@ -493,9 +757,10 @@ class TestExecuteSellTrades:
         assert len(trades) == 1
         assert trades[0]['side'] == 'SELL'
         assert trades[0]['symbol'] == 'SPY'
-        mock_conn.commit.assert_called_once()
+        # run() owns the transaction
+        mock_conn.commit.assert_not_called()
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_execute_sell_trades_no_positions(self, mock_get_settings, mock_connect):
         """Test sell trades when no positions exist"""
@@ -523,7 +788,7 @@ class TestExecuteSellTrades:
 
         assert len(trades) == 0
 
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_execute_sell_trades_positive_score_no_sell(self, mock_get_settings, mock_connect):
         """Test that positive scores don't trigger sells"""
@@ -561,10 +826,11 @@ class TestExecuteSellTrades:
 class TestRunMethod:
     """Test TradeExecutor.run method"""
 
+    @patch('execute_trades.execute_values')
     @patch('execute_trades.get_trading_config')
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_run_buy_action(self, mock_get_settings, mock_connect, mock_get_config):
+    def test_run_buy_action(self, mock_get_settings, mock_connect, mock_get_config, mock_execute_values):
         """Test run method with BUY action"""
         mock_settings = Mock()
         mock_settings.database_url = "postgresql://test"
@@ -583,7 +849,7 @@ class TestRunMethod:
 
         # Mock signal
         mock_cursor.fetchone.side_effect = [
-            # get_latest_signal
+            # get_signal_for_date
             {
                 'id': 1,
                 'trade_date': date(2025, 11, 15),
@@ -594,16 +860,15 @@ class TestRunMethod:
                     'assets': {'SPY': {'score': 3.0}}
                 }
             },
-            # get_opening_price for SPY
-            {'open_price': 580.0},
-            # update_portfolio check for existing position
-            None
+            # get_cash_balance: available cash, basket check, remaining cash
+            {'quantity': Decimal('1000')},
+            {'quantity': Decimal('1000')},
+            {'quantity': Decimal('600')}
         ]
 
-        # Mock positions (empty initially)
         mock_cursor.fetchall.side_effect = [
-            [],  # get_current_positions
-            []   # current prices query
+            [],  # get_portfolio_snapshot (no positions yet)
+            [{'symbol': 'SPY', 'open_price': Decimal('580')}]  # get_opening_prices
         ]
 
         from execute_trades import TradeExecutor
@@ -612,10 +877,10 @@ class TestRunMethod:
         executor.run('2025-11-15')
 
         # Should have executed buy trades
-        mock_conn.commit.assert_called()
+        mock_conn.commit.assert_called_once()
 
     @patch('execute_trades.get_trading_config')
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_run_hold_action(self, mock_get_settings, mock_connect, mock_get_config):
         """Test run method with HOLD action"""
@@ -657,10 +922,11 @@ class TestRunMethod:
         # HOLD should not execute any trades
         mock_get_config.assert_called_once()
 
+    @patch('execute_trades.execute_values')
     @patch('execute_trades.get_trading_config')
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
-    def test_run_sell_action(self, mock_get_settings, mock_connect, mock_get_config):
+    def test_run_sell_action(self, mock_get_settings, mock_connect, mock_get_config, mock_execute_values):
         """Test run method with SELL action"""
         mock_settings = Mock()
         mock_settings.database_url = "postgresql://test"
@@ -677,7 +943,7 @@ class TestRunMethod:
         mock_get_config.return_value = mock_config
 
         mock_cursor.fetchone.side_effect = [
-            # get_latest_signal
+            # get_signal_for_date
             {
                 'id': 1,
                 'trade_date': date(2025, 11, 15),
@@ -688,19 +954,19 @@ class TestRunMethod:
                     'assets': {'SPY': {'score': -2.0}}
                 }
             },
-            # get_opening_price
-            {'open_price': 580.0},
-            # update_portfolio check for existing position
-            {'quantity': 2.0, 'avg_cost': 575.0}
+            # get_cash_balance after the sale
+            {'quantity': Decimal('1812')}
         ]
 
         mock_cursor.fetchall.side_effect = [
-            # get_current_positions (twice - once for display, once for sell)
-            [{'symbol': 'SPY', 'total_quantity': 2.0, 'avg_cost': 575.0, 'total_cost': 1150.0}],
-            # current prices
-            [{'symbol': 'SPY', 'close_price': 580.0}],
+            # get_portfolio_snapshot
+            [{'symbol': 'SPY', 'quantity': Decimal('2'), 'avg_cost': Decimal('575'),
+              'cost': Decimal('1150'), 'value': Decimal('1160'),
+              'total_cost': Decimal('1150'), 'total_value': Decimal('1160')}],
             # get_current_positions for sell
-            [{'symbol': 'SPY', 'total_quantity': 2.0, 'avg_cost': 575.0, 'total_cost': 1150.0}]
+            [{'symbol': 'SPY', 'quantity': Decimal('2'), 'avg_cost': Decimal('575')}],
+            # get_opening_prices
+            [{'symbol': 'SPY', 'open_price': Decimal('580')}]
         ]
 
         from execute_trades import TradeExecutor
@@ -708,10 +974,10 @@ class TestRunMethod:
         executor = TradeExecutor()
         executor.run('2025-11-15')
 
-        mock_conn.commit.assert_called()
+        mock_conn.commit.assert_called_once()
 
     @patch('execute_trades.get_trading_config')
-    @patch('execute_trades.psycopg2.connect')
+    @patch('psycopg2.connect')
     @patch('execute_trades.get_settings')
     def test_run_with_existing_positions(self, mock_get_settings, mock_connect, mock_get_config):
         """Test run method showing existing portfolio"""
@@ -755,6 +1021,34 @@ class TestRunMethod:
         # Should display portfolio info
         mock_get_config.assert_called_once()
 
+    @patch('execute_trades.get_trading_config')
+    @patch('psycopg2.connect')
+    @patch('execute_trades.get_settings')
+    def test_run_rolls_back_on_failure(self, mock_get_settings, mock_connect, mock_get_config):
+        """Test that a failed run rolls back the day's cash injection instead of committing it"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+
+        mock_config = Mock()
+        mock_config.id = 1
+        mock_config.daily_capital = 1000.0
+        mock_get_config.return_value = mock_config
+
+        mock_cursor.fetchone.return_value = None  # get_signal_for_date
+
+        from execute_trades import TradeExecutor
+
+        executor = TradeExecutor()
+        with pytest.raises(Exception, match="No signal found"):
+            executor.run('2025-11-15')
+
+        mock_conn.commit.assert_not_called()
+        mock_conn.rollback.assert_called_once()
+        # The next run must re-check CASH since its INSERT was rolled back
+        assert executor._cash_initialized is False
+
 
 class TestMainFunction:
     """Test main entry point"""
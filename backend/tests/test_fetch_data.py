@@ -182,7 +182,7 @@ class TestBackfillHistoricalData:
 
         mock_db = MagicMock()
         mock_session.return_value = mock_db
-        mock_db.query.return_value.filter.return_value.first.return_value = None  # No existing data
+        mock_db.query.return_value.filter.return_value = [(date.today(),)]  # Latest bar already stored
 
         mock_ts = Mock()
         mock_ts_class.return_value = mock_ts
@@ -199,10 +199,17 @@ class TestBackfillHistoricalData:
 
         mock_ts.get_daily.return_value = (mock_data, {'metadata': 'test'})
 
-        backfill_historical_data(days=10)
+        with patch('scripts.fetch_data.PriceHistory.bulk_copy', return_value=9) as mock_copy:
+            backfill_historical_data(days=10)
 
-        # Should add multiple records
-        assert mock_db.add.call_count >= 1
+        # New bars go in with one COPY, skipping the stored date
+        mock_copy.assert_called_once()
+        db, rows = mock_copy.call_args[0]
+        assert db is mock_db
+        assert len(rows) == 9
+        assert rows[0] == (dates[0].date(), 'SPY', 580.0, 582.0, 578.0, 581.0, 50000000.0)
+        assert date.today() not in [row[0] for row in rows]
+        mock_db.add.assert_not_called()
         mock_db.commit.assert_called()
 
     @patch('scripts.fetch_data.time.sleep')
@@ -224,12 +231,12 @@ class TestBackfillHistoricalData:
 
         mock_db = MagicMock()
         mock_session.return_value = mock_db
-        mock_db.query.return_value.filter.return_value.first.return_value = Mock()  # All data exists
+        dates = pd.date_range(end=date.today(), periods=10)
+        mock_db.query.return_value.filter.return_value = [(d.date(),) for d in dates]  # All data exists
 
         mock_ts = Mock()
         mock_ts_class.return_value = mock_ts
 
-        dates = pd.date_range(end=date.today(), periods=10)
         mock_data = pd.DataFrame({
             '1. open': [580.0] * 10,
             '2. high': [582.0] * 10,
@@ -240,9 +247,11 @@ class TestBackfillHistoricalData:
 
         mock_ts.get_daily.return_value = (mock_data, {'metadata': 'test'})
 
-        backfill_historical_data(days=10)
+        with patch('scripts.fetch_data.PriceHistory.bulk_copy') as mock_copy:
+            backfill_historical_data(days=10)
 
-        # Should not add any records since they all exist
+        # Should not copy any records since they all exist
+        mock_copy.assert_not_called()
         mock_db.add.assert_not_called()
 
     @patch('scripts.fetch_data.TimeSeries')
@@ -166,6 +166,17 @@ class TestDetectRegimeTransition:
         transition = detect_regime_transition(current_regime_score=0.35, previous_regime_score=None)
         assert transition == 'stable'
 
+    @patch('scripts.generate_signal.trading_config', None)
+    def test_explicit_thresholds_bypass_config(self):
+        """Test that precomputed TransitionThresholds are used instead of the module config"""
+        from scripts.generate_signal import TransitionThresholds, detect_regime_transition
+
+        thresholds = TransitionThresholds(transition=0.1, bullish=0.3, momentum_loss=-0.1, momentum_gain=0.1)
+
+        assert detect_regime_transition(0.2, -0.2, thresholds) == 'turning_bullish'
+        assert detect_regime_transition(0.35, 0.55, thresholds) == 'losing_momentum'
+        assert detect_regime_transition(0.35, 0.33, thresholds) == 'stable'
+
 
 class TestCalculateAdaptiveThreshold:
     """Test adaptive threshold calculation"""
@@ -298,12 +309,8 @@ class TestCheckCircuitBreaker:
         from scripts.generate_signal import check_circuit_breaker
 
         mock_db = MagicMock()
-        mock_perf = [
-            Mock(total_value=10000),
-            Mock(total_value=10100),
-            Mock(total_value=10050)
-        ]
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = mock_perf
+        # 3 days: 10000 -> 10100 (peak) -> 10050
+        mock_db.query.return_value.select_from.return_value.one.return_value = (3, (10100 - 10050) / 10100)
 
         triggered, dd = check_circuit_breaker(mock_db, date(2025, 11, 15), 0.10)
 
@@ -316,12 +323,8 @@ class TestCheckCircuitBreaker:
         from scripts.generate_signal import check_circuit_breaker
 
         mock_db = MagicMock()
-        mock_perf = [
-            Mock(total_value=10000),
-            Mock(total_value=10500),  # Peak
-            Mock(total_value=9000)    # 14.3% drawdown
-        ]
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = mock_perf
+        # 3 days: 10000 -> 10500 (peak) -> 9000, a 14.3% drawdown
+        mock_db.query.return_value.select_from.return_value.one.return_value = (3, (10500 - 9000) / 10500)
 
         triggered, dd = check_circuit_breaker(mock_db, date(2025, 11, 15), 0.10)
 
@@ -334,25 +337,35 @@ class TestCheckCircuitBreaker:
         from scripts.generate_signal import check_circuit_breaker
 
         mock_db = MagicMock()
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = []
+        mock_db.query.return_value.select_from.return_value.one.return_value = (0, None)
 
         triggered, dd = check_circuit_breaker(mock_db, date(2025, 11, 15), 0.10)
 
         assert not triggered
         assert dd == 0.0
 
+    @patch('scripts.generate_signal.SessionLocal')
+    def test_circuit_breaker_no_peak(self, mock_session):
+        """Test that a month without a positive peak has no drawdown"""
+        from scripts.generate_signal import check_circuit_breaker
+
+        mock_db = MagicMock()
+        mock_db.query.return_value.select_from.return_value.one.return_value = (5, None)
+
+        assert check_circuit_breaker(mock_db, date(2025, 11, 15), 0.10) == (False, 0.0)
+
 
 class TestDetectMeanReversionOpportunity:
     """Test mean reversion opportunity detection"""
 
     def test_oversold_bounce_detected(self):
         """Test detection of oversold bounce opportunity"""
-        from scripts.generate_signal import detect_mean_reversion_opportunity
+        from scripts.generate_signal import AssetFeatures, detect_mean_reversion_opportunity
 
         features = {
-            'SPY': {'rsi': 25.0, 'bollinger_position': -0.8},  # Oversold
-            'QQQ': {'rsi': 55.0, 'bollinger_position': 0.1},
-            'DIA': {'rsi': 50.0, 'bollinger_position': 0.0}
+            'SPY': AssetFeatures(rsi=25.0, bollinger_position=-0.8),  # Oversold
+            'QQQ': AssetFeatures(rsi=55.0, bollinger_position=0.1),
+            'DIA': AssetFeatures(rsi=50.0, bollinger_position=0.0)
         }
 
         has_opp, opp_type, assets = detect_mean_reversion_opportunity(features, regime_score=0.1)
@@ -363,12 +376,12 @@ class TestDetectMeanReversionOpportunity:
 
     def test_overbought_reversal_detected(self):
         """Test detection of overbought reversal"""
-        from scripts.generate_signal import detect_mean_reversion_opportunity
+        from scripts.generate_signal import AssetFeatures, detect_mean_reversion_opportunity
 
         features = {
-            'SPY': {'rsi': 75.0, 'bollinger_position': 0.9},  # Overbought
-            'QQQ': {'rsi': 50.0, 'bollinger_position': 0.0},
-            'DIA': {'rsi': 50.0, 'bollinger_position': 0.0}
+            'SPY': AssetFeatures(rsi=75.0, bollinger_position=0.9),  # Overbought
+            'QQQ': AssetFeatures(rsi=50.0, bollinger_position=0.0),
+            'DIA': AssetFeatures(rsi=50.0, bollinger_position=0.0)
         }
 
         has_opp, opp_type, assets = detect_mean_reversion_opportunity(features, regime_score=0.1)
@@ -379,12 +392,12 @@ class TestDetectMeanReversionOpportunity:
 
     def test_no_opportunity_in_strong_trend(self):
         """Test no mean reversion in strong trend"""
-        from scripts.generate_signal import detect_mean_reversion_opportunity
+        from scripts.generate_signal import AssetFeatures, detect_mean_reversion_opportunity
 
         features = {
-            'SPY': {'rsi': 25.0, 'bollinger_position': -0.8},  # Oversold
-            'QQQ': {'rsi': 50.0, 'bollinger_position': 0.0},
-            'DIA': {'rsi': 50.0, 'bollinger_position': 0.0}
+            'SPY': AssetFeatures(rsi=25.0, bollinger_position=-0.8),  # Oversold
+            'QQQ': AssetFeatures(rsi=50.0, bollinger_position=0.0),
+            'DIA': AssetFeatures(rsi=50.0, bollinger_position=0.0)
         }
 
         # Strong trend (regime_score > 0.4) - should not trigger mean reversion
@@ -394,18 +407,51 @@ class TestDetectMeanReversionOpportunity:
 
     def test_no_opportunity_when_neutral(self):
         """Test no opportunity when all assets are neutral"""
-        from scripts.generate_signal import detect_mean_reversion_opportunity
+        from scripts.generate_signal import AssetFeatures, detect_mean_reversion_opportunity
 
         features = {
-            'SPY': {'rsi': 50.0, 'bollinger_position': 0.0},
-            'QQQ': {'rsi': 55.0, 'bollinger_position': 0.1},
-            'DIA': {'rsi': 48.0, 'bollinger_position': -0.1}
+            'SPY': AssetFeatures(rsi=50.0, bollinger_position=0.0),
+            'QQQ': AssetFeatures(rsi=55.0, bollinger_position=0.1),
+            'DIA': AssetFeatures(rsi=48.0, bollinger_position=-0.1)
         }
 
         has_opp, opp_type, assets = detect_mean_reversion_opportunity(features, regime_score=0.1)
 
         assert not has_opp
 
+    @patch('scripts.generate_signal.trading_config')
+    def test_classification_shared_with_detection(self, mock_config):
+        """Test that classify_mean_reversion tiers feed detection without re-reading features"""
+        from scripts.generate_signal import (
+            AssetFeatures, classify_mean_reversion, detect_mean_reversion_opportunity, feature_table
+        )
+
+        mock_config.rsi_oversold_threshold = 30.0
+        mock_config.bb_oversold_threshold = -0.5
+        mock_config.rsi_mild_oversold = 40.0
+        mock_config.bb_mild_oversold = -0.2
+        mock_config.rsi_overbought_threshold = 70.0
+        mock_config.bb_overbought_threshold = 0.5
+        mock_config.strong_trend_threshold = 0.4
+
+        features = {
+            'SPY': AssetFeatures(rsi=25.0, bollinger_position=-0.8),
+            'QQQ': AssetFeatures(rsi=35.0, bollinger_position=-0.3),
+            'DIA': AssetFeatures(rsi=75.0, bollinger_position=0.9),
+            'IWM': AssetFeatures(),
+        }
+
+        classes = classify_mean_reversion(feature_table(features), list(features))
+
+        assert classes == {
+            'SPY': 'oversold_strong',
+            'QQQ': 'oversold_mild',
+            'DIA': 'overbought',
+            'IWM': 'none',
+        }
+        # Detection only partitions the precomputed classes
+        assert detect_mean_reversion_opportunity({}, 0.1, classes) == (True, 'oversold_bounce', ['SPY'])
+
 
 class TestDecideActionEnhanced:
     """Test enhanced decide_action function"""
@@ -473,108 +519,199 @@ class TestDecideActionEnhanced:
         assert pct == 0.8
         assert signal_type == "bullish_momentum"
 
+    @patch('scripts.generate_signal.detect_downward_pressure', return_value=(False, None, ""))
+    def test_explicit_thresholds_bypass_config(self, mock_pressure):
+        """Test that precomputed DecisionThresholds drive the decision and pre-multiply sell sizes"""
+        from scripts.generate_signal import DecisionThresholds, decide_action, feature_table
+
+        config = Mock(
+            sell_percentage=0.6,
+            sell_defensive_multiplier=0.5,
+            sell_moderate_pressure_multiplier=0.5,
+            sell_bullish_risk_multiplier=0.25,
+            extreme_risk_threshold=90.0,
+            bullish_excessive_risk=80.0,
+        )
+        thresholds = DecisionThresholds.from_config(config)
+
+        assert thresholds.severe_defensive_sell_pct == pytest.approx(0.3)
+        assert thresholds.moderate_pressure_sell_pct == pytest.approx(0.3)
+
+        with patch('scripts.generate_signal.trading_config', None):
+            action, pct, signal_type = decide_action(
+                regime_score=0.4, risk_score=85, has_holdings=True,
+                mean_reversion_opportunity=(False, None, []),
+                adaptive_bullish_threshold=0.3, adaptive_bearish_threshold=-0.3,
+                current_drawdown=0.0, features=feature_table({}), thresholds=thresholds
+            )
+
+        assert action == "SELL"
+        assert pct == pytest.approx(0.15)
+        assert signal_type == "bullish_excessive_risk"
+
 
 class TestCalculateRegime:
     """Test calculate_regime function"""
 
     def test_bullish_regime(self):
         """Test detection of bullish regime"""
-        from scripts.generate_signal import calculate_regime
+        from scripts.generate_signal import AssetFeatures, calculate_regime, feature_table
 
         features = {
-            'SPY': {
-                'returns_5d': 0.02,
-                'returns_20d': 0.05,
-                'returns_60d': 0.10,
-                'price_vs_sma20': 0.03,
-                'price_vs_sma50': 0.05
-            }
+            'SPY': AssetFeatures(
+                returns_5d=0.02,
+                returns_20d=0.05,
+                returns_60d=0.10,
+                price_vs_sma20=0.03,
+                price_vs_sma50=0.05
+            )
         }
 
-        regime_score = calculate_regime(features)
+        regime_score = calculate_regime(feature_table(features))
 
         assert regime_score > 0
 
     def test_bearish_regime(self):
         """Test detection of bearish regime"""
-        from scripts.generate_signal import calculate_regime
+        from scripts.generate_signal import AssetFeatures, calculate_regime, feature_table
 
         features = {
-            'SPY': {
-                'returns_5d': -0.02,
-                'returns_20d': -0.05,
-                'returns_60d': -0.10,
-                'price_vs_sma20': -0.03,
-                'price_vs_sma50': -0.05
-            }
+            'SPY': AssetFeatures(
+                returns_5d=-0.02,
+                returns_20d=-0.05,
+                returns_60d=-0.10,
+                price_vs_sma20=-0.03,
+                price_vs_sma50=-0.05
+            )
         }
 
-        regime_score = calculate_regime(features)
+        regime_score = calculate_regime(feature_table(features))
 
         assert regime_score < 0
 
     def test_neutral_regime(self):
         """Test detection of neutral regime"""
-        from scripts.generate_signal import calculate_regime
+        from scripts.generate_signal import AssetFeatures, calculate_regime, feature_table
 
         features = {
-            'SPY': {
-                'returns_5d': 0.001,
-                'returns_20d': -0.001,
-                'returns_60d': 0.001,
-                'price_vs_sma20': 0.001,
-                'price_vs_sma50': -0.001
-            }
+            'SPY': AssetFeatures(
+                returns_5d=0.001,
+                returns_20d=-0.001,
+                returns_60d=0.001,
+                price_vs_sma20=0.001,
+                price_vs_sma50=-0.001
+            )
         }
 
-        regime_score = calculate_regime(features)
+        regime_score = calculate_regime(feature_table(features))
 
         assert abs(regime_score) < 0.1
 
+    @patch('scripts.generate_signal.trading_config')
+    def test_regime_matches_weighted_average(self, mock_config):
+        """Test the matrix-vector regime against the per-asset weighted formula"""
+        from scripts.generate_signal import AssetFeatures, calculate_regime, feature_table
+
+        mock_config.regime_momentum_weight = 0.5
+        mock_config.regime_sma20_weight = 0.3
+        mock_config.regime_sma50_weight = 0.2
+
+        features = {
+            'SPY': AssetFeatures(returns_5d=0.03, returns_20d=0.06, returns_60d=0.09,
+                                 price_vs_sma20=0.02, price_vs_sma50=0.04),
+            'QQQ': AssetFeatures(returns_5d=-0.03, returns_20d=0.0, returns_60d=-0.06,
+                                 price_vs_sma20=-0.01, price_vs_sma50=0.01),
+        }
+
+        spy = 0.06 * 0.5 + 0.02 * 0.3 + 0.04 * 0.2
+        qqq = -0.03 * 0.5 - 0.01 * 0.3 + 0.01 * 0.2
+        regime_score = calculate_regime(feature_table(features))
+
+        assert regime_score == pytest.approx((spy + qqq) / 2)
+        assert isinstance(regime_score, float)
+
+    @patch('scripts.generate_signal.trading_config')
+    def test_explicit_weights_bypass_config(self, mock_config):
+        """Test that precomputed SignalWeights are used instead of the module config"""
+        from scripts.generate_signal import AssetFeatures, SignalWeights, calculate_regime, feature_table
+
+        config = Mock(regime_momentum_weight=0.5, regime_sma20_weight=0.3, regime_sma50_weight=0.2)
+        weights = SignalWeights.from_config(config)
+        mock_config.regime_momentum_weight = 'unused'
+
+        features = {
+            'SPY': AssetFeatures(returns_5d=0.03, returns_20d=0.06, returns_60d=0.09,
+                                 price_vs_sma20=0.02, price_vs_sma50=0.04),
+        }
+
+        assert calculate_regime(feature_table(features), weights) == pytest.approx(0.06 * 0.5 + 0.02 * 0.3 + 0.04 * 0.2)
+
 
 class TestCalculateRiskScore:
     """Test calculate_risk_score function"""
 
     def test_low_risk_score(self):
         """Test low risk score calculation"""
-        from scripts.generate_signal import calculate_risk_score
+        from scripts.generate_signal import AssetFeatures, calculate_risk_score, feature_table
 
         features = {
-            'SPY': {'volatility': 0.005, 'returns_60d': 0.10},
-            'QQQ': {'volatility': 0.006, 'returns_60d': 0.08},
-            'DIA': {'volatility': 0.004, 'returns_60d': 0.05}
+            'SPY': AssetFeatures(volatility=0.005, returns_60d=0.10),
+            'QQQ': AssetFeatures(volatility=0.006, returns_60d=0.08),
+            'DIA': AssetFeatures(volatility=0.004, returns_60d=0.05)
         }
 
-        risk_score = calculate_risk_score(features)
+        risk_score = calculate_risk_score(feature_table(features))
 
         assert risk_score < 50
 
     def test_high_risk_score(self):
         """Test high risk score calculation"""
-        from scripts.generate_signal import calculate_risk_score
+        from scripts.generate_signal import AssetFeatures, calculate_risk_score, feature_table
 
         features = {
-            'SPY': {'volatility': 0.025, 'returns_60d': 0.05},
-            'QQQ': {'volatility': 0.030, 'returns_60d': 0.05},
-            'DIA': {'volatility': 0.028, 'returns_60d': 0.05}
+            'SPY': AssetFeatures(volatility=0.025, returns_60d=0.05),
+            'QQQ': AssetFeatures(volatility=0.030, returns_60d=0.05),
+            'DIA': AssetFeatures(volatility=0.028, returns_60d=0.05)
         }
 
-        risk_score = calculate_risk_score(features)
+        risk_score = calculate_risk_score(feature_table(features))
 
         assert risk_score > 70
 
     def test_risk_score_bounds(self):
         """Test that risk score is bounded between 0 and 100"""
-        from scripts.generate_signal import calculate_risk_score
+        from scripts.generate_signal import AssetFeatures, calculate_risk_score, feature_table
 
         features = {
-            'SPY': {'volatility': 0.1, 'returns_60d': 0.05},
+            'SPY': AssetFeatures(volatility=0.1, returns_60d=0.05),
         }
 
-        risk_score = calculate_risk_score(features)
+        risk_score = calculate_risk_score(feature_table(features))
 
         assert 0 <= risk_score <= 100
 
+    @patch('scripts.generate_signal.trading_config')
+    def test_risk_score_matches_formula(self, mock_config):
+        """Test the vectorized reductions against the documented formula"""
+        from scripts.generate_signal import AssetFeatures, calculate_risk_score, feature_table
+
+        mock_config.volatility_normalization_factor = 0.03
+        mock_config.stability_threshold = 0.02
+        mock_config.stability_discount_factor = 0.3
+        mock_config.correlation_risk_base = 50.0
+        mock_config.correlation_risk_multiplier = 200.0
+        mock_config.risk_volatility_weight = 0.7
+        mock_config.risk_correlation_weight = 0.3
+
+        features = {
+            'SPY': AssetFeatures(volatility=0.01, returns_5d=0.01, returns_60d=0.05),
+            'QQQ': AssetFeatures(volatility=0.02, returns_5d=-0.01, returns_60d=0.15),
+        }
+
+        vol_score = (0.015 / 0.03) * 100 * (1.0 - (1.0 - 0.01 / 0.02) * 0.3)
+        correlation_risk = 50.0 - 0.05 * 200.0
+        assert calculate_risk_score(feature_table(features)) == pytest.approx(vol_score * 0.7 + correlation_risk * 0.3)
+
 
 class TestRankAssets:
     """Test rank_assets function with mean reversion"""
@@ -582,7 +719,7 @@ class TestRankAssets:
     @patch('scripts.generate_signal.trading_config')
     def test_oversold_asset_gets_bonus(self, mock_config):
         """Test that oversold assets get ranking bonus"""
-        from scripts.generate_signal import rank_assets
+        from scripts.generate_signal import AssetFeatures, rank_assets, feature_table
 
         mock_config.rsi_oversold_threshold = 30.0
         mock_config.rsi_overbought_threshold = 70.0
@@ -590,29 +727,29 @@ class TestRankAssets:
         mock_config.price_momentum_weight = 0.4
 
         features = {
-            'SPY': {
-                'returns_5d': 0.01,
-                'returns_20d': 0.02,
-                'returns_60d': 0.04,
-                'volatility': 0.01,
-                'price_vs_sma20': 0.01,
-                'price_vs_sma50': 0.01,
-                'rsi': 25.0,  # Oversold
-                'bollinger_position': -0.7
-            },
-            'QQQ': {
-                'returns_5d': 0.01,
-                'returns_20d': 0.02,
-                'returns_60d': 0.04,
-                'volatility': 0.01,
-                'price_vs_sma20': 0.01,
-                'price_vs_sma50': 0.01,
-                'rsi': 50.0,  # Neutral
-                'bollinger_position': 0.0
-            }
+            'SPY': AssetFeatures(
+                returns_5d=0.01,
+                returns_20d=0.02,
+                returns_60d=0.04,
+                volatility=0.01,
+                price_vs_sma20=0.01,
+                price_vs_sma50=0.01,
+                rsi=25.0,  # Oversold
+                bollinger_position=-0.7
+            ),
+            'QQQ': AssetFeatures(
+                returns_5d=0.01,
+                returns_20d=0.02,
+                returns_60d=0.04,
+                volatility=0.01,
+                price_vs_sma20=0.01,
+                price_vs_sma50=0.01,
+                rsi=50.0,  # Neutral
+                bollinger_position=0.0
+            )
         }
 
-        scores = rank_assets(features)
+        scores = rank_assets(feature_table(features), list(features))
 
         # Oversold asset should have higher score due to mean reversion bonus
         assert scores['SPY'] > scores['QQQ']
@@ -620,7 +757,7 @@ class TestRankAssets:
     @patch('scripts.generate_signal.trading_config')
     def test_overbought_asset_gets_penalty(self, mock_config):
         """Test that overbought assets get ranking penalty"""
-        from scripts.generate_signal import rank_assets
+        from scripts.generate_signal import AssetFeatures, rank_assets, feature_table
 
         mock_config.rsi_oversold_threshold = 30.0
         mock_config.rsi_overbought_threshold = 70.0
@@ -628,33 +765,108 @@ class TestRankAssets:
         mock_config.price_momentum_weight = 0.4
 
         features = {
-            'SPY': {
-                'returns_5d': 0.01,
-                'returns_20d': 0.02,
-                'returns_60d': 0.04,
-                'volatility': 0.01,
-                'price_vs_sma20': 0.01,
-                'price_vs_sma50': 0.01,
-                'rsi': 75.0,  # Overbought
-                'bollinger_position': 0.7
-            },
-            'QQQ': {
-                'returns_5d': 0.01,
-                'returns_20d': 0.02,
-                'returns_60d': 0.04,
-                'volatility': 0.01,
-                'price_vs_sma20': 0.01,
-                'price_vs_sma50': 0.01,
-                'rsi': 50.0,  # Neutral
-                'bollinger_position': 0.0
-            }
+            'SPY': AssetFeatures(
+                returns_5d=0.01,
+                returns_20d=0.02,
+                returns_60d=0.04,
+                volatility=0.01,
+                price_vs_sma20=0.01,
+                price_vs_sma50=0.01,
+                rsi=75.0,  # Overbought
+                bollinger_position=0.7
+            ),
+            'QQQ': AssetFeatures(
+                returns_5d=0.01,
+                returns_20d=0.02,
+                returns_60d=0.04,
+                volatility=0.01,
+                price_vs_sma20=0.01,
+                price_vs_sma50=0.01,
+                rsi=50.0,  # Neutral
+                bollinger_position=0.0
+            )
         }
 
-        scores = rank_assets(features)
+        scores = rank_assets(feature_table(features), list(features))
 
         # Overbought asset should have lower score due to penalty
         assert scores['SPY'] < scores['QQQ']
 
+    @patch('scripts.generate_signal.trading_config')
+    def test_vectorized_scores_match_formula(self, mock_config):
+        """Test per-asset scores, trend alignment and first-matching mean reversion tier"""
+        from scripts.generate_signal import AssetFeatures, rank_assets, feature_table
+
+        mock_config.trend_aligned_multiplier = 1.5
+        mock_config.trend_mixed_multiplier = 0.5
+        mock_config.rsi_oversold_threshold = 30.0
+        mock_config.bb_oversold_threshold = -0.5
+        mock_config.rsi_mild_oversold = 40.0
+        mock_config.bb_mild_oversold = -0.2
+        mock_config.rsi_overbought_threshold = 70.0
+        mock_config.bb_overbought_threshold = 0.5
+        mock_config.oversold_strong_bonus = 0.3
+        mock_config.oversold_mild_bonus = 0.1
+        mock_config.overbought_penalty = -0.2
+        mock_config.momentum_weight = 0.6
+        mock_config.price_momentum_weight = 0.4
+
+        base = AssetFeatures(volatility=0.02, price_vs_sma20=0.01, price_vs_sma50=0.03)
+        features = {
+            # Aligned trend, strong oversold (also satisfies the mild tier)
+            'SPY': base._replace(returns_5d=0.01, returns_20d=0.02, returns_60d=0.04,
+                                 rsi=25.0, bollinger_position=-0.7),
+            # Mixed trend, missing optional features fall back to defaults
+            'QQQ': base._replace(returns_60d=-0.04),
+        }
+
+        scores = rank_assets(feature_table(features), list(features))
+
+        assert scores['SPY'] == pytest.approx((0.04 / 0.02) * 0.6 * 1.5 + 0.02 * 0.4 + 0.3)
+        assert scores['QQQ'] == pytest.approx((-0.04 / 0.02) * 0.6 * 0.5 + 0.02 * 0.4)
+        assert all(isinstance(score, float) for score in scores.values())
+        assert rank_assets(feature_table({}), []) == {}
+
+
+class TestDetectDownwardPressure:
+    """Test detect_downward_pressure function"""
+
+    def _configure(self, mock_config):
+        mock_config.price_vs_sma_threshold = -0.02
+        mock_config.high_volatility_threshold = 0.02
+        mock_config.negative_return_threshold = -0.03
+        mock_config.severe_pressure_threshold = 0.6
+        mock_config.severe_pressure_risk = 50.0
+        mock_config.moderate_pressure_threshold = 0.4
+        mock_config.moderate_pressure_risk = 40.0
+
+    @patch('scripts.generate_signal.trading_config')
+    def test_severe_when_most_assets_trend_down(self, mock_config):
+        """Test that broad negative momentum below both SMAs is severe"""
+        from scripts.generate_signal import AssetFeatures, detect_downward_pressure, feature_table
+        self._configure(mock_config)
+
+        falling = AssetFeatures(returns_5d=-0.02, returns_20d=-0.05, returns_60d=-0.08,
+                                price_vs_sma20=-0.04, price_vs_sma50=-0.06, volatility=0.01)
+        rising = AssetFeatures(returns_5d=0.01, returns_20d=0.02, returns_60d=0.03,
+                               price_vs_sma20=0.01, price_vs_sma50=0.02, volatility=0.01)
+
+        has_pressure, severity, reason = detect_downward_pressure(
+            feature_table({'SPY': falling, 'QQQ': falling, 'DIA': rising}), risk_score=30.0
+        )
+
+        assert has_pressure is True
+        assert severity == "severe"
+        assert "2/3" in reason
+
+    @patch('scripts.generate_signal.trading_config')
+    def test_no_pressure_with_missing_features(self, mock_config):
+        """Test that missing features default to zero and raise no pressure"""
+        from scripts.generate_signal import AssetFeatures, detect_downward_pressure, feature_table
+        self._configure(mock_config)
+
+        assert detect_downward_pressure(feature_table({'SPY': AssetFeatures(), 'QQQ': AssetFeatures()}), risk_score=90.0) == (False, "none", "")
+
 
 class TestAllocateDiversified:
     """Test allocate_diversified function"""
@@ -749,14 +961,91 @@ class TestCalculateMultiTimeframeFeatures:
             'volume': [50000000] * 100
         })
 
-        features = calculate_multi_timeframe_features(df)
+        features = calculate_multi_timeframe_features(df['close'].to_numpy())
+
+        assert 'rsi' in features._fields
+        assert 'bollinger_position' in features._fields
+        assert 'bollinger_upper' in features._fields
+        assert 'bollinger_lower' in features._fields
+        assert 0 <= features.rsi <= 100
+        assert -1 <= features.bollinger_position <= 1
+
+    @patch('scripts.generate_signal.trading_config')
+    def test_features_match_pandas_reference(self, mock_config):
+        """Test that the array-based features match the pandas formulas"""
+        from scripts.generate_signal import calculate_multi_timeframe_features
+
+        mock_config.bollinger_std_multiplier = 2.0
+
+        closes = pd.Series(580.0 + np.cumsum(np.random.default_rng(1).normal(size=80)))
+        features = calculate_multi_timeframe_features(closes.to_numpy())
+
+        assert features.returns_5d == pytest.approx(closes.iloc[-1] / closes.iloc[-5] - 1)
+        assert features.returns_60d == pytest.approx(closes.iloc[-1] / closes.iloc[-60] - 1)
+        assert features.volatility == pytest.approx(closes.pct_change().tail(20).std())
+        assert features.price_vs_sma50 == pytest.approx(closes.iloc[-1] / closes.tail(50).mean() - 1)
+        sma, std = closes.tail(20).mean(), closes.tail(20).std()
+        assert features.bollinger_upper == pytest.approx(sma + 2.0 * std)
+
+
+class TestCalculateFeaturesByAsset:
+    """Test calculate_features_by_asset function"""
+
+    @patch('scripts.generate_signal.trading_config')
+    @patch('scripts.generate_signal.ProcessPoolExecutor')
+    def test_single_worker_computes_in_process(self, mock_executor, mock_config):
+        """Test that the default of one worker never starts a process pool"""
+        from scripts.generate_signal import calculate_features_by_asset, calculate_multi_timeframe_features
+
+        mock_config.bollinger_std_multiplier = 2.0
+        closes = {'SPY': 580.0 + np.arange(80.0), 'QQQ': 500.0 - np.arange(80.0) * 0.5}
+
+        features = calculate_features_by_asset(closes)
+
+        mock_executor.assert_not_called()
+        assert list(features) == ['SPY', 'QQQ']
+        assert features['QQQ'] == calculate_multi_timeframe_features(closes['QQQ'])
+
+    @patch('scripts.generate_signal.trading_config')
+    @patch('scripts.generate_signal.ProcessPoolExecutor')
+    def test_workers_map_close_arrays(self, mock_executor, mock_config):
+        """Test that extra workers map the close arrays through a capped process pool"""
+        from scripts.generate_signal import calculate_features_by_asset, calculate_multi_timeframe_features
+
+        mock_config.bollinger_std_multiplier = 2.0
+        executor = mock_executor.return_value.__enter__.return_value
+        executor.map.side_effect = map
+        closes = {'SPY': 580.0 + np.arange(80.0), 'QQQ': 500.0 - np.arange(80.0) * 0.5}
+
+        features = calculate_features_by_asset(closes, workers=8)
+
+        mock_executor.assert_called_once_with(max_workers=2)
+        assert executor.map.call_args[0][0] is calculate_multi_timeframe_features
+        assert features == {symbol: calculate_multi_timeframe_features(c) for symbol, c in closes.items()}
+
+
+class TestFeatureTable:
+    """Test feature_table struct-of-arrays packing"""
+
+    def test_columns_follow_dict_order(self):
+        """Test that each field becomes a float64 column in symbol order"""
+        from scripts.generate_signal import AssetFeatures, FEATURE_DTYPE, feature_table
+
+        table = feature_table({
+            'SPY': AssetFeatures(volatility=0.01, rsi=30.0),
+            'QQQ': AssetFeatures(volatility=0.02, rsi=70.0),
+        })
+
+        assert table.dtype == FEATURE_DTYPE
+        assert table.dtype.names == AssetFeatures._fields
+        np.testing.assert_array_equal(table['volatility'], [0.01, 0.02])
+        np.testing.assert_array_equal(table['rsi'], [30.0, 70.0])
+
+    def test_empty(self):
+        """Test that no assets gives an empty table"""
+        from scripts.generate_signal import feature_table
 
-        assert 'rsi' in features
-        assert 'bollinger_position' in features
-        assert 'bollinger_upper' in features
-        assert 'bollinger_lower' in features
-        assert 0 <= features['rsi'] <= 100
-        assert -1 <= features['bollinger_position'] <= 1
+        assert feature_table({}).shape == (0,)
 
 
 class TestGenerateSignalFunction:
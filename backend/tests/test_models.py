@@ -70,18 +70,78 @@ class TestPriceHistory:
         from models import PriceHistory
 
         pk_columns = [c.name for c in PriceHistory.__table__.primary_key.columns]
-        assert "id" in pk_columns
+        # The partition column has to be part of the primary key
+        assert pk_columns == ["id", "date"]
+        assert PriceHistory.__table__.columns['id'].autoincrement is True
+
+    def test_price_history_partitioned_by_date(self):
+        """Test PriceHistory is range-partitioned on date"""
+        from models import PriceHistory
+
+        assert PriceHistory.__table__.dialect_options['postgresql']['partition_by'] == 'RANGE (date)'
 
     def test_price_history_indexes(self):
         """Test PriceHistory has proper indexes"""
         from models import PriceHistory
 
-        # Check that date and symbol columns are indexed
-        date_col = PriceHistory.__table__.columns['date']
-        symbol_col = PriceHistory.__table__.columns['symbol']
+        # date ranges use a BRIN index; symbol lookups use the (symbol, date) covering index
+        indexes = {index.name: index for index in PriceHistory.__table__.indexes}
+        covering = indexes['ix_price_history_symbol_date_covering']
+        brin = indexes['ix_price_history_date_brin']
+
+        assert brin.dialect_options['postgresql']['using'] == 'brin'
+        assert brin.dialect_options['postgresql']['with'] == {'pages_per_range': 32}
+        assert 'ix_price_history_date' not in indexes
+        assert [c.name for c in covering.columns] == ['symbol', 'date']
+        assert covering.dialect_options['postgresql']['include'] == ['close_price', 'volume']
+        assert 'ix_price_history_symbol' not in indexes
+
+    def test_created_at_set_client_side(self):
+        """Test that created_at has a client default (no RETURNING) and keeps the server default"""
+        from models import PriceHistory
+
+        created_at = PriceHistory.__table__.columns['created_at']
+        value = created_at.default.arg(None)
+
+        assert isinstance(value, datetime)
+        assert value.tzinfo is not None
+        assert created_at.server_default is not None
+
+    def test_bulk_copy_streams_csv_on_session_connection(self):
+        """Test that bulk_copy sends one COPY FROM STDIN on the session's connection"""
+        from models import PriceHistory
+
+        session = MagicMock()
+        cursor = session.connection.return_value.connection.cursor.return_value
+        cursor.rowcount = 1
 
-        assert date_col.index is True
-        assert symbol_col.index is True
+        copied = PriceHistory.bulk_copy(session, [(date(2025, 11, 14), 'SPY', 580.5, 582.0, 579.0, 581.25, 55000000.0)])
+
+        sql, buffer = cursor.copy_expert.call_args[0]
+        assert sql == ("COPY price_history (date, symbol, open_price, high_price, low_price, "
+                       "close_price, volume) FROM STDIN WITH CSV")
+        assert buffer.getvalue() == "2025-11-14,SPY,580.5,582.0,579.0,581.25,55000000.0\r\n"
+        assert copied == 1
+        cursor.close.assert_called_once()
+
+    def test_load_matrix_pivots_closes_by_symbol(self):
+        """Test that load_matrix returns sorted dates and one NaN-padded column per symbol"""
+        import numpy as np
+        from types import SimpleNamespace
+        from models import PriceHistory
+
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = [
+            SimpleNamespace(date=date(2025, 11, 14), symbol='QQQ', close_price=500.0),
+            SimpleNamespace(date=date(2025, 11, 13), symbol='SPY', close_price=580.0),
+            SimpleNamespace(date=date(2025, 11, 14), symbol='SPY', close_price=581.0),
+        ]
+
+        dates, closes = PriceHistory.load_matrix(session, ['SPY', 'QQQ'], date(2025, 11, 1), date(2025, 11, 15))
+
+        np.testing.assert_array_equal(dates, np.array(['2025-11-13', '2025-11-14'], dtype='datetime64[D]'))
+        np.testing.assert_array_equal(closes, [[580.0, np.nan], [581.0, 500.0]])
+        assert closes.flags.f_contiguous
 
 
 class TestDailySignal:
@@ -115,15 +175,25 @@ class TestDailySignal:
         assert trade_date_col.unique is True
 
     def test_daily_signal_json_columns(self):
-        """Test that JSON columns are defined correctly"""
+        """Test that JSON columns are stored as JSONB"""
         from models import DailySignal
-        from sqlalchemy import JSON
+        from sqlalchemy.dialects.postgresql import JSONB
 
         allocations_col = DailySignal.__table__.columns['allocations']
         features_col = DailySignal.__table__.columns['features_used']
 
-        assert isinstance(allocations_col.type, JSON)
-        assert isinstance(features_col.type, JSON)
+        assert isinstance(allocations_col.type, JSONB)
+        assert isinstance(features_col.type, JSONB)
+
+    def test_daily_signal_allocations_gin_index(self):
+        """Test that allocations has a jsonb_path_ops GIN index for containment queries"""
+        from models import DailySignal
+
+        indexes = {index.name: index for index in DailySignal.__table__.indexes}
+        gin = indexes['ix_daily_signals_allocations_gin']
+
+        assert gin.dialect_options['postgresql']['using'] == 'gin'
+        assert gin.dialect_options['postgresql']['ops'] == {'allocations': 'jsonb_path_ops'}
 
 
 class TestTrade:
@@ -151,14 +221,38 @@ class TestTrade:
 
         assert Trade.__tablename__ == "trades"
 
-    def test_trade_action_enum(self):
-        """Test that action column uses ActionType enum"""
+    def test_trade_action_char_code(self):
+        """Test that action is stored as a CHAR(1) code and read back as ActionType"""
+        from models import Trade, ActionType
+        from sqlalchemy.dialects import postgresql
+
+        action_type = Trade.__table__.columns['action'].type
+        dialect = postgresql.dialect()
+
+        assert action_type.compile(dialect=dialect) == 'CHAR(1)'
+        assert [action_type.process_bind_param(a, dialect) for a in ActionType] == ['B', 'S', 'H']
+        assert action_type.process_bind_param('SELL', dialect) == 'S'
+        assert action_type.process_result_value('H', dialect) is ActionType.HOLD
+        assert action_type.process_bind_param(None, dialect) is None
+
+    def test_trade_symbol_trade_date_index(self):
+        """Test that trades has a composite (symbol, trade_date) index"""
+        from models import Trade
+
+        indexes = {index.name: index for index in Trade.__table__.indexes}
+
+        assert [c.name for c in indexes['ix_trades_symbol_trade_date'].columns] == ['symbol', 'trade_date']
+
+    def test_trade_amounts_are_exact_decimals(self):
+        """Test that quantity, price and amount are NUMERIC(18, 4) read back as Decimal"""
         from models import Trade
-        from sqlalchemy import Enum
+        from sqlalchemy import Numeric
 
-        action_col = Trade.__table__.columns['action']
-        # The column type should be an Enum
-        assert "Enum" in str(type(action_col.type))
+        for name in ('quantity', 'price', 'amount'):
+            column_type = Trade.__table__.columns[name].type
+            assert isinstance(column_type, Numeric)
+            assert (column_type.precision, column_type.scale) == (18, 4)
+            assert column_type.asdecimal
 
 
 class TestPortfolio:
@@ -233,6 +327,14 @@ class TestPerformanceMetrics:
         date_col = PerformanceMetrics.__table__.columns['date']
         assert date_col.unique is True
 
+    def test_performance_metrics_partitioned_by_date(self):
+        """Test PerformanceMetrics is range-partitioned on date with date in its primary key"""
+        from models import PerformanceMetrics
+
+        pk_columns = [c.name for c in PerformanceMetrics.__table__.primary_key.columns]
+        assert pk_columns == ["id", "date"]
+        assert PerformanceMetrics.__table__.dialect_options['postgresql']['partition_by'] == 'RANGE (date)'
+
 
 class TestTradingConfig:
     """Test TradingConfig model"""
@@ -243,28 +345,10 @@ class TestTradingConfig:
 
         columns = [c.name for c in TradingConfig.__table__.columns]
 
-        assert "id" in columns
-        assert "start_date" in columns
-        assert "end_date" in columns
-        assert "daily_capital" in columns
-        assert "assets" in columns
-        assert "lookback_days" in columns
-        assert "regime_bullish_threshold" in columns
-        assert "regime_bearish_threshold" in columns
-        assert "risk_high_threshold" in columns
-        assert "risk_medium_threshold" in columns
-        assert "allocation_low_risk" in columns
-        assert "allocation_medium_risk" in columns
-        assert "allocation_high_risk" in columns
-        assert "allocation_neutral" in columns
-        assert "sell_percentage" in columns
-        assert "momentum_weight" in columns
-        assert "price_momentum_weight" in columns
-        assert "max_drawdown_tolerance" in columns
-        assert "min_sharpe_target" in columns
-        assert "created_at" in columns
-        assert "created_by" in columns
-        assert "notes" in columns
+        assert columns == [
+            "id", "start_date", "end_date", "assets", "params",
+            "created_at", "created_by", "notes"
+        ]
 
     def test_trading_config_table_name(self):
         """Test TradingConfig table name"""
@@ -272,23 +356,34 @@ class TestTradingConfig:
 
         assert TradingConfig.__tablename__ == "trading_config"
 
-    def test_trading_config_defaults(self):
-        """Test TradingConfig default values"""
+    def test_trading_config_params_column(self):
+        """Test that tunable parameters live in one JSONB column defaulting to {}"""
         from models import TradingConfig
+        from sqlalchemy.dialects.postgresql import JSONB
 
-        daily_capital_col = TradingConfig.__table__.columns['daily_capital']
-        lookback_days_col = TradingConfig.__table__.columns['lookback_days']
+        params_col = TradingConfig.__table__.columns['params']
 
-        assert daily_capital_col.default.arg == 1000.0
-        assert lookback_days_col.default.arg == 252
+        assert isinstance(params_col.type, JSONB)
+        assert params_col.nullable is False
+        assert params_col.server_default.arg.text == "'{}'::jsonb"
 
     def test_trading_config_json_column(self):
-        """Test that assets is a JSON column"""
+        """Test that assets is a JSONB column"""
         from models import TradingConfig
-        from sqlalchemy import JSON
+        from sqlalchemy.dialects.postgresql import JSONB
 
         assets_col = TradingConfig.__table__.columns['assets']
-        assert isinstance(assets_col.type, JSON)
+        assert isinstance(assets_col.type, JSONB)
+
+    def test_trading_config_assets_gin_index(self):
+        """Test that assets has a jsonb_path_ops GIN index for containment queries"""
+        from models import TradingConfig
+
+        indexes = {index.name: index for index in TradingConfig.__table__.indexes}
+        gin = indexes['ix_trading_config_assets_gin']
+
+        assert gin.dialect_options['postgresql']['using'] == 'gin'
+        assert gin.dialect_options['postgresql']['ops'] == {'assets': 'jsonb_path_ops'}
 
     def test_trading_config_nullable_end_date(self):
         """Test that end_date is nullable (for active configs)"""
@@ -298,6 +393,17 @@ class TestTradingConfig:
         assert end_date_col.nullable is True
 
 
+class TestSymbolColumns:
+    """Test symbol column types shared across tables"""
+
+    def test_symbol_columns_use_c_collation(self):
+        """Test that every symbol column compares bytewise, so they can be joined to each other"""
+        from models import PriceHistory, LatestPrice, Trade, Portfolio
+
+        for model in (PriceHistory, LatestPrice, Trade, Portfolio):
+            assert model.__table__.columns['symbol'].type.collation == 'C'
+
+
 class TestModelRelationships:
     """Test relationships and constraints between models"""
 
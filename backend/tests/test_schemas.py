@@ -0,0 +1,68 @@
+"""
+Unit tests for schemas.py
+Tests response models read from ORM-style rows and serialized to JSON
+"""
+import json
+from datetime import date
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import ActionType
+from schemas import PriceBarOut, PriceHistoryOut, TradeOut, PerformanceOut, json_response
+
+
+class TestResponseModels:
+    """Test reading rows by attribute and serializing under response keys"""
+
+    def test_price_bar_reads_column_names(self):
+        """Test that *_price columns are exposed under their short response keys"""
+        row = SimpleNamespace(date=date(2025, 11, 15), close_price=581.25, open_price=580.5,
+                              high_price=582.0, low_price=579.0, volume=55000000.0)
+
+        history = PriceHistoryOut(symbol='SPY', data=iter([row]))
+
+        assert json.loads(history.model_dump_json()) == {
+            'symbol': 'SPY',
+            'data': [{'date': '2025-11-15', 'close': 581.25, 'open': 580.5,
+                      'high': 582.0, 'low': 579.0, 'volume': 55000000.0}]
+        }
+
+    def test_trade_serializes_action_value(self):
+        """Test that trade_date becomes 'date' and the action enum its value"""
+        row = SimpleNamespace(trade_date=date(2025, 11, 15), symbol='SPY', action=ActionType.SELL,
+                              quantity=1.0, price=580.0, amount=580.0)
+
+        trade = json.loads(TradeOut.model_validate(row).model_dump_json())
+
+        assert trade['date'] == '2025-11-15'
+        assert trade['action'] == 'SELL'
+
+    def test_performance_summary_from_latest_row(self):
+        """Test that the summary reads cumulative_return as total_return"""
+        row = SimpleNamespace(date=date(2025, 11, 15), portfolio_value=1000.0, total_value=1100.0,
+                              daily_return=None, cumulative_return=1.5, sharpe_ratio=1.2, max_drawdown=2.5)
+
+        performance = json.loads(PerformanceOut(performance=[row], summary=row).model_dump_json())
+
+        assert performance['performance'][0]['daily_return'] is None
+        assert performance['summary'] == {'total_return': 1.5, 'sharpe_ratio': 1.2, 'max_drawdown': 2.5}
+
+    def test_serialization_schema_uses_response_keys(self):
+        """Test that the documented schema uses the response keys, not the column names"""
+        properties = PriceBarOut.model_json_schema(mode='serialization')['properties']
+
+        assert list(properties) == ['date', 'close', 'open', 'high', 'low', 'volume']
+
+
+class TestJsonResponse:
+    """Test json_response"""
+
+    def test_body_is_model_json(self):
+        """Test that the body is the model's JSON with a JSON media type"""
+        response = json_response(PerformanceOut(performance=[], summary=None))
+
+        assert response.media_type == 'application/json'
+        assert json.loads(response.body) == {'performance': [], 'summary': None}